@@ -12,11 +12,11 @@ from app.api.auth.exceptions import (
     TokenExpiredException,
     TokenNoFound,
 )
+from app.api.auth.schemas import SUserRead
 from app.api.blog.dao import BlogDAO
 from app.api.blog.schemas import BlogFullResponse, BlogNotFind
 from app.core.settings import APP_CONFIG
 from app.dao.session_maker import SessionDep
-from app.models import User
 
 
 # todo: добавить oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
@@ -27,10 +27,7 @@ def get_token(request: Request):
     return token
 
 
-async def get_current_user(
-    token: str = Depends(get_token),
-    session: AsyncSession = SessionDep,
-):
+async def get_current_user(token: str = Depends(get_token)) -> SUserRead:
     try:
         payload = jwt.decode(
             token,
@@ -49,7 +46,8 @@ async def get_current_user(
     if not user_id:
         raise NoUserIdException
 
-    user = await UsersDAO.find_one_or_none_by_id(data_id=int(user_id), session=session)
+    # без сессии запроса: одновременные проверки токенов склеиваются в один запрос
+    user = await UsersDAO.load_by_id(int(user_id), SUserRead)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -64,8 +62,7 @@ def get_token_optional(request: Request) -> str | None:
 
 async def get_current_user_optional(
     token: str | None = Depends(get_token_optional),
-    session: AsyncSession = SessionDep,
-) -> User | None:
+) -> SUserRead | None:
     if not token:
         return None
 
@@ -87,11 +84,14 @@ async def get_current_user_optional(
     if not user_id:
         return None
 
-    user = await UsersDAO.find_one_or_none_by_id(data_id=int(user_id), session=session)
+    # без сессии запроса: одновременные проверки токенов склеиваются в один запрос
+    user = await UsersDAO.load_by_id(int(user_id), SUserRead)
     return user
 
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)):
+async def get_current_admin_user(
+    current_user: SUserRead = Depends(get_current_user),
+):
     if current_user.role.id in [3, 4]:
         return current_user
     raise ForbiddenException
@@ -100,7 +100,7 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
 async def get_blog_info(
     blog_id: int,
     session: AsyncSession = SessionDep,
-    user_data: User | None = Depends(get_current_user_optional),
+    user_data: SUserRead | None = Depends(get_current_user_optional),
 ) -> BlogFullResponse | BlogNotFind:
     author_id = user_data.id if user_data else None
     return await BlogDAO.get_full_blog_info(
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,13 +14,14 @@ from app.api.auth.schemas import (
     SUserAddDB,
     SUserAuth,
     SUserInfo,
+    SUserRead,
     SUserRegister,
     UAuthResponse,
     UserOutResponse,
     UserRegResponse,
 )
+from app.dao.export import ExportFormat, stream_response
 from app.dao.session_maker import SessionDep, TransactionSessionDep
-from app.models import User
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -88,7 +89,7 @@ async def logout_user(response: Response):
     response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_me(user_data: User = Depends(get_current_user)):
+async def get_me(user_data: SUserRead = Depends(get_current_user)):
     return SUserInfo.model_validate(user_data)
 
 
@@ -99,8 +100,19 @@ async def get_me(user_data: User = Depends(get_current_user)):
     status_code=status.HTTP_200_OK,
 )
 async def get_all_users(
-    session: AsyncSession = SessionDep,
-    user_data: User = Depends(get_current_admin_user),
+    user_data: SUserRead = Depends(get_current_admin_user),
+):
+    # тот же JSON-массив, но без загрузки всех пользователей в память
+    return stream_response(UsersDAO, SUserInfo)
+
+
+@router.get(
+    "/all_users/export/",
+    summary="Выгрузка пользователей в NDJSON или CSV",
+    status_code=status.HTTP_200_OK,
+)
+async def export_users(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    user_data: SUserRead = Depends(get_current_admin_user),
 ):
-    result = await UsersDAO.find_all(session=session, filters=None)
-    return [SUserInfo.model_validate(user) for user in result]
+    return stream_response(UsersDAO, SUserInfo, export_format, filename="users")
@@ -96,6 +96,21 @@ class SUserInfo(UserBase):
         return self.role.id
 
 
+class SUserRead(BaseModel):
+    """
+    Пользователь из БД для зависимостей авторизации: без проверок формата
+    из UserBase, чтобы старая запись, не проходящая их, не давала 500.
+    """
+
+    id: int
+    email: str
+    phone_number: str
+    first_name: str
+    last_name: str
+    role: RoleModel
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserRegResponse(BaseModel):
     message: str = Field(
         default="Вы успешно зарегистрированы!",
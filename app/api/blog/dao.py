@@ -1,12 +1,32 @@
 from loguru import logger
-from sqlalchemy import func, select
+from sqlalchemy import (
+    cast,
+    Float,
+    func,
+    literal,
+    literal_column,
+    select,
+    Select,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
 from app.api.blog.schemas import BlogFullResponse, DeleteBlogResponse
+from app.core.logger_config import sampled_logger
 from app.dao.base import BaseDAO
+from app.dao.count import count_rows, CountStrategy
+from app.dao.cursor import (
+    coerce_cursor_value,
+    decode_cursor,
+    encode_cursor,
+    InvalidCursorException,
+)
 from app.models import Blog, BlogTag, Tag
+from app.models.blog import SEARCH_CONFIG
+from app.redis.redis_client import RedisClient
 
 
 class TagDAO(BaseDAO):
@@ -16,45 +36,112 @@ class TagDAO(BaseDAO):
     async def add_tags(cls, session: AsyncSession, tag_names: list[str]) -> list[int]:
         """
         Метод для добавления тегов в базу данных.
-        Принимает список строк (тегов), проверяет, существуют ли они в базе данных,
-        добавляет новые и возвращает список ID тегов.
+        Принимает список строк (тегов), добавляет отсутствующие в базе данных
+        и возвращает список ID тегов без повторов.
 
         :param session: Сессия базы данных.
         :param tag_names: Список тегов в нижнем регистре.
         :return: Список ID тегов.
         """
-        tag_ids = []
-        for tag_name in tag_names:
-            tag_name = tag_name.lower()  # Приводим тег к нижнему регистру
-            # Пытаемся найти тег в базе данных
-            stmt = select(cls.model).filter_by(name=tag_name)
-            result = await session.execute(stmt)
-            tag = result.scalars().first()
-
-            if tag:
-                # Если тег найден, добавляем его ID в список
-                tag_ids.append(tag.id)
-            else:
-                # Если тег не найден, создаем новый тег
-                new_tag = cls.model(name=tag_name)
-                session.add(new_tag)
-                try:
-                    await (
-                        session.flush()
-                    )  # Это создает новый тег и позволяет получить его ID
-                    logger.info(f"Тег '{tag_name}' добавлен в базу данных.")
-                    tag_ids.append(new_tag.id)
-                except SQLAlchemyError as e:
-                    await session.rollback()
-                    logger.error(f"Ошибка при добавлении тега '{tag_name}': {e}")
-                    raise e
-
-        return tag_ids
+        # приводим к нижнему регистру и убираем повторы, сохраняя порядок
+        names = list(dict.fromkeys(tag_name.lower() for tag_name in tag_names))
+        if not names:
+            return []
+
+        # новые теги - INSERT ... ON CONFLICT DO NOTHING, id существующих -
+        # SELECT по именам: существующие строки не перезаписываются и не блокируются
+        rows = await cls.upsert_many(
+            session,
+            unique_fields=["name"],
+            values=[{"name": name} for name in names],
+            returning=["id"],
+        )
+        logger.debug("Теги {} добавлены в базу данных.", names)
+        return [row.id for row in rows if row is not None]  # type: ignore[union-attr]
 
 
 class BlogDAO(BaseDAO):
     model = Blog
 
+    @classmethod
+    def published_query(
+        cls,
+        author_id: int | None = None,
+        tag: str | None = None,
+    ) -> Select:
+        """
+        Опубликованные блоги с автором и тегами, по автору и/или тегу.
+        Индексы под эти фильтры: ix_blogs_published_author_id, ix_tags_name_trgm.
+        """
+        query = (
+            select(cls.model)
+            .options(joinedload(cls.model.user), selectinload(cls.model.tags))
+            .filter_by(status="published")
+        )
+
+        # Фильтрация по автору
+        if author_id is not None:
+            query = query.filter_by(author=author_id)
+
+        # Фильтрация по тегу: EXISTS без join, чтобы блог с несколькими
+        # подходящими тегами не повторялся на странице и в подсчёте
+        if tag:
+            query = query.filter(
+                cls.model.tags.any(Tag.name.ilike(f"%{tag.lower()}%")),
+            )
+        return query
+
+    @classmethod
+    async def search(
+        cls,
+        session: AsyncSession,
+        query_text: str,
+        cursor: str | None = None,
+        page_size: int = 10,
+    ) -> tuple[list[tuple[Blog, float]], str | None]:
+        """
+        Полнотекстовый поиск по опубликованным блогам: заголовок, теги,
+        описание и текст (Blog.search_vector, GIN-индекс ix_blogs_search_vector).
+        query_text - в синтаксисе websearch_to_tsquery: слова, "фраза", -исключение, or.
+        Возвращает пары (блог, ранг) по убыванию ранга и курсор следующей
+        страницы: keyset по (ранг, id) вместо OFFSET.
+        """
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_CONFIG}'"),
+            query_text,
+        )
+        # double precision: ранг из курсора сравнивается без потери точности
+        rank = cast(func.ts_rank(cls.model.search_vector, ts_query), Float)
+        query = (
+            cls.published_query()
+            .add_columns(rank)
+            .where(cls.model.search_vector.op("@@")(ts_query))
+        )
+
+        if cursor:
+            values = decode_cursor(cursor, "rank", True)
+            if len(values) != 2:
+                raise InvalidCursorException
+            bound = tuple_(
+                literal(coerce_cursor_value(values[0], float), Float),
+                literal(coerce_cursor_value(values[1], int)),
+            )
+            query = query.where(tuple_(rank, cls.model.id) < bound)
+
+        result = await session.execute(
+            query.order_by(rank.desc(), cls.model.id.desc()).limit(page_size + 1),
+        )
+        found = [(blog, blog_rank) for blog, blog_rank in result.all()]
+
+        next_cursor = None
+        if len(found) > page_size:
+            found = found[:page_size]
+            blog, blog_rank = found[-1]
+            next_cursor = encode_cursor("rank", True, [blog_rank, blog.id])
+
+        sampled_logger.info("Search found {} blogs", len(found))
+        return found, next_cursor
+
     @classmethod
     async def get_blog_list(
         cls,
@@ -63,6 +150,9 @@ class BlogDAO(BaseDAO):
         tag: str | None = None,
         page: int = 1,
         page_size: int = 10,
+        cursor: str | None = None,
+        count_strategy: CountStrategy = CountStrategy.exact,
+        redis: RedisClient | None = None,
     ):
         """
         Получает список опубликованных блогов с возможностью фильтрации и пагинации.
@@ -72,73 +162,98 @@ class BlogDAO(BaseDAO):
         :param tag: Название тега для фильтрации (опционально)
         :param page: Номер страницы (начиная с 1)
         :param page_size: Количество записей на странице (от 3 до 100)
-        :return: Словарь с ключами page, total_page, total_result, blogs
+        :param cursor: Курсор keyset-пагинации; если передан, page не учитывается,
+            а page, total_page и total_result в ответе - None
+        :param count_strategy: Как считать total_result: точно, оценкой или из кэша
+        :param redis: Клиент Redis для CountStrategy.cached
+        :return: Словарь с ключами page, total_page, total_result, total_exact,
+            next_cursor, blogs
         """
         # Ограничение параметров
         page_size = max(3, min(page_size, 100))
         page = max(1, page)
 
-        # Начальная сборка базового запроса
-        base_query = (
-            select(cls.model)
-            .options(joinedload(cls.model.user), selectinload(cls.model.tags))
-            .filter_by(status="published")
-        )
+        base_query = cls.published_query(author_id, tag)
 
-        # Фильтрация по автору
+        # Логирование
+        filters = []
         if author_id is not None:
-            base_query = base_query.filter_by(author=author_id)
-
-        # Фильтрация по тегу
+            filters.append(f"author_id={author_id}")
         if tag:
-            base_query = base_query.join(cls.model.tags).filter(
-                cls.model.tags.any(Tag.name.ilike(f"%{tag.lower()}%")),
+            filters.append(f"tag={tag}")
+        filter_str = " & ".join(filters) if filters else "no filters"
+
+        # Пагинация по курсору: без COUNT и OFFSET
+        if cursor is not None:
+            records, next_cursor = await cls.keyset_page(
+                session,
+                base_query,
+                cursor=cursor,
+                page_size=page_size,
+            )
+            sampled_logger.info(
+                "Cursor page fetched with {} blogs, filters: {}",
+                len(records),
+                filter_str,
             )
+            return {
+                "page": None,
+                "total_page": None,
+                "total_result": None,
+                "total_exact": None,
+                "next_cursor": next_cursor,
+                "blogs": [BlogFullResponse.model_validate(blog) for blog in records],
+            }
 
         # Подсчет общего количества записей
-        count_query = select(func.count()).select_from(base_query.subquery())
-        total_result = await session.scalar(count_query)
+        total_result, total_exact = await count_rows(
+            session,
+            base_query,
+            count_strategy,
+            redis,
+        )
 
         # Если записей нет, возвращаем пустой результат
         if not total_result:
-            return {"page": page, "total_page": 0, "total_result": 0, "blogs": []}
+            return {
+                "page": page,
+                "total_page": 0,
+                "total_result": 0,
+                "total_exact": total_exact,
+                "next_cursor": None,
+                "blogs": [],
+            }
 
         # Расчет количества страниц
         total_page = (total_result + page_size - 1) // page_size
 
         # Применение пагинации
         offset = (page - 1) * page_size
-        paginated_query = base_query.offset(offset).limit(page_size)
+        paginated_query = (
+            base_query.order_by(cls.model.id).offset(offset).limit(page_size)
+        )
 
         # Выполнение запроса и получение результатов
         result = await session.execute(paginated_query)
         blogs = result.scalars().all()
 
-        # Удаление дубликатов блогов по их ID
-        unique_blogs = []
-        seen_ids = set()
-        for blog in blogs:
-            if blog.id not in seen_ids:
-                unique_blogs.append(BlogFullResponse.model_validate(blog))
-                seen_ids.add(blog.id)
+        # курсор с последнего блога, чтобы дальше листать без OFFSET
+        next_cursor = cls.cursor_for(blogs[-1]) if blogs and page < total_page else None
 
-        # Логирование
-        filters = []
-        if author_id is not None:
-            filters.append(f"author_id={author_id}")
-        if tag:
-            filters.append(f"tag={tag}")
-        filter_str = " & ".join(filters) if filters else "no filters"
-
-        logger.info(
-            f"Page {page} fetched with {len(blogs)} blogs, filters: {filter_str}",
+        sampled_logger.info(
+            "Page {} fetched with {} blogs, filters: {}",
+            page,
+            len(blogs),
+            filter_str,
         )
         # Формирование результата
         return {
             "page": page,
             "total_page": total_page,
             "total_result": total_result,
-            "blogs": unique_blogs,
+            "total_exact": total_exact,
+            "next_cursor": next_cursor,
+            "blogs": [BlogFullResponse.model_validate(blog) for blog in blogs],
         }
 
     @classmethod
@@ -336,8 +451,13 @@ class BlogTagDAO(BaseDAO):
                 await (
                     session.flush()
                 )  # Применяем изменения и сохраняем записи в базе данных
-                logger.info(
-                    f"{len(blog_tag_instances)} связок блогов и тегов успешно добавлено.",
+                await cls.refresh_tag_names(
+                    session,
+                    {blog_tag.blog_id for blog_tag in blog_tag_instances},
+                )
+                logger.debug(
+                    "{} связок блогов и тегов успешно добавлено.",
+                    len(blog_tag_instances),
                 )
             except SQLAlchemyError as e:
                 await session.rollback()
@@ -345,3 +465,19 @@ class BlogTagDAO(BaseDAO):
                 raise e
         else:
             logger.warning("Нет валидных данных для добавления в таблицу blog_tags.")
+
+    @classmethod
+    async def refresh_tag_names(cls, session: AsyncSession, blog_ids: set[int]) -> None:
+        """Пересобирает Blog.tag_names (а с ним и search_vector) у блогов blog_ids."""
+        names = (
+            select(func.string_agg(Tag.name, literal_column("' '")))
+            .join(cls.model, cls.model.tag_id == Tag.id)
+            .where(cls.model.blog_id == Blog.id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(Blog)
+            .where(Blog.id.in_(blog_ids))
+            .values(tag_names=func.coalesce(names, ""))
+            .execution_options(synchronize_session=False),
+        )
@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth.dependencies import get_blog_info, get_current_user
+from app.api.auth.schemas import SUserRead
 from app.api.blog.dao import BlogDAO, BlogTagDAO, TagDAO
 from app.api.blog.schemas import (
     BlogCreateSchemaAdd,
@@ -12,18 +13,26 @@ from app.api.blog.schemas import (
     BlogFullResponse,
     BlogListResponse,
     BlogNotFind,
+    BlogSearchResponse,
+    BlogSearchResult,
     CreateBlogResponse,
     DeleteBlogResponse,
 )
 from app.core.settings import APP_CONFIG
-from app.dao.session_maker import SessionDep, TransactionSessionDep
-from app.models import User
+from app.dao.count import CountStrategy, invalidate_counts
+from app.dao.session_maker import after_commit, SessionDep, TransactionSessionDep
+from app.models import Blog
+from app.redis.dependencies import RedisClientDep
+from app.redis.redis_client import RedisClient
 
 router = APIRouter(
     prefix=APP_CONFIG.api.v1,
     tags=["Блоги"],
 )
 
+# __table__ в аннотациях SQLAlchemy — FromClause, у Blog это Table с именем
+BLOGS_TABLE: str = Blog.__table__.name  # type: ignore[attr-defined]
+
 
 @router.post(
     "/posts/",
@@ -34,8 +43,9 @@ router = APIRouter(
 )
 async def add_blog(
     add_data: BlogCreateSchemaBase,
-    user_data: User = Depends(get_current_user),
+    user_data: SUserRead = Depends(get_current_user),
     session: AsyncSession = TransactionSessionDep,
+    redis: RedisClient = RedisClientDep,
 ):
     blog_dict = add_data.model_dump()
     blog_dict["author"] = user_data.id
@@ -54,6 +64,8 @@ async def add_blog(
                 session=session,
                 blog_tag_pairs=[{"blog_id": blog_id, "tag_id": i} for i in tags_ids],
             )
+        # count сбрасываем после коммита: иначе конкурентный список закэширует старый
+        after_commit(session, lambda: invalidate_counts(redis, BLOGS_TABLE))
 
         return CreateBlogResponse(
             message=f"Блог с ID {blog_id} успешно добавлен с тегами.",
@@ -71,6 +83,40 @@ async def add_blog(
         )
 
 
+# до /blogs/{blog_id}: иначе "search" разбирается как blog_id
+@router.get(
+    "/blogs/search/",
+    summary="Полнотекстовый поиск по опубликованным блогам",
+    response_model=BlogSearchResponse,
+    response_class=ORJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def search_blogs(
+    q: str = Query(
+        ...,
+        min_length=2,
+        max_length=200,
+        description='Слова, "фраза", -исключение; ищется в заголовке, тегах и тексте',
+    ),
+    page_size: int = Query(10, ge=1, le=100, description="Записей на странице"),
+    cursor: str | None = Query(None, description="Курсор из next_cursor"),
+    session: AsyncSession = SessionDep,
+):
+    found, next_cursor = await BlogDAO.search(
+        session=session,
+        query_text=q,
+        cursor=cursor,
+        page_size=page_size,
+    )
+    return BlogSearchResponse(
+        next_cursor=next_cursor,
+        results=[
+            BlogSearchResult(rank=rank, blog=BlogFullResponse.model_validate(blog))
+            for blog, rank in found
+        ],
+    )
+
+
 @router.get(
     "/blogs/{blog_id}",
     summary="Получить информацию по блогу",
@@ -97,7 +143,16 @@ async def get_blog(
     tag: str | None = None,
     page: int = Query(1, ge=1, description="Номер страницы"),
     page_size: int = Query(10, ge=10, le=100, description="Записей на странице"),
+    cursor: str | None = Query(
+        None,
+        description="Курсор из next_cursor, page при нём не учитывается",
+    ),
+    count: CountStrategy = Query(
+        APP_CONFIG.db.count_strategy,
+        description="Подсчёт total_result: exact, estimated или cached",
+    ),
     session: AsyncSession = SessionDep,
+    redis: RedisClient = RedisClientDep,
 ):
     try:
         result = await BlogDAO.get_blog_list(
@@ -106,6 +161,9 @@ async def get_blog(
             tag=tag,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            count_strategy=count,
+            redis=redis,
         )
 
         if not result["blogs"]:
@@ -117,9 +175,13 @@ async def get_blog(
             page=result["page"],
             total_page=result["total_page"],
             total_result=result["total_result"],
+            total_exact=result["total_exact"],
+            next_cursor=result["next_cursor"],
             blogs=result["blogs"],
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Ошибка при получении блогов: {e}")
         return JSONResponse(status_code=500, content={"detail": "Ошибка сервера"})
@@ -135,11 +197,13 @@ async def get_blog(
 async def delete_blog(
     blog_id: int,
     session: AsyncSession = TransactionSessionDep,
-    current_user: User = Depends(get_current_user),
+    current_user: SUserRead = Depends(get_current_user),
+    redis: RedisClient = RedisClientDep,
 ):
     result = await BlogDAO.delete_blog(session, blog_id, current_user.id)
     if result.status == "error":
         raise HTTPException(status_code=400, detail=result.message)
+    after_commit(session, lambda: invalidate_counts(redis, BLOGS_TABLE))
     return result
 
 
@@ -149,7 +213,8 @@ async def change_blog_status(
     blog_id: int,
     new_status: str,
     session: AsyncSession = TransactionSessionDep,
-    current_user: User = Depends(get_current_user),
+    current_user: SUserRead = Depends(get_current_user),
+    redis: RedisClient = RedisClientDep,
 ):
     result = await BlogDAO.change_blog_status(
         session,
@@ -159,4 +224,6 @@ async def change_blog_status(
     )
     if result["status"] == "error":
         raise HTTPException(status_code=400, detail=result["message"])
+    # список показывает только published - число меняется вместе со статусом
+    after_commit(session, lambda: invalidate_counts(redis, BLOGS_TABLE))
     return result
@@ -66,12 +66,27 @@ class CreateBlogResponse(BaseModel):
 
 
 class BlogListResponse(BaseModel):
-    page: int
-    total_page: int
-    total_result: int
+    # при пагинации по курсору номер страницы и общее число не считаются
+    page: int | None = None
+    total_page: int | None = None
+    total_result: int | None = None
+    # False - total_result оценка или значение из кэша
+    total_exact: bool | None = None
+    next_cursor: str | None = None
     blogs: list[BlogFullResponse]
 
 
+class BlogSearchResult(BaseModel):
+    rank: float
+    blog: BlogFullResponse
+
+
+class BlogSearchResponse(BaseModel):
+    # курсор следующей страницы, None - страница последняя
+    next_cursor: str | None = None
+    results: list[BlogSearchResult]
+
+
 class DeleteBlogResponse(BaseModel):
     status: str
     message: str
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+
+from app.api.auth.dependencies import get_current_admin_user
+from app.api.auth.schemas import SUserRead
+from app.api.cache.schemas import CacheStatsResponse
+from app.core.settings import APP_CONFIG
+from app.redis.dependencies import RedisClientDep
+from app.redis.redis_client import RedisClient
+
+router = APIRouter(
+    prefix=f"{APP_CONFIG.api.v1}/cache",
+    tags=["Кэш"],
+)
+
+
+@router.get(
+    "/stats",
+    summary="Состояние кэша: размер, память, TTL, самые тяжёлые ключи",
+    response_model=CacheStatsResponse,
+    response_class=ORJSONResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_stats(
+    sample_size: int = Query(1000, ge=1, le=100_000, description="Ключей в выборке"),
+    top: int = Query(20, ge=1, le=100, description="Сколько тяжёлых ключей вернуть"),
+    redis: RedisClient = RedisClientDep,
+    user_data: SUserRead = Depends(get_current_admin_user),
+):
+    return await redis.inspect(sample_size=sample_size, top=top)
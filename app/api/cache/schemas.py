@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+
+
+class CacheKeyInfo(BaseModel):
+    key: str
+    type: str
+    ttl: int = Field(description="TTL в секундах, -1 - без срока жизни")
+    length: int = Field(description="Число полей/элементов (для строк - длина)")
+    memory_bytes: int
+
+
+class CacheNamespaceInfo(BaseModel):
+    keys: int
+    memory_bytes: int
+
+
+class CacheStatsResponse(BaseModel):
+    keys_total: int
+    used_memory_bytes: int
+    used_memory_peak_bytes: int
+    maxmemory_bytes: int
+    sampled_keys: int = Field(description="Сколько ключей попало в выборку SCAN")
+    ttl_distribution: dict[str, int]
+    namespaces: dict[str, CacheNamespaceInfo]
+    top_keys: list[CacheKeyInfo]
+    tiers: dict[str, dict[str, float]] = Field(
+        description="Попадания/промахи по уровням кэша (local/redis) этого воркера",
+    )
@@ -4,6 +4,7 @@ from datetime import date
 
 from fastapi import File, HTTPException, UploadFile
 from loguru import logger
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,6 +25,7 @@ from app.api.tariff.schemas import (
     UpdateTariffSchema,
 )
 from app.api.tariff.utils import ActionType, create_message
+from app.core.logger_config import sampled_logger
 from app.dao.base import BaseDAO
 from app.kafka.producer import KafkaProducer
 from app.models import DateAccession, Tariff
@@ -40,8 +42,11 @@ class TariffFileProcessor:
                 created_at = date.fromisoformat(date_str)
                 tariff_objects = [TariffSchema(**tariff) for tariff in tariff_list]
                 tariffs[created_at] = tariff_objects
-                logger.info(
-                    f"Processed rates for date {created_at}: {tariff_objects}",
+                # весь список тарифов в лог не пишем: файл может быть большим
+                logger.debug(
+                    "Processed {} rates for date {}",
+                    len(tariff_objects),
+                    created_at,
                 )
             return tariffs
 
@@ -91,7 +96,7 @@ class TariffDAO(BaseDAO):
                 #     # )
                 #     # await cls.add(session, insert_tariff)
 
-                # для add_many создаем список
+                # для bulk_insert создаем список
                 tariff_models = [
                     CreateTariffSchema(
                         **tariff.model_dump(),
@@ -100,8 +105,8 @@ class TariffDAO(BaseDAO):
                     for tariff in tariffs
                 ]
 
-                # Добавляем через  add_many для загрузки списка
-                await cls.add_many(session, tariff_models)
+                # add_many создаёт ORM-объекты, bulk_insert - один INSERT на пачку
+                await cls.bulk_insert(session, tariff_models)
 
                 response_tariffs.append(
                     CreateTariffRespSchema(
@@ -110,8 +115,9 @@ class TariffDAO(BaseDAO):
                         tariffs=tariffs,
                     ),
                 )
-                logger.info(
-                    f"Successfully created tariffs for published_at {created_at}.",
+                logger.debug(
+                    "Successfully created tariffs for published_at {}.",
+                    created_at,
                 )
                 message = create_message(
                     action=ActionType.CREATE_TARIFF,
@@ -136,7 +142,7 @@ class TariffDAO(BaseDAO):
                 logger.error(f"Invalid data provided for tariff creation{e=!r}.")
                 raise HTTPException(status_code=400, detail=str(e))
 
-        logger.info(f"Created {len(response_tariffs)} tariffs successfully.")
+        logger.info("Created {} tariffs successfully.", len(response_tariffs))
         return response_tariffs
 
     @classmethod
@@ -149,53 +155,108 @@ class TariffDAO(BaseDAO):
     ):
         contents = await file.read()
         tariffs_data = TariffFileProcessor.process_file(contents)
-        logger.info(f"Tariff file {file.filename} uploaded and processed.")
+        logger.info("Tariff file {} uploaded and processed.", file.filename)
         return await cls.create_tariff(session, tariffs_data, kafka, rabbit)
 
     @classmethod
     async def get_tariff_by_id(
         cls,
         tariff_id: int,
-        session: AsyncSession,
         redis: RedisClientTariff,
     ) -> TariffRespSchema:
         # Проверяем кеш в редисе. Если есть возвращаем из кеша
-        cache = await redis.cached_tariff(tariff_id)
+        cache, locked = await redis.cached_tariff_or_lock(tariff_id)
         if cache:
             return TariffRespSchema(id=tariff_id, **cache)
 
-        result = await cls.find_one_or_none_by_id(
-            data_id=tariff_id,
-            session=session,
-        )
+        if not locked:
+            # тариф уже грузит другой запрос - ждём его, а не идём в БД толпой
+            cache = await redis.wait_tariff_cache(tariff_id)
+            if cache:
+                return TariffRespSchema(id=tariff_id, **cache)
 
-        if not result:
+        # промахи кэша по разным тарифам в одно время - одним запросом
+        tariff = await cls.load_by_id(tariff_id, TariffRespSchema)
+
+        if not tariff:
+            if locked:
+                await redis.release_tariff_lock(tariff_id)
             raise HTTPException(status_code=404, detail="Тариф не найден")
 
         # todo: если __repr__  3 полей объявлен Base + .to_dict
         # result_dict = result.to_dict()
         # return TariffRespSchema.model_validate(result_dict)
 
-        tariff = TariffRespSchema.model_validate(result)
         # пишем в редис
-        await redis.set_tariff_cache(tariff_id, tariff.model_dump())
+        # лок снимаем, только если он наш: иначе его держит загружающий воркер
+        await redis.set_tariff_cache(
+            tariff_id,
+            tariff.model_dump(),
+            release_lock=locked,
+        )
 
         return tariff
 
+    @classmethod
+    async def warm_up_cache(
+        cls,
+        session: AsyncSession,
+        redis: RedisClientTariff,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Загружает все тарифы в кэш: читает их серверным курсором пачками
+        по chunk_size и пишет каждую пачку в Redis одним пайплайном.
+        """
+        query = select(cls.model).execution_options(yield_per=chunk_size)
+        result = await session.stream_scalars(query)
+
+        total = 0
+        async for tariffs in result.partitions():
+            total += await redis.set_tariffs_cache(
+                {
+                    tariff.id: TariffRespSchema.model_validate(tariff).model_dump(
+                        exclude={"id"},
+                    )
+                    for tariff in tariffs
+                },
+            )
+        return total
+
     @classmethod
     async def get_all_tariffs(
         cls,
         page: int,
         page_size: int,
         session: AsyncSession,
-    ):
-        result = await cls.paginate(
-            session=session,
-            page=page,
-            page_size=page_size,
-            filters=None,
-        )
-        return [TariffRespSchema.model_validate(tariff) for tariff in result]
+        cursor: str | None = None,
+    ) -> tuple[list[TariffRespSchema], str | None]:
+        """
+        Страница тарифов по id и курсор следующей страницы.
+        С cursor - keyset-пагинация (page игнорируется), без - по номеру страницы.
+        """
+        if cursor is not None:
+            result, next_cursor = await cls.paginate_keyset(
+                session=session,
+                cursor=cursor,
+                page_size=page_size,
+                fields=TariffRespSchema,
+            )
+        else:
+            result = await cls.paginate(
+                session=session,
+                page=page,
+                page_size=page_size,
+                filters=None,
+                # только колонки ответа, строки вместо ORM-объектов
+                fields=TariffRespSchema,
+            )
+            # курсор с последней записи, чтобы дальше листать без OFFSET
+            next_cursor = (
+                cls.cursor_for(result[-1]) if len(result) == page_size else None
+            )
+        tariffs = [TariffRespSchema.model_validate(tariff) for tariff in result]
+        return tariffs, next_cursor
 
     @classmethod
     async def delete_tariff_by_id(
@@ -214,7 +275,7 @@ class TariffDAO(BaseDAO):
         # tariff = result.scalar_one_or_none()
 
         if not tariff:
-            logger.info(f"Tariff with id {tariff_id} not found.")
+            logger.info("Tariff with id {} not found.", tariff_id)
             raise HTTPException(status_code=404, detail="Тариф не найден")
 
         try:
@@ -225,7 +286,7 @@ class TariffDAO(BaseDAO):
             # await session.delete(tariff)
             # await session.flush()
 
-            logger.info(f"Tariff with ID {tariff_id} has been deleted successfully.")
+            logger.info("Tariff with ID {} has been deleted successfully.", tariff_id)
 
             message = create_message(
                 action=ActionType.DELETE_TARIFF,
@@ -270,7 +331,7 @@ class TariffDAO(BaseDAO):
 
         # if not tariff:
         if not result:
-            logger.info(f"Tariff with ID {tariff_id} not found.")
+            logger.info("Tariff with ID {} not found.", tariff_id)
             raise HTTPException(status_code=404, detail="Тариф не найден")
 
         # без наследования (продолжение)
@@ -326,15 +387,18 @@ class TariffDAO(BaseDAO):
         # tariff = await cls.find_one_or_none_by_id(data.tariff_id, session)
 
         if not tariff:
-            logger.info(f"Tariff {data.tariff_id}. not found")
+            logger.info("Tariff {}. not found", data.tariff_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"Rate not found for the {data.tariff_id}",
             )
 
         insurance_cost = data.declared_value * tariff.rate
-        logger.info(
-            f"Insurance cost calculated: {insurance_cost} for declared value: {data.declared_value} and rate: {tariff.rate}.",
+        sampled_logger.info(
+            "Insurance cost calculated: {} for declared value: {} and rate: {}.",
+            insurance_cost,
+            data.declared_value,
+            tariff.rate,
         )
 
         message = create_message(
@@ -1,3 +1,5 @@
+import asyncio
+
 from loguru import logger
 
 from app.redis.redis_client import ExpireTime, RedisClient, RedisKeys
@@ -15,7 +17,44 @@ class RedisClientTariff(RedisClient):
             logger.error(f"Ошибка при получении кэша тарифов: {e}")
             return None
 
-    async def set_tariff_cache(self, tariff_id: int, tariff_data: dict):
+    async def cached_tariff_or_lock(self, tariff_id: int) -> tuple[dict | None, bool]:
+        """
+        Тариф из кэша или лок на его загрузку из БД.
+        Возвращает (тариф, лок взят этим вызовом).
+        """
+        try:
+            return await self.get_or_lock(RedisKeys.TARIFF, str(tariff_id))
+        except Exception as e:
+            logger.error(f"Ошибка при получении кэша тарифов: {e}")
+            return None, True
+
+    async def wait_tariff_cache(
+        self,
+        tariff_id: int,
+        attempts: int = 5,
+        delay: float = 0.02,
+    ) -> dict | None:
+        """Ждёт, пока тариф загрузит в кэш воркер, взявший лок."""
+        for _ in range(attempts):
+            await asyncio.sleep(delay)
+            cache = await self.cached_tariff(tariff_id)
+            if cache is not None:
+                return cache
+        return None
+
+    async def release_tariff_lock(self, tariff_id: int) -> None:
+        await self.release_lock(RedisKeys.TARIFF, str(tariff_id))
+
+    async def set_tariff_cache(
+        self,
+        tariff_id: int,
+        tariff_data: dict,
+        release_lock: bool = False,
+    ):
+        """
+        release_lock=True - только если лок взят этим воркером
+        (cached_tariff_or_lock вернул True), иначе снимется чужой лок.
+        """
         try:
             tariff_data.pop("id", None)
 
@@ -24,23 +63,28 @@ class RedisClientTariff(RedisClient):
                 str(tariff_id),
                 tariff_data,
                 expire=ExpireTime.DAY.value,
+                release_lock=release_lock,
             )
 
         except Exception as e:
             logger.error(f"Ошибка при сохранении тарифа с ID {tariff_id}: {e}")
 
-    async def update_tariff_cache(self, tariff_id: int, new_tariff_data: dict) -> None:
+    async def set_tariffs_cache(self, tariffs: dict[int, dict]) -> int:
         try:
-            existing_data = await self.get_cache(RedisKeys.TARIFF, str(tariff_id))
+            return await self.set_many_cache(
+                RedisKeys.TARIFF,
+                {str(tariff_id): data for tariff_id, data in tariffs.items()},
+                expire=ExpireTime.DAY.value,
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении {len(tariffs)} тарифов: {e}")
+            return 0
 
-            if existing_data:
-                existing_data.update(new_tariff_data)
-                await self.set_cache(
-                    RedisKeys.TARIFF,
-                    str(tariff_id),
-                    existing_data,
-                    expire=None,
-                )
+    async def update_tariff_cache(self, tariff_id: int, new_tariff_data: dict) -> None:
+        try:
+            # атомарно на стороне Redis, за один round trip
+            await self.merge_cache(RedisKeys.TARIFF, str(tariff_id), new_tariff_data)
 
         except Exception as e:
             logger.error(f"Ошибка при обновлении тарифа с ID {tariff_id}: {e}")
@@ -64,3 +108,11 @@ class RedisClientTariff(RedisClient):
         except Exception as e:
             logger.error(f"Ошибка при получении кэша тарифов: {e}")
             return None
+
+    async def clear_tariff_cache(self) -> int:
+        try:
+            return await self.invalidate_prefix(RedisKeys.TARIFF)
+
+        except Exception as e:
+            logger.error(f"Ошибка при очистке кэша тарифов: {e}")
+            return 0
@@ -1,6 +1,6 @@
 from datetime import date
 
-from fastapi import APIRouter, Body, File, Query, status, UploadFile
+from fastapi import APIRouter, Body, Depends, File, Query, Response, status, UploadFile
 from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,11 +19,13 @@ from app.api.tariff.schemas import (
 )
 from app.api.tariff.utils import example_request_add_tariff
 from app.core.settings import APP_CONFIG
-from app.dao.session_maker import TransactionSessionDep
+from app.dao.export import ExportFormat, stream_response
+from app.dao.session_maker import SessionDep, TransactionSessionDep
 from app.kafka.dependencies import KafkaProducerDep
 from app.kafka.producer import KafkaProducer
 from app.rabbit.dependencies import RabbitProducerDep
 from app.redis.dependencies import RedisClientTariffDep
+from app.redis.rate_limiter import RateLimiter
 
 router = APIRouter(
     prefix=f"{APP_CONFIG.api.v1}/tariffs",
@@ -61,17 +63,21 @@ async def add_tariff(
     response_model=CalculateCostResponseSchema,
     response_class=ORJSONResponse,
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RateLimiter("tariffs-calculate"))],
 )
 async def calculate_cost(
     data: CalculateCostSchema,
-    session: AsyncSession = TransactionSessionDep,
+    session: AsyncSession = SessionDep,
     kafka: KafkaProducer = KafkaProducerDep,
     rabbit: RabbitProducer = RabbitProducerDep,
 ):
     return await TariffDAO.calculate_cost(data, session, kafka, rabbit)
 
 
-@router.post("/upload")
+@router.post(
+    "/upload",
+    dependencies=[Depends(RateLimiter("tariffs-upload"))],
+)
 async def upload_tariffs(
     file: UploadFile = File(...),
     session: AsyncSession = TransactionSessionDep,
@@ -81,6 +87,22 @@ async def upload_tariffs(
     return await TariffDAO.upload_tariffs(session, kafka, rabbit, file)
 
 
+@router.get(
+    "/export",
+    summary="Выгрузка всех тарифов в NDJSON или CSV",
+    status_code=status.HTTP_200_OK,
+)
+async def export_tariffs(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+):
+    return stream_response(
+        TariffDAO,
+        TariffRespSchema,
+        export_format,
+        filename="tariffs",
+    )
+
+
 @router.get(
     "/{tariff_id}",
     summary="Получить тариф",
@@ -90,14 +112,9 @@ async def upload_tariffs(
 )
 async def get_tariff(
     tariff_id: int,
-    session: AsyncSession = TransactionSessionDep,
     redis: RedisClientTariff = RedisClientTariffDep,
 ):
-    return await TariffDAO.get_tariff_by_id(
-        tariff_id=tariff_id,
-        session=session,
-        redis=redis,
-    )
+    return await TariffDAO.get_tariff_by_id(tariff_id=tariff_id, redis=redis)
 
 
 @router.delete(
@@ -125,11 +142,24 @@ async def delete_tariff(
     status_code=status.HTTP_200_OK,
 )
 async def get_all_tariffs(
+    response: Response,
     page: int = Query(1, ge=1, description="Номер страницы"),
     page_size: int = Query(10, ge=10, le=100, description="Записей на странице"),
-    session: AsyncSession = TransactionSessionDep,
+    cursor: str | None = Query(
+        None,
+        description="Курсор из заголовка X-Next-Cursor, page при нём не учитывается",
+    ),
+    session: AsyncSession = SessionDep,
 ):
-    return await TariffDAO.get_all_tariffs(page, page_size, session)
+    tariffs, next_cursor = await TariffDAO.get_all_tariffs(
+        page,
+        page_size,
+        session,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return tariffs
 
 
 @router.patch(
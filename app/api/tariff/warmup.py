@@ -0,0 +1,58 @@
+import time
+
+from loguru import logger
+from redis.exceptions import LockError
+
+from app.api.tariff.dao import TariffDAO
+from app.api.tariff.redis_client import RedisClientTariff
+from app.core.settings import APP_CONFIG
+from app.dao.session_maker import session_manager
+from app.redis.metrics import (
+    CACHE_WARMUP_DURATION,
+    CACHE_WARMUP_KEYS,
+    CACHE_WARMUP_LAST_SUCCESS,
+)
+from app.redis.redis_client import RedisKeys
+
+WARMUP_LOCK = f"{RedisKeys.TARIFF.value}:warmup:lock"
+
+
+async def warm_up_tariff_cache(redis: RedisClientTariff) -> int | None:
+    """
+    Прогрев кэша тарифов после деплоя или сброса Redis.
+    Выполняет только воркер, взявший лок; остальные сразу возвращают None.
+    """
+    lock = redis.lock(WARMUP_LOCK, timeout=APP_CONFIG.redis.warmup_lock_ttl)
+    try:
+        if not await lock.acquire():
+            logger.info("Прогрев кэша тарифов уже выполняет другой воркер.")
+            return None
+    except LockError as e:
+        logger.error(f"Не удалось взять лок прогрева кэша тарифов: {e}")
+        return None
+
+    start = time.perf_counter()
+    try:
+        async with session_manager.create_session() as session:
+            total = await TariffDAO.warm_up_cache(
+                session,
+                redis,
+                chunk_size=APP_CONFIG.redis.warmup_chunk_size,
+            )
+    except Exception as e:
+        logger.error(f"Ошибка при прогреве кэша тарифов: {e=!r}")
+        return None
+    finally:
+        try:
+            await lock.release()
+        except LockError:
+            logger.warning("Лок прогрева кэша тарифов истёк до окончания прогрева.")
+
+    duration = time.perf_counter() - start
+    namespace = RedisKeys.TARIFF.value
+    CACHE_WARMUP_DURATION.labels(namespace).set(duration)
+    CACHE_WARMUP_KEYS.labels(namespace).set(total)
+    CACHE_WARMUP_LAST_SUCCESS.labels(namespace).set_to_current_time()
+
+    logger.info(f"Кэш тарифов прогрет: {total} тарифов за {duration:.2f} сек.")
+    return total
@@ -7,8 +7,9 @@ from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from app.api.tariff.warmup import warm_up_tariff_cache
 from app.core.logger_config import logger
-from app.core.settings import AppConfig
+from app.core.settings import APP_CONFIG, AppConfig
 from app.kafka.dependencies import kafka_producer
 from app.redis.dependencies import redis_cli
 from app.routers import router
@@ -24,11 +25,16 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Redis client...")
     await redis_cli.setup()  # если нужен постоянный коннект
 
+    if APP_CONFIG.redis.warmup_on_startup:
+        logger.info("Warming up tariff cache...")
+        await warm_up_tariff_cache(redis_cli)
+
     yield  # Здесь приложение будет работать
 
     logger.info("Shutting down server...")
     await kafka_producer.stop()
     await redis_cli.close()
+    await logger.complete()  # дописать очередь enqueue-обработчиков
 
 
 def create_app(config: AppConfig) -> FastAPI:
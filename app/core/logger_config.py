@@ -1,15 +1,61 @@
+import sys
+from typing import Any
+
 from loguru import logger
 from notifiers.logging import NotificationHandler
 
 from app.core.settings import APP_CONFIG
 
-file_path_log = "log.log"
-logger.add(file_path_log, level="ERROR", rotation="10 MB")
+
+class SampledLogger:
+    """
+    Пишет в лог только каждый every-й вызов с одного места в коде
+    (файл и строка вызова), остальные пропускает без форматирования.
+    Для info-логов на горячих путях: видно, что код выполняется,
+    но лог не растёт на каждый запрос.
+
+    sampled_logger.info("Page {} fetched with {} blogs", page, len(blogs))
+    """
+
+    def __init__(self, every: int) -> None:
+        self.every = max(every, 1)
+        self._counters: dict[tuple[str, int], int] = {}
+
+    def _sampled(self) -> bool:
+        frame = sys._getframe(2)
+        site = (frame.f_code.co_filename, frame.f_lineno)
+        count = self._counters.get(site, 0)
+        self._counters[site] = count + 1
+        return count % self.every == 0
+
+    def debug(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self._sampled():
+            logger.opt(depth=1).debug(message, *args, **kwargs)
+
+    def info(self, message: str, *args: Any, **kwargs: Any) -> None:
+        if self._sampled():
+            logger.opt(depth=1).info(message, *args, **kwargs)
+
+
+sampled_logger = SampledLogger(APP_CONFIG.log.sample_every)
+
+# стандартный обработчик loguru пишет в stderr синхронно и с уровня DEBUG
+logger.remove()
+logger.add(sys.stderr, level=APP_CONFIG.log.level, enqueue=APP_CONFIG.log.enqueue)
+
+file_path_log = APP_CONFIG.log.file
+logger.add(
+    file_path_log,
+    level=APP_CONFIG.log.file_level,
+    rotation="10 MB",
+    enqueue=APP_CONFIG.log.enqueue,
+)
 
 # send Notifications TG
 if APP_CONFIG.tg.token and APP_CONFIG.tg.chat_id and APP_CONFIG.environment != "local":
     TG_HANDLER = NotificationHandler("telegram", defaults=APP_CONFIG.tg.model_dump())
-    logger.add(TG_HANDLER, level="ERROR")
+    # enqueue: отправка в телеграм - сетевой запрос
+    logger.add(TG_HANDLER, level="ERROR", enqueue=True)
     logger.info("Telegram notifier handler added successfully.")
 else:
     logger.warning(
@@ -17,6 +17,21 @@ class Environments(StrEnum):
     test = "test"
 
 
+@unique
+class ReplicaBalancing(StrEnum):
+    # выбор реплики для чтения, см. DatabaseSessionManager.read_session_maker
+    round_robin = "round_robin"
+    least_connections = "least_connections"  # меньше всего выданных соединений
+
+
+@unique
+class CountStrategy(StrEnum):
+    # подсчёт total в списках, см. app.dao.count.count_rows
+    exact = "exact"  # SELECT count(*) - точно, но читает все подходящие строки
+    estimated = "estimated"  # оценка планировщика из EXPLAIN, без чтения строк
+    cached = "cached"  # точное значение из Redis, пересчёт раз в count_cache_ttl
+
+
 class DbConfig(BaseModel):
     user: str = ""
     password: str = ""
@@ -24,9 +39,49 @@ class DbConfig(BaseModel):
     port: int = 5432
     name: str = ""
 
-    max_size: int = 1
     echo: bool = False
 
+    # пул соединений на воркер: до pool_size + max_overflow соединений
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # сколько ждать свободное соединение, сек
+    pool_recycle: int = 1800  # переоткрывать соединения старше, сек (-1 - нет)
+    pool_pre_ping: bool = True  # проверять соединение перед выдачей из пула
+    # LIFO: под малой нагрузкой работают несколько "тёплых" соединений,
+    # остальные простаивают и закрываются по pool_recycle/на стороне сервера
+    pool_use_lifo: bool = True
+
+    # PgBouncer в режиме pool_mode=transaction: соединение с postgres
+    # отдаётся клиенту на одну транзакцию, подготовленные выражения получают
+    # уникальные имена (см. app.dao.database.asyncpg_connect_args)
+    pgbouncer: bool = False
+    # кэш подготовленных выражений на соединение. None - 100 (как в SQLAlchemy),
+    # с pgbouncer - 0; больше 0 с pgbouncer - только если в PgBouncer >= 1.21
+    # задан max_prepared_statements
+    statement_cache_size: int | None = None
+
+    # реплики для чтения (SessionDep): "host" или "host:port", учётные данные
+    # и имя БД как у основной. Пусто - всё читается с основной
+    replica_hosts: list[str] = []
+    replica_balancing: ReplicaBalancing = ReplicaBalancing.round_robin
+
+    # подсчёт total в списках по умолчанию
+    count_strategy: CountStrategy = CountStrategy.exact
+    count_cache_ttl: int = 30  # сек
+    count_estimate_threshold: int = 10000  # оценку ниже порога уточняем count(*)
+
+    # лог медленных запросов (см. app.dao.instrumentation)
+    slow_query_ms: int = 500
+    explain_sample_rate: float = 0.1  # доля медленных запросов с EXPLAIN, 0 - без
+    # EXPLAIN ANALYZE выполняет запрос ещё раз на другом соединении: только
+    # для SELECT без FOR UPDATE/SHARE, но volatile-функции тоже выполнятся
+    explain_analyze: bool = False
+
+    # повтор транзакции при serialization failure/deadlock (см. app.dao.retry)
+    retry_attempts: int = 5  # всего попыток, 1 - без повторов
+    retry_base_delay: float = 0.01  # пауза перед первым повтором, сек
+    retry_max_delay: float = 1.0  # потолок паузы, сек
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def sqlalchemy_db_uri(self) -> PostgresDsn:
@@ -41,6 +96,33 @@ class DbConfig(BaseModel):
 
         return PostgresDsn(str(multi_host_url))
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def replica_db_uris(self) -> list[PostgresDsn]:
+        uris = []
+        for replica in self.replica_hosts:
+            host, _, port = replica.partition(":")
+            multi_host_url = MultiHostUrl.build(
+                scheme="postgresql+asyncpg",
+                username=self.user,
+                password=self.password,
+                host=host,
+                port=int(port) if port else self.port,
+                path=self.name,
+            )
+            uris.append(PostgresDsn(str(multi_host_url)))
+        return uris
+
+
+class LogConfig(BaseModel):
+    level: str = "INFO"  # консоль; DEBUG включает логи каждого вызова DAO и Redis
+    file: str = "log.log"
+    file_level: str = "ERROR"
+    # запись в sink из фонового потока: вызов logger не ждёт ввода-вывода
+    enqueue: bool = True
+    # частые info-логи (SampledLogger) пишутся раз в sample_every вызовов
+    sample_every: int = 100
+
 
 class TGConfig(BaseModel):
     token: str | None = None
@@ -61,6 +143,55 @@ class KafkaConfig(BaseModel):
 class RedisConfig(BaseModel):
     host: str = ""
 
+    # пул соединений на воркер
+    max_connections: int = 50
+    pool_timeout: float = 5.0  # сколько ждать свободное соединение из пула
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 5.0
+    health_check_interval: int = 30  # PING простаивающих соединений, сек
+
+    # локальный (in-process) уровень кэша перед Redis
+    local_cache_enabled: bool = True
+    local_cache_max_size: int = 1024
+    local_cache_ttl: float = 30.0  # страховка на случай потери инвалидации, сек
+    invalidation_channel: str = "cache-invalidation"
+
+    # склейка конкурентных одиночных команд в общий пайплайн
+    auto_pipeline: bool = False
+    auto_pipeline_window: float = 0.0  # 0 - одна итерация event loop, сек
+    auto_pipeline_max_batch: int = 1000
+
+    # значения от compression_threshold байт сжимаются zlib (0 - не сжимать)
+    compression_threshold: int = 1024
+    compression_level: int = 6
+
+    # прогрев кэша тарифов при старте (и python -m app.main_cache_warmup)
+    warmup_on_startup: bool = True
+    warmup_chunk_size: int = 1000
+    warmup_lock_ttl: int = 300  # сек, лок держит только один воркер
+
+
+class RateLimitRule(BaseModel):
+    rate: float  # пополнение ведра, запросов в секунду
+    burst: int  # ёмкость ведра: сколько запросов можно сделать подряд
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    key_prefix: str = "rate-limit"
+
+    # лимиты по имени ручки, переопределяются JSON-ом в RATE_LIMIT__ROUTES
+    routes: dict[str, RateLimitRule] = {
+        "tariffs-calculate": RateLimitRule(rate=10, burst=20),
+        "tariffs-upload": RateLimitRule(rate=0.1, burst=3),
+    }
+    # API-ключи партнёров: лимит по X-API-Key только для ключа из списка,
+    # с неизвестным ключом клиент ограничивается по JWT или IP
+    api_keys: set[str] = set()
+    # индивидуальные лимиты: "<ручка>:<клиент>" -> правило, где клиент -
+    # "api-key:<ключ>", "user:<id>" или "ip:<адрес>"
+    overrides: dict[str, RateLimitRule] = {}
+
 
 class Api(BaseModel):
     project_name: str = "ExampleApp"
@@ -76,9 +207,11 @@ class AppConfig(BaseSettings):
     kafka: KafkaConfig = KafkaConfig()  # producer
     sentry_dsn: HttpUrl | None = None
     tg: TGConfig = TGConfig()
+    log: LogConfig = LogConfig()
     environment: Environments = Environments.local
     api: Api = Api()
     redis: RedisConfig = RedisConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
     rabbit: RmqConfig = RmqConfig()  # producer
     consumer: RmqConfig = RmqConfig()  # consumer
 
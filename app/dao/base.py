@@ -1,43 +1,102 @@
-from collections.abc import Sequence
-from typing import Any, Generic, TypeVar
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Sequence
+from typing import Any, cast, Generic, TypeVar
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy import delete as sqlalchemy_delete, func, update as sqlalchemy_update
+from sqlalchemy import (
+    column,
+    delete as sqlalchemy_delete,
+    func,
+    Insert,
+    insert,
+    literal,
+    Result,
+    Row,
+    Select,
+    tuple_,
+    update as sqlalchemy_update,
+    values as sqlalchemy_values,
+)
+from sqlalchemy.dialects.postgresql import Insert as PgInsert, insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql.base import ExecutableOption
 
+from .cursor import (
+    coerce_cursor_value,
+    decode_cursor,
+    encode_cursor,
+    InvalidCursorException,
+)
 from .database import Base
+from .instrumentation import instrument_dao
+from .loader import BatchLoader
 
 # Объявляем типовой параметр T с ограничением, что это наследник Base
 T = TypeVar("T", bound=Base)
+S = TypeVar("S", bound=BaseModel)
+
+# asyncpg передаёт не больше 32767 параметров в одном запросе
+MAX_QUERY_PARAMS = 32767
+
+# колонки для проекции: имена или pydantic-схема, чьи поля - колонки таблицы
+Fields = Sequence[str] | type[BaseModel]
 
 
 class BaseDAO(Generic[T]):
     model: type[T]
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # замер длительности методов наследников (см. app.dao.instrumentation)
+        instrument_dao(cls)
+
     @classmethod
     async def find_one_or_none_by_id(
         cls,
         data_id: int,
         session: AsyncSession,
+        options: Sequence[ExecutableOption] = (),
     ) -> T | None:
         # Найти запись по ID
-        logger.info(f"Поиск {cls.model.__name__} с ID: {data_id}")
+        logger.debug("Поиск {} с ID: {}", cls.model.__name__, data_id)
         try:
-            query = select(cls.model).filter_by(id=data_id)
+            query = select(cls.model).filter_by(id=data_id).options(*options)
             result = await session.execute(query)
             record = result.scalar_one_or_none()
             if record:
-                logger.info(f"Запись с ID {data_id} найдена.")
+                logger.debug("Запись с ID {} найдена.", data_id)
             else:
-                logger.info(f"Запись с ID {data_id} не найдена.")
+                logger.debug("Запись с ID {} не найдена.", data_id)
             return record
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
             raise
 
+    @classmethod
+    async def load_by_id(cls, data_id: int, schema: type[S]) -> S | None:
+        """
+        Найти запись по ID через BatchLoader: одновременные вызовы (в том
+        числе из разных запросов) выполняются одним find_by_ids.
+        Возвращает свой экземпляр schema на каждый вызов: ORM-запись пачки
+        общая для всех её вызывающих и наружу не отдаётся.
+        """
+        record = await cls._batch_loader().load(data_id)
+        if record is None:
+            return None
+        return schema.model_validate(record)
+
+    @classmethod
+    def _batch_loader(cls) -> BatchLoader:
+        # свой загрузчик у каждого DAO, не унаследованный от родителя
+        loader = cls.__dict__.get("_loader")
+        if loader is None:
+            loader = BatchLoader(cls)
+            cls._loader = loader  # type: ignore[attr-defined]
+        return loader
+
     @classmethod
     async def find_one_or_none(
         cls,
@@ -46,40 +105,98 @@ class BaseDAO(Generic[T]):
     ) -> T | None:
         # Найти одну запись по фильтрам
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(
-            f"Поиск одной записи {cls.model.__name__} по фильтрам: {filter_dict}",
+        logger.debug(
+            "Поиск одной записи {} по фильтрам: {}",
+            cls.model.__name__,
+            filter_dict,
         )
         try:
             query = select(cls.model).filter_by(**filter_dict)
             result = await session.execute(query)
             record = result.scalar_one_or_none()
             if record:
-                logger.info(f"Запись найдена по фильтрам: {filter_dict}")
+                logger.debug("Запись найдена по фильтрам: {}", filter_dict)
             else:
-                logger.info(f"Запись не найдена по фильтрам: {filter_dict}")
+                logger.debug("Запись не найдена по фильтрам: {}", filter_dict)
             return record
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске записи по фильтрам {filter_dict}: {e}")
             raise
 
+    @classmethod
+    def _columns(cls, fields: Fields) -> list[Any]:
+        # колонки таблицы, а не атрибуты модели: строки без identity map
+        names = list(fields.model_fields) if isinstance(fields, type) else fields
+        table_columns = cls.model.__table__.c
+        missing = [name for name in names if name not in table_columns]
+        if missing:
+            raise ValueError(f"Нет колонок {missing} в {cls.model.__name__}")
+        return [table_columns[name] for name in names]
+
+    @classmethod
+    def _select(
+        cls,
+        fields: Fields | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> Select:
+        """
+        select(cls.model) с опциями загрузки или, если заданы fields,
+        только эти колонки. Опции (load_only, raiseload, noload, ...)
+        переопределяют lazy=... из модели для одного запроса:
+        options=[raiseload(User.role)] - без JOIN роли.
+        Вместе fields и options не задаются: при выборке колонок опциям
+        загрузки не к чему применяться, и они молча терялись бы.
+        """
+        if fields is not None and options:
+            raise ValueError("fields и options нельзя передавать вместе")
+        if fields is not None:
+            return select(*cls._columns(fields))
+        return select(cls.model).options(*options)
+
+    @staticmethod
+    def _records(result: Result, query: Select) -> list[Any]:
+        # select(модель) - ORM-объекты, select(колонки) - строки Row
+        if query.column_descriptions[0].get("entity") is not None:
+            return list(result.scalars().all())
+        return list(result.all())
+
+    @classmethod
+    async def find_all_as(
+        cls,
+        session: AsyncSession,
+        schema: type[S],
+        filters: BaseModel | None = None,
+    ) -> list[S]:
+        """
+        Все записи по фильтрам сразу в схеме schema: выбираются только её
+        поля, без ORM-объектов и identity map. Поля схемы - колонки таблицы.
+        """
+        # с fields find_all возвращает строки Row
+        rows = cast(list[Row], await cls.find_all(session, filters, fields=schema))
+        return [schema.model_validate(row._asdict()) for row in rows]
+
     @classmethod
     async def find_all(
         cls,
         session: AsyncSession,
         filters: BaseModel | None,
-    ) -> list[T]:
+        fields: Fields | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> list[T] | list[Row]:
         if filters:
             filter_dict = filters.model_dump(exclude_unset=True)
         else:
             filter_dict = {}
-        logger.info(
-            f"Поиск всех записей {cls.model.__name__} по фильтрам: {filter_dict}",
+        logger.debug(
+            "Поиск всех записей {} по фильтрам: {}",
+            cls.model.__name__,
+            filter_dict,
         )
         try:
-            query = select(cls.model).filter_by(**filter_dict)
+            query = cls._select(fields, options).filter_by(**filter_dict)
             result = await session.execute(query)
-            records = result.scalars().all()
-            logger.info(f"Найдено {len(records)} записей.")
+            records = cls._records(result, query)
+            logger.debug("Найдено {} записей.", len(records))
             return records
         except SQLAlchemyError as e:
             logger.error(
@@ -87,19 +204,57 @@ class BaseDAO(Generic[T]):
             )
             raise
 
+    @classmethod
+    async def stream(
+        cls,
+        session: AsyncSession,
+        filters: BaseModel | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[T]:
+        """
+        Все записи по фильтрам через серверный курсор: в памяти не больше
+        chunk_size строк, первые записи доступны до окончания выборки.
+
+        async for user in UsersDAO.stream(session):
+            ...
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        logger.debug(
+            "Потоковое чтение записей {} по фильтрам: {}",
+            cls.model.__name__,
+            filter_dict,
+        )
+        query = (
+            select(cls.model)
+            .filter_by(**filter_dict)
+            .order_by(cls.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        try:
+            result = await session.stream_scalars(query)
+            async for record in result:
+                yield record
+        except SQLAlchemyError as e:
+            logger.error(
+                f"Ошибка при потоковом чтении записей по фильтрам {filter_dict}: {e}",
+            )
+            raise
+
     @classmethod
     async def add(cls, session: AsyncSession, values: BaseModel) -> T:
         # Добавить одну запись
         # todo только TransactionSessionDep иначе переделать и добавить commit() на 90 строке
         values_dict = values.model_dump(exclude_unset=True)
-        logger.info(
-            f"Добавление записи {cls.model.__name__} с параметрами: {values_dict}",
+        logger.debug(
+            "Добавление записи {} с параметрами: {}",
+            cls.model.__name__,
+            values_dict,
         )
         new_instance = cls.model(**values_dict)
         session.add(new_instance)
         try:
             await session.flush()
-            logger.info(f"Запись {cls.model.__name__} успешно добавлена.")
+            logger.debug("Запись {} успешно добавлена.", cls.model.__name__)
             # todo при успешном коммитится так как TransactionSessionDep
         except SQLAlchemyError as e:
             await session.rollback()
@@ -115,20 +270,116 @@ class BaseDAO(Generic[T]):
     ) -> list[T]:
         # Добавить несколько записей
         values_list = [item.model_dump(exclude_unset=True) for item in instances]
-        logger.info(
-            f"Добавление нескольких записей {cls.model.__name__}. Количество: {len(values_list)}",
+        logger.debug(
+            "Добавление нескольких записей {}. Количество: {}",
+            cls.model.__name__,
+            len(values_list),
         )
         new_instances = [cls.model(**values) for values in values_list]
         session.add_all(new_instances)
         try:
             await session.flush()
-            logger.info(f"Успешно добавлено {len(new_instances)} записей.")
+            logger.debug("Успешно добавлено {} записей.", len(new_instances))
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при добавлении нескольких записей: {e}")
             raise e
         return new_instances
 
+    @staticmethod
+    def _to_dicts(values: Sequence[BaseModel | dict[str, Any]]) -> list[dict[str, Any]]:
+        return [
+            item.model_dump(exclude_unset=True) if isinstance(item, BaseModel) else item
+            for item in values
+        ]
+
+    @classmethod
+    async def _execute_many(
+        cls,
+        session: AsyncSession,
+        rows: list[dict[str, Any]],
+        build_stmt: Callable[[tuple[str, ...]], Insert],
+        returning: Sequence[str] | None,
+        chunk_size: int,
+        ordered: bool = True,
+    ) -> list[Any]:
+        """
+        executemany statement'а из build_stmt пачками по chunk_size.
+        Возвращает строки RETURNING: при ordered - в порядке rows
+        (без returning - список из None), иначе - в порядке ответа БД.
+        """
+        table = cls.model.__table__
+        # executemany требует одинаковый набор колонок во всех строках,
+        # поэтому строки с разными наборами выполняются отдельными группами
+        groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+        for index, row in enumerate(rows):
+            groups[tuple(sorted(row))].append(index)
+
+        results: list[Any] = [None] * len(rows) if ordered else []
+        for columns, indexes in groups.items():
+            stmt = build_stmt(columns)
+            if returning:
+                # insertmanyvalues: INSERT ... VALUES (...), (...) RETURNING
+                stmt = stmt.returning(
+                    *(table.c[name] for name in returning),
+                    sort_by_parameter_order=ordered,
+                )
+            page_size = min(chunk_size, MAX_QUERY_PARAMS // max(len(columns), 1))
+            stmt = stmt.execution_options(insertmanyvalues_page_size=page_size)
+
+            for start in range(0, len(indexes), chunk_size):
+                chunk = indexes[start : start + chunk_size]
+                result = await session.execute(stmt, [rows[i] for i in chunk])
+                if returning and ordered:
+                    for index, returned in zip(chunk, result.all()):
+                        results[index] = returned
+                elif returning:
+                    results.extend(result.all())
+        return results
+
+    @classmethod
+    async def bulk_insert(
+        cls,
+        session: AsyncSession,
+        values: Sequence[BaseModel | dict[str, Any]],
+        returning: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> list[Row[Any]] | int:
+        """
+        Массовая вставка через Core insert: без ORM-объектов и unit of work.
+
+        С returning (например ["id"]) возвращает строки с этими колонками
+        в порядке values, иначе - число вставленных записей.
+        Объекты в сессии не появляются. Значения по умолчанию колонок
+        (default=..., в том числе вызываемые, и server_default) подставляются,
+        а ORM-события (before_insert, @validates) и каскады relationship -
+        нет: связанные объекты нужно вставлять отдельно.
+        """
+        rows = cls._to_dicts(values)
+        logger.debug(
+            "Массовая вставка записей {}. Количество: {}",
+            cls.model.__name__,
+            len(rows),
+        )
+        if not rows:
+            return [] if returning else 0
+
+        table = cls.model.__table__
+        try:
+            inserted = await cls._execute_many(
+                session,
+                rows,
+                lambda columns: insert(table),
+                returning,
+                chunk_size,
+            )
+            logger.debug("Успешно вставлено {} записей.", len(rows))
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при массовой вставке записей: {e}")
+            raise e
+        return inserted if returning else len(rows)
+
     @classmethod
     async def update(
         cls,
@@ -139,8 +390,11 @@ class BaseDAO(Generic[T]):
         # Обновить записи по фильтрам
         filter_dict = filters.model_dump(exclude_unset=True)
         values_dict = values.model_dump(exclude_unset=True)
-        logger.info(
-            f"Обновление записей {cls.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}",
+        logger.debug(
+            "Обновление записей {} по фильтру: {} с параметрами: {}",
+            cls.model.__name__,
+            filter_dict,
+            values_dict,
         )
         query = (
             sqlalchemy_update(cls.model)
@@ -151,7 +405,7 @@ class BaseDAO(Generic[T]):
         try:
             result = await session.execute(query)
             await session.flush()
-            logger.info(f"Обновлено {result.rowcount} записей.")
+            logger.debug("Обновлено {} записей.", result.rowcount)
             return result.rowcount
         except SQLAlchemyError as e:
             await session.rollback()
@@ -162,7 +416,11 @@ class BaseDAO(Generic[T]):
     async def delete(cls, session: AsyncSession, filters: BaseModel) -> int:
         # Удалить записи по фильтру
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(f"Удаление записей {cls.model.__name__} по фильтру: {filter_dict}")
+        logger.debug(
+            "Удаление записей {} по фильтру: {}",
+            cls.model.__name__,
+            filter_dict,
+        )
         if not filter_dict:
             logger.error("Нужен хотя бы один фильтр для удаления.")
             raise ValueError("Нужен хотя бы один фильтр для удаления.")
@@ -171,7 +429,7 @@ class BaseDAO(Generic[T]):
         try:
             result = await session.execute(query)
             await session.flush()
-            logger.info(f"Удалено {result.rowcount} записей.")
+            logger.debug("Удалено {} записей.", result.rowcount)
             return result.rowcount
         except SQLAlchemyError as e:
             await session.rollback()
@@ -182,14 +440,16 @@ class BaseDAO(Generic[T]):
     async def count(cls, session: AsyncSession, filters: BaseModel) -> int:
         # Подсчитать количество записей
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(
-            f"Подсчет количества записей {cls.model.__name__} по фильтру: {filter_dict}",
+        logger.debug(
+            "Подсчет количества записей {} по фильтру: {}",
+            cls.model.__name__,
+            filter_dict,
         )
         try:
             query = select(func.count(cls.model.id)).filter_by(**filter_dict)
             result = await session.execute(query)
             count = result.scalar() or 0
-            logger.info(f"Найдено {count} записей.")
+            logger.debug("Найдено {} записей.", count)
             return count
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при подсчете записей: {e}")
@@ -202,100 +462,422 @@ class BaseDAO(Generic[T]):
         page: int = 1,
         page_size: int = 10,
         filters: BaseModel | None = None,
-    ) -> list[T]:
+        fields: Fields | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> list[T] | list[Row]:
         # Пагинация записей
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
-        logger.info(
-            f"Пагинация записей {cls.model.__name__} по фильтру: {filter_dict}, страница: {page}, размер страницы: {page_size}",
+        logger.debug(
+            "Пагинация записей {} по фильтру: {}, страница: {}, размер страницы: {}",
+            cls.model.__name__,
+            filter_dict,
+            page,
+            page_size,
         )
         try:
-            query = select(cls.model).filter_by(**filter_dict)
-            result = await session.execute(
-                query.offset((page - 1) * page_size).limit(page_size),
+            # без ORDER BY postgres не гарантирует одинаковый порядок между страницами
+            query = (
+                cls._select(fields, options)
+                .filter_by(**filter_dict)
+                .order_by(cls.model.id)
+                .offset((page - 1) * page_size)
+                .limit(page_size)
             )
-            records = result.scalars().all()
-            logger.info(f"Найдено {len(records)} записей на странице {page}.")
+            result = await session.execute(query)
+            records = cls._records(result, query)
+            logger.debug("Найдено {} записей на странице {}.", len(records), page)
             return records
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при пагинации записей: {e}")
             raise
 
     @classmethod
-    async def find_by_ids(cls, session: AsyncSession, ids: list[int]) -> list[Any]:
+    def _key_columns(cls, order_by: str) -> list[Any]:
+        # id добавляется вторым ключом: значения order_by могут повторяться
+        if order_by == "id":
+            return [cls.model.id]
+        return [getattr(cls.model, order_by), cls.model.id]
+
+    @classmethod
+    def cursor_for(
+        cls,
+        record: T,
+        order_by: str = "id",
+        descending: bool = False,
+    ) -> str:
+        """Курсор на страницу, следующую за record."""
+        values = [getattr(record, c.key) for c in cls._key_columns(order_by)]
+        return encode_cursor(order_by, descending, values)
+
+    @classmethod
+    async def keyset_page(
+        cls,
+        session: AsyncSession,
+        query: Select,
+        cursor: str | None = None,
+        page_size: int = 10,
+        order_by: str = "id",
+        descending: bool = False,
+    ) -> tuple[list[T], str | None]:
+        """
+        Keyset-пагинация произвольного select(cls.model): вместо OFFSET
+        условие WHERE (order_by, id) > (значения из курсора), поэтому любая
+        страница стоит как первая при индексе по order_by.
+        Возвращает записи и курсор следующей страницы (None - страница последняя).
+        """
+        key_columns = cls._key_columns(order_by)
+        if cursor:
+            values = decode_cursor(cursor, order_by, descending)
+            if len(values) != len(key_columns):
+                raise InvalidCursorException
+            bounds = []
+            for key_column, value in zip(key_columns, values):
+                value = coerce_cursor_value(value, key_column.type.python_type)
+                bounds.append(literal(value, key_column.type))
+            key, bound = tuple_(*key_columns), tuple_(*bounds)
+            query = query.where(key < bound if descending else key > bound)
+
+        query = query.order_by(
+            *(c.desc() if descending else c.asc() for c in key_columns),
+        ).limit(page_size + 1)
+        result = await session.execute(query)
+        records = cls._records(result, query)
+
+        next_cursor = None
+        if len(records) > page_size:
+            records = records[:page_size]
+            next_cursor = cls.cursor_for(records[-1], order_by, descending)
+        return records, next_cursor
+
+    @classmethod
+    async def paginate_keyset(
+        cls,
+        session: AsyncSession,
+        cursor: str | None = None,
+        page_size: int = 10,
+        filters: BaseModel | None = None,
+        order_by: str = "id",
+        descending: bool = False,
+        fields: Fields | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> tuple[list[T] | list[Row], str | None]:
+        # Пагинация записей по курсору
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        logger.debug(
+            "Keyset-пагинация записей {} по фильтру: {}, сортировка: {}, размер страницы: {}",
+            cls.model.__name__,
+            filter_dict,
+            order_by,
+            page_size,
+        )
+        try:
+            records, next_cursor = await cls.keyset_page(
+                session,
+                cls._select(fields, options).filter_by(**filter_dict),
+                cursor=cursor,
+                page_size=page_size,
+                order_by=order_by,
+                descending=descending,
+            )
+            logger.debug("Найдено {} записей.", len(records))
+            return records, next_cursor
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка при keyset-пагинации записей: {e}")
+            raise
+
+    @classmethod
+    async def find_by_ids(
+        cls,
+        session: AsyncSession,
+        ids: list[int],
+        fields: Fields | None = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> list[Any]:
         """Найти несколько записей по списку ID"""
-        logger.info(f"Поиск записей {cls.model.__name__} по списку ID: {ids}")
+        logger.debug("Поиск записей {} по списку ID: {}", cls.model.__name__, ids)
         try:
-            query = select(cls.model).filter(cls.model.id.in_(ids))
+            query = cls._select(fields, options).filter(cls.model.id.in_(ids))
             result = await session.execute(query)
-            records = result.scalars().all()
-            logger.info(f"Найдено {len(records)} записей по списку ID.")
+            records = cls._records(result, query)
+            logger.debug("Найдено {} записей по списку ID.", len(records))
             return records
         except SQLAlchemyError as e:
             logger.error(f"Ошибка при поиске записей по списку ID: {e}")
             raise
 
+    @classmethod
+    def _upsert_set(
+        cls,
+        stmt: PgInsert,
+        columns: Sequence[str],
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str] | None,
+    ) -> dict[str, Any]:
+        # что обновлять при конфликте: по умолчанию все переданные колонки,
+        # кроме ключа конфликта
+        if update_fields is None:
+            update_fields = [c for c in columns if c not in unique_fields and c != "id"]
+        set_: dict[str, Any] = {
+            name: stmt.excluded[name] for name in update_fields if name in columns
+        }
+        if not set_:
+            return set_
+        if "updated_at" in cls.model.__table__.c:
+            # onupdate в ON CONFLICT не срабатывает
+            set_.setdefault("updated_at", func.now())
+        return set_
+
+    @classmethod
+    def _on_conflict(
+        cls,
+        stmt: PgInsert,
+        columns: Sequence[str],
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str] | None,
+    ) -> PgInsert:
+        set_ = cls._upsert_set(stmt, columns, unique_fields, update_fields)
+        if not set_:
+            # обновлять нечего: DO NOTHING не пишет новую версию существующей
+            # строки и не блокирует её, но и не возвращает её в RETURNING -
+            # такие строки upsert и upsert_many дочитывают SELECT'ом
+            return stmt.on_conflict_do_nothing(index_elements=unique_fields)
+        return stmt.on_conflict_do_update(index_elements=unique_fields, set_=set_)
+
+    @classmethod
+    async def _select_by_keys(
+        cls,
+        session: AsyncSession,
+        unique_fields: Sequence[str],
+        keys: list[tuple[Any, ...]],
+        returning: Sequence[str],
+        chunk_size: int,
+    ) -> list[Row[Any]]:
+        # строки, которые ON CONFLICT DO NOTHING не вернул в RETURNING
+        table = cls.model.__table__
+        key_columns = tuple_(*(table.c[name] for name in unique_fields))
+        rows: list[Row[Any]] = []
+        for start in range(0, len(keys), chunk_size):
+            result = await session.execute(
+                select(*(table.c[name] for name in returning)).where(
+                    key_columns.in_(keys[start : start + chunk_size]),
+                ),
+            )
+            rows.extend(result.all())
+        return rows
+
     @classmethod
     async def upsert(
         cls,
         session: AsyncSession,
         unique_fields: list[str],
         values: BaseModel,
+        update_fields: list[str] | None = None,
     ) -> T:
-        """Создать запись или обновить существующую"""
-        values_dict = values.model_dump(exclude_unset=True)
-        filter_dict = {
-            field: values_dict[field] for field in unique_fields if field in values_dict
-        }
+        """
+        Создать запись или обновить существующую одним запросом:
+        INSERT ... ON CONFLICT (unique_fields) DO UPDATE ... RETURNING.
+
+        unique_fields - колонки уникального индекса, по которому ищется конфликт,
+        update_fields - что обновлять (по умолчанию все переданные, кроме ключа).
+        Если обновлять нечего - ON CONFLICT DO NOTHING, существующая запись
+        дочитывается отдельным SELECT.
 
-        logger.info(f"Upsert для {cls.model.__name__}")
+        На unique_fields должен быть уникальный индекс или ограничение ровно
+        по этим колонкам, иначе postgres отклонит запрос ("there is no unique
+        or exclusion constraint matching the ON CONFLICT specification").
+        Прежняя реализация (поиск и затем INSERT/UPDATE) работала и без него.
+        """
+        values_dict = values.model_dump(exclude_unset=True)
+        logger.debug("Upsert для {}", cls.model.__name__)
         try:
-            existing = await cls.find_one_or_none(
-                session,
-                BaseModel.model_construct(**filter_dict),
+            key = {field: values_dict[field] for field in unique_fields}
+        except KeyError as e:
+            raise ValueError(f"В записи нет поля ключа конфликта {e}") from e
+        try:
+            stmt = pg_insert(cls.model).values(**values_dict)
+            stmt = cls._on_conflict(
+                stmt,
+                list(values_dict),
+                unique_fields,
+                update_fields,
             )
-            if existing:
-                # Обновляем существующую запись
-                for key, value in values_dict.items():
-                    setattr(existing, key, value)
-                await session.flush()
-                logger.info(f"Обновлена существующая запись {cls.model.__name__}")
-                return existing
-            else:
-                # Создаем новую запись
-                new_instance = cls.model(**values_dict)
-                session.add(new_instance)
-                await session.flush()
-                logger.info(f"Создана новая запись {cls.model.__name__}")
-                return new_instance
+            result = await session.scalars(
+                stmt.returning(cls.model),
+                execution_options={"populate_existing": True},
+            )
+            record = result.one_or_none()
+            if record is None:
+                # конфликт при DO NOTHING: запись уже есть и не менялась
+                record = (
+                    await session.scalars(select(cls.model).filter_by(**key))
+                ).one()
+            logger.debug(
+                "Upsert записи {} с ID {} выполнен",
+                cls.model.__name__,
+                record.id,
+            )
+            return record
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при upsert: {e}")
             raise
 
     @classmethod
-    async def bulk_update(cls, session: AsyncSession, records: list[BaseModel]) -> int:
-        """Массовое обновление записей"""
-        logger.info(f"Массовое обновление записей {cls.model.__name__}")
+    async def upsert_many(
+        cls,
+        session: AsyncSession,
+        unique_fields: list[str],
+        values: Sequence[BaseModel | dict[str, Any]],
+        update_fields: list[str] | None = None,
+        returning: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> list[Row[Any] | None] | int:
+        """
+        Массовый upsert: INSERT ... ON CONFLICT DO UPDATE пачками по chunk_size
+        (DO NOTHING, если обновлять нечего: существующие строки для returning
+        дочитываются одним SELECT по ключам на chunk_size записей).
+
+        С returning возвращает строки в порядке values (для повторяющихся
+        по ключу значений - одну и ту же строку), иначе - число уникальных
+        по ключу записей. В RETURNING всегда добавляются колонки unique_fields:
+        по ним строки ответа сопоставляются с values. Если postgres вернул ключ
+        не в том виде, в каком он передан (приведение типа, citext, обрезка
+        пробелов), строка не сопоставляется: на её месте None, пишется warning.
+        На unique_fields нужен уникальный индекс, см. upsert.
+        """
+        rows = cls._to_dicts(values)
+        logger.debug(
+            "Массовый upsert записей {}. Количество: {}",
+            cls.model.__name__,
+            len(rows),
+        )
+        if not rows:
+            return [] if returning else 0
+
+        # postgres не даёт одному INSERT ... ON CONFLICT DO UPDATE обновить
+        # строку дважды: из повторов по ключу остаётся последний
         try:
-            updated_count = 0
-            for record in records:
-                record_dict = record.model_dump(exclude_unset=True)
-                if "id" not in record_dict:
-                    continue
-
-                update_data = {k: v for k, v in record_dict.items() if k != "id"}
-                stmt = (
-                    sqlalchemy_update(cls.model)
-                    .filter_by(id=record_dict["id"])
-                    .values(**update_data)
+            keys = [tuple(row[field] for field in unique_fields) for row in rows]
+        except KeyError as e:
+            raise ValueError(f"В записи нет поля ключа конфликта {e}") from e
+        positions = {key: index for index, key in enumerate(keys)}
+        unique_rows = [rows[index] for index in positions.values()]
+
+        def build_stmt(columns: tuple[str, ...]) -> Insert:
+            stmt = pg_insert(cls.model.__table__)
+            return cls._on_conflict(stmt, columns, unique_fields, update_fields)
+
+        # sort_by_parameter_order для upsert SQLAlchemy выполняет построчно,
+        # поэтому порядок восстанавливаем сами - по ключу конфликта
+        if returning:
+            returning = [*returning, *(f for f in unique_fields if f not in returning)]
+        try:
+            upserted = await cls._execute_many(
+                session,
+                unique_rows,
+                build_stmt,
+                returning,
+                chunk_size,
+                ordered=False,
+            )
+            logger.debug("Upsert {} записей выполнен.", len(unique_rows))
+            if not returning:
+                return len(unique_rows)
+
+            by_key = {
+                tuple(getattr(row, field) for field in unique_fields): row
+                for row in upserted
+            }
+            not_returned = [key for key in positions if key not in by_key]
+            if not_returned:
+                existing = await cls._select_by_keys(
+                    session,
+                    unique_fields,
+                    not_returned,
+                    returning,
+                    chunk_size,
                 )
-                result = await session.execute(stmt)
-                updated_count += result.rowcount
+                for row in existing:
+                    by_key[tuple(getattr(row, f) for f in unique_fields)] = row
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Ошибка при массовом upsert: {e}")
+            raise e
+
+        matched = [by_key.get(key) for key in keys]
+        missed = sum(row is None for row in matched)
+        if missed:
+            logger.warning(
+                "Upsert {}: {} записей не сопоставлены с RETURNING по {}",
+                cls.model.__name__,
+                missed,
+                unique_fields,
+            )
+        return matched
+
+    @classmethod
+    async def bulk_update(
+        cls,
+        session: AsyncSession,
+        records: Sequence[BaseModel | dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Массовое обновление записей по id:
+        UPDATE ... SET ... FROM (VALUES (...), (...)) WHERE id = data.id.
+
+        Записи группируются по набору изменяемых колонок, на каждую группу -
+        запрос на chunk_size строк. Записи без id пропускаются.
+        Возвращает число обновлённых строк.
+        """
+        logger.debug("Массовое обновление записей {}", cls.model.__name__)
+        # повтор id внутри одного UPDATE ... FROM postgres применит один раз
+        # и в каком-то одном варианте, поэтому повторы идут следующими
+        # "поколениями": порядок записи и подсчёт строк как при обновлении по одной
+        groups: dict[tuple[int, tuple[str, ...]], list[dict[str, Any]]] = defaultdict(
+            list,
+        )
+        seen: dict[Any, int] = defaultdict(int)
+        for record in cls._to_dicts(records):
+            if "id" not in record:
+                continue
+            columns = tuple(sorted(k for k in record if k != "id"))
+            if not columns:
+                continue
+            generation = seen[record["id"]]
+            seen[record["id"]] += 1
+            groups[(generation, columns)].append(record)
+
+        table = cls.model.__table__
+        try:
+            updated_count = 0
+            for (_, columns), rows in sorted(groups.items()):
+                page_size = min(chunk_size, MAX_QUERY_PARAMS // (len(columns) + 1))
+                for start in range(0, len(rows), page_size):
+                    chunk = rows[start : start + page_size]
+                    data = sqlalchemy_values(
+                        *(
+                            column(name, table.c[name].type)
+                            for name in ("id", *columns)
+                        ),
+                        name="data",
+                    ).data([(row["id"], *(row[c] for c in columns)) for row in chunk])
+                    stmt = (
+                        sqlalchemy_update(cls.model)
+                        .where(cls.model.id == data.c.id)
+                        .values({name: data.c[name] for name in columns})
+                        .execution_options(synchronize_session="fetch")
+                    )
+                    result = await session.execute(stmt)
+                    updated_count += result.rowcount
 
             await session.flush()
-            logger.info(f"Обновлено {updated_count} записей")
+            logger.debug("Обновлено {} записей", updated_count)
             return updated_count
         except SQLAlchemyError as e:
             await session.rollback()
             logger.error(f"Ошибка при массовом обновлении: {e}")
             raise
+
+
+instrument_dao(BaseDAO)
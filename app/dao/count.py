@@ -0,0 +1,102 @@
+import hashlib
+import time
+from typing import Any
+
+import orjson
+from loguru import logger
+from sqlalchemy import Dialect, func, Select, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import APP_CONFIG, CountStrategy
+from app.redis.redis_client import RedisClient, RedisKeys
+
+
+def _compile(query: Select, dialect: Dialect | None = None) -> str:
+    # литералы вместо параметров: для EXPLAIN и как ключ кэша
+    return str(
+        query.compile(
+            dialect=dialect or postgresql.dialect(),
+            compile_kwargs={"literal_binds": True},
+        ),
+    )
+
+
+def _cache_key(query: Select) -> tuple[str, str]:
+    table = query.columns_clause_froms[0].name  # type: ignore[attr-defined]
+    digest = hashlib.sha1(_compile(query).encode("utf-8")).hexdigest()
+    return f"{RedisKeys.COUNT.value}:{table}", digest
+
+
+async def exact_count(session: AsyncSession, query: Select) -> int:
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return await session.scalar(count_query) or 0
+
+
+async def explain(session: AsyncSession, query: Select) -> dict[str, Any]:
+    """Корневой узел плана query (EXPLAIN (FORMAT JSON)), без выполнения запроса."""
+    connection = await session.connection()
+    sql = _compile(query, connection.dialect)
+    # exec_driver_sql, а не text(): в литералах могут быть ":name"
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = orjson.loads(plan)
+    return plan[0]["Plan"]  # type: ignore[index]
+
+
+async def estimated_count(session: AsyncSession, query: Select) -> int:
+    """
+    Оценка числа строк планировщиком (Plan Rows из EXPLAIN): по статистике
+    pg_class.reltuples и селективности фильтров, без выполнения запроса.
+    """
+    plan = await explain(session, query.order_by(None))
+    return int(plan["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession,
+    query: Select,
+    strategy: CountStrategy = CountStrategy.exact,
+    redis: RedisClient | None = None,
+) -> tuple[int, bool]:
+    """
+    Число строк query по выбранной стратегии.
+    Возвращает (число, точное ли оно).
+    """
+    if strategy == CountStrategy.estimated:
+        estimate = await estimated_count(session, query)
+        # небольшую выборку дешевле посчитать точно, чем показывать оценку
+        if estimate > APP_CONFIG.db.count_estimate_threshold:
+            return estimate, False
+        return await exact_count(session, query), True
+
+    if strategy == CountStrategy.cached and redis is not None:
+        key, field = _cache_key(query)
+        cached = await redis.get_cache(key, field)
+        if cached and cached["expires_at"] > time.time():
+            return cached["count"], False
+
+        total = await exact_count(session, query)
+        ttl = APP_CONFIG.db.count_cache_ttl
+        # expire у хэша общий на все фильтры, поэтому срок хранится в значении
+        await redis.set_cache(
+            key,
+            field,
+            {"count": total, "expires_at": time.time() + ttl},
+            expire=ttl,
+        )
+        return total, True
+
+    return await exact_count(session, query), True
+
+
+async def invalidate_counts(redis: RedisClient, table: str) -> None:
+    """
+    Сбрасывает закэшированные count по таблице после записи в неё: все
+    фильтры таблицы - поля одного хэша, поэтому удаляется один ключ.
+    """
+    try:
+        await redis.del_all_cache(f"{RedisKeys.COUNT.value}:{table}")
+    except Exception as e:
+        logger.error(f"Ошибка при сбросе кэша count таблицы {table}: {e}")
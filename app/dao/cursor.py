@@ -0,0 +1,67 @@
+import base64
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+
+InvalidCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Некорректный курсор пагинации",
+)
+
+
+def encode_cursor(order_by: str, descending: bool, values: list[Any]) -> str:
+    """
+    Непрозрачный курсор keyset-пагинации: колонка сортировки, направление
+    и значения ключа последней записи страницы.
+    """
+    payload = orjson.dumps({"o": order_by, "d": descending, "v": values})
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, descending: bool) -> list[Any]:
+    """Значения ключа из курсора; курсор от другой сортировки не принимается."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        values = payload["v"]
+        if payload["o"] != order_by or payload["d"] != descending:
+            raise InvalidCursorException
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorException
+
+    if not isinstance(values, list):
+        raise InvalidCursorException
+    return values
+
+
+def coerce_cursor_value(value: Any, python_type: type) -> Any:
+    """
+    Значение из курсора, приведённое к типу колонки ключа. Подделанный курсор
+    (строка вместо числа и т. п.) - InvalidCursorException (400), а не ошибка
+    postgres при выполнении запроса (500).
+    """
+    try:
+        if isinstance(value, bool) or value is None:
+            raise TypeError
+        if python_type is datetime:
+            if not isinstance(value, str):
+                raise TypeError
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            if not isinstance(value, str):
+                raise TypeError
+            return date.fromisoformat(value)
+        if python_type is Decimal:
+            if not isinstance(value, (str, int, float)):
+                raise TypeError
+            return Decimal(value)
+        if python_type is float and isinstance(value, int):
+            return float(value)
+        if not isinstance(value, python_type):
+            raise TypeError
+        return value
+    except (ValueError, TypeError, InvalidOperation):
+        raise InvalidCursorException
@@ -1,27 +1,86 @@
 from datetime import datetime
 from typing import Annotated, Any
+from uuid import uuid4
 
-from sqlalchemy import func, Integer, TIMESTAMP
+from sqlalchemy import func, inspect, Integer, TIMESTAMP
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     AsyncAttrs,
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, declared_attr, Mapped, mapped_column
 
 from app.core.settings import APP_CONFIG
+from app.dao.instrumentation import instrument_engine, instrument_pool, InstrumentedPool
 
-engine = create_async_engine(
-    url=str(APP_CONFIG.db.sqlalchemy_db_uri),
-    echo=APP_CONFIG.db.echo,
-)
 
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,  # todo: обязательно False
-)
+def asyncpg_connect_args(
+    pgbouncer: bool,
+    statement_cache_size: int | None = None,
+) -> dict[str, Any]:
+    """
+    Параметры asyncpg для create_async_engine(connect_args=...).
+    PgBouncer в режиме transaction отдаёт каждую транзакцию любому серверному
+    соединению: выражение, подготовленное в одном, в другом не существует,
+    а имена __asyncpg_stmt_N__ разных клиентов совпадают. Поэтому имена
+    уникальные (uuid), а кэш подготовленных выражений по умолчанию выключен.
+    """
+    if not pgbouncer:
+        if statement_cache_size is None:
+            return {}
+        return {"prepared_statement_cache_size": statement_cache_size}
+    return {
+        # собственный кэш asyncpg (SQLAlchemy готовит выражения сама)
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": statement_cache_size or 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def create_engine(
+    url: str,
+    name: str,
+    pgbouncer: bool = APP_CONFIG.db.pgbouncer,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        echo=APP_CONFIG.db.echo,
+        connect_args=asyncpg_connect_args(
+            pgbouncer,
+            APP_CONFIG.db.statement_cache_size,
+        ),
+        poolclass=InstrumentedPool,
+        pool_size=APP_CONFIG.db.pool_size,
+        max_overflow=APP_CONFIG.db.max_overflow,
+        pool_timeout=APP_CONFIG.db.pool_timeout,
+        pool_recycle=APP_CONFIG.db.pool_recycle,
+        pool_pre_ping=APP_CONFIG.db.pool_pre_ping,
+        pool_use_lifo=APP_CONFIG.db.pool_use_lifo,
+    )
+    instrument_engine(engine)
+    instrument_pool(engine, name)
+    return engine
+
+
+def create_session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,  # todo: обязательно False
+    )
+
+
+engine = create_engine(str(APP_CONFIG.db.sqlalchemy_db_uri), "primary")
+async_session_maker = create_session_maker(engine)
+
+# реплики только для чтения, см. DatabaseSessionManager.create_session
+replica_engines = [
+    create_engine(str(uri), f"replica-{i}")
+    for i, uri in enumerate(APP_CONFIG.db.replica_db_uris)
+]
+replica_session_makers = [create_session_maker(e) for e in replica_engines]
 
 str_uniq = Annotated[str, mapped_column(unique=True, nullable=False)]
 
@@ -54,7 +113,13 @@ class Base(AsyncAttrs, DeclarativeBase):
         # fmt = "{}.{}({})"  # добавляем пакет
         # package = self.__class__.__module__  # также можно добавить имя пакета в откладку
         class_ = self.__class__.__name__
-        attrs = sorted((k, getattr(self, k)) for k in self.__mapper__.columns.keys())
+        # незагруженные (deferred) колонки пропускаем: их чтение - запрос к БД
+        unloaded = inspect(self).unloaded
+        attrs = sorted(
+            (k, getattr(self, k))
+            for k in self.__mapper__.columns.keys()
+            if k not in unloaded
+        )
         sattrs = ", ".join("{}={!r}".format(*x) for x in attrs)
         return fmt.format(class_, sattrs)
         # return fmt.format(package, class_, sattrs)  # если нужен пакет в откладке
@@ -0,0 +1,104 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from enum import StrEnum, unique
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.dao.base import BaseDAO
+from app.dao.session_maker import session_manager
+
+
+@unique
+class ExportFormat(StrEnum):
+    json = "json"  # JSON-массив, как у обычного списочного ответа
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.json: "application/json",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+# сколько байт копить перед отправкой клиенту: send на каждую строку - лишние
+# переключения event loop и системные вызовы
+BUFFER_SIZE = 64 * 1024
+
+
+async def _rows(
+    dao: type[BaseDAO],
+    schema: type[BaseModel],
+    filters: BaseModel | None,
+    chunk_size: int,
+) -> AsyncIterator[dict]:
+    # сессия открывается здесь, а не берётся из SessionDep: зависимости
+    # с yield закрываются до того, как начнёт отправляться тело ответа
+    async with session_manager.create_session(read_only=True) as session:
+        async for record in dao.stream(session, filters=filters, chunk_size=chunk_size):
+            yield schema.model_validate(record).model_dump(mode="json")
+
+
+async def _encode(
+    rows: AsyncIterator[dict],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    buffer = bytearray(b"[" if export_format == ExportFormat.json else b"")
+    text = io.StringIO()
+    writer: csv.DictWriter | None = None
+    first = True
+
+    async for row in rows:
+        if export_format == ExportFormat.csv:
+            if writer is None:
+                writer = csv.DictWriter(text, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            buffer += text.getvalue().encode("utf-8")
+            text.seek(0)
+            text.truncate()
+        elif export_format == ExportFormat.json:
+            if not first:
+                buffer += b","
+            buffer += orjson.dumps(row)
+        else:
+            buffer += orjson.dumps(row) + b"\n"
+
+        # первую строку отдаём сразу: клиент получает ответ, не дожидаясь выборки
+        if first or len(buffer) >= BUFFER_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+        first = False
+
+    if export_format == ExportFormat.json:
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
+
+
+def stream_response(
+    dao: type[BaseDAO],
+    schema: type[BaseModel],
+    export_format: ExportFormat = ExportFormat.json,
+    filters: BaseModel | None = None,
+    filename: str | None = None,
+    chunk_size: int = 1000,
+) -> StreamingResponse:
+    """
+    Ответ со всеми записями dao в формате export_format. Записи читаются
+    серверным курсором и кодируются по мере чтения: память не зависит
+    от размера таблицы.
+    """
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format.value}"'
+        )
+    return StreamingResponse(
+        _encode(_rows(dao, schema, filters, chunk_size), export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
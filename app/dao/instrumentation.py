@@ -0,0 +1,251 @@
+"""
+Наблюдаемость запросов к БД: длительность каждого SQL по отпечатку и методу
+DAO, длительность методов DAO, лог медленных запросов с EXPLAIN.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import random
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.settings import APP_CONFIG
+from app.dao.metrics import (
+    DAO_METHOD_DURATION,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT,
+    DB_QUERY_DURATION,
+    DB_SLOW_QUERIES,
+)
+
+# метод DAO, из которого выполняется запрос ("TariffDAO.get_tariff_by_id")
+current_dao_method: ContextVar[str] = ContextVar("current_dao_method", default="")
+
+_PLACEHOLDERS = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+# приведение типа параметра, которое рисует asyncpg: $1::INTEGER,
+# $2::VARCHAR(20), $3::TIMESTAMP WITHOUT TIME ZONE, $4::INTEGER[]
+_CASTS = re.compile(
+    r"\?::(?:DOUBLE PRECISION|\w+)(?:\(\d+(?:, ?\d+)?\))?"
+    r"(?: WITH(?:OUT)? TIME ZONE)?(?:\[\])*",
+)
+# числа-литералы, в т.ч. счётчик строк insertmanyvalues (VALUES (?, ?, 0), ...)
+_NUMBERS = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+_LISTS = re.compile(r"\?(?:, \?)+")
+_VALUES_LISTS = re.compile(r"\(\?\)(?:, \(\?\))+")
+_SPACES = re.compile(r"\s+")
+# блокирующие SELECT: повторное выполнение взяло бы блокировки ещё раз
+_LOCKING = re.compile(r"\bFOR (?:NO KEY |KEY )?(?:UPDATE|SHARE)\b", re.IGNORECASE)
+
+# сколько отпечатков помнить, чтобы не писать их SQL в лог повторно
+SEEN_FINGERPRINTS_LIMIT = 10_000
+# отпечатки, SQL которых уже записан в лог (LRU)
+_seen_fingerprints: OrderedDict[str, None] = OrderedDict()
+# ссылки на задачи EXPLAIN, чтобы их не собрал GC до завершения
+_explain_tasks: set[asyncio.Task] = set()
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    Нормализованный запрос -> (операция, короткий отпечаток).
+    Параметры (вместе с приведением типа asyncpg), числа, списки IN и пачки
+    VALUES insertmanyvalues сворачиваются, поэтому отпечаток не зависит
+    от значений и размера пачки.
+    """
+    normalized = _SPACES.sub(" ", statement).strip()
+    normalized = _PLACEHOLDERS.sub("?", normalized)
+    normalized = _CASTS.sub("?", normalized)
+    normalized = _NUMBERS.sub("?", normalized)
+    normalized = _LISTS.sub("?", normalized)
+    normalized = _VALUES_LISTS.sub("(?)", normalized)
+    operation = normalized.split(" ", 1)[0].upper()
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+    if digest in _seen_fingerprints:
+        _seen_fingerprints.move_to_end(digest)
+    else:
+        _seen_fingerprints[digest] = None
+        if len(_seen_fingerprints) > SEEN_FINGERPRINTS_LIMIT:
+            _seen_fingerprints.popitem(last=False)
+        logger.debug("SQL fingerprint {}: {}", digest, normalized)
+    return operation, digest
+
+
+def can_analyze(operation: str, statement: str) -> bool:
+    """
+    Можно ли выполнить statement повторно ради EXPLAIN ANALYZE на другом
+    соединении: только SELECT (WITH может содержать изменяющие CTE) без
+    FOR UPDATE/SHARE. Побочные эффекты функций (nextval и т.п.) так не
+    распознать, поэтому ANALYZE включается отдельно (DB__EXPLAIN_ANALYZE).
+    """
+    return operation == "SELECT" and not _LOCKING.search(statement)
+
+
+def _timed(method: Callable) -> Callable:
+    @wraps(method)
+    async def wrapper(cls, *args, **kwargs):
+        name = f"{cls.__name__}.{method.__name__}"
+        token = current_dao_method.set(name)
+        start = time.perf_counter()
+        try:
+            return await method(cls, *args, **kwargs)
+        finally:
+            DAO_METHOD_DURATION.labels(name).observe(time.perf_counter() - start)
+            current_dao_method.reset(token)
+
+    wrapper.__dao_timed__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def instrument_dao(cls: type) -> None:
+    """
+    Оборачивает публичные асинхронные classmethod'ы DAO: замер длительности
+    и имя метода в current_dao_method для запросов внутри него.
+    Асинхронные генераторы (stream) не оборачиваются - их запросы
+    относятся к вызвавшему методу.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not isinstance(attr, classmethod):
+            continue
+        method = attr.__func__
+        if inspect.iscoroutinefunction(method) and not hasattr(
+            method,
+            "__dao_timed__",
+        ):
+            setattr(cls, name, classmethod(_timed(method)))
+
+
+async def _explain(
+    engine: AsyncEngine,
+    digest: str,
+    statement: str,
+    parameters: Any,
+    analyze: bool,
+) -> None:
+    # отдельное соединение: основная транзакция к этому моменту уже идёт дальше
+    options = "ANALYZE, BUFFERS, " if analyze else ""
+    try:
+        async with engine.connect() as connection:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN ({options}FORMAT TEXT) {statement}",
+                parameters,
+            )
+            plan = "\n".join(row[0] for row in result)
+            await connection.rollback()
+        logger.warning(f"План медленного запроса {digest}:\n{plan}")
+    except Exception as e:
+        logger.error(f"Не удалось получить план запроса {digest}: {e=!r}")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул asyncpg с замером времени получения соединения и счётчиком
+    таймаутов: рост ожидания виден раньше, чем рост времени ответа.
+    """
+
+    name = "primary"
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.name).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.name).observe(time.perf_counter() - start)
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() пересоздаёт пул, имя для метрик должно сохраниться
+        pool = super().recreate()
+        pool.name = self.name  # type: ignore[attr-defined]
+        return pool  # type: ignore[return-value]
+
+
+def instrument_pool(engine: AsyncEngine, name: str = "primary") -> None:
+    """
+    Метрики пула engine. Размер пула читается при каждом сборе /metrics,
+    поэтому всегда относится к текущему пулу (и после dispose()).
+    """
+    if isinstance(engine.pool, InstrumentedPool):
+        engine.pool.name = name
+    DB_POOL_SIZE.labels(name).set_function(
+        lambda: engine.pool.size(),  # type: ignore[attr-defined]
+    )
+    DB_POOL_CHECKED_OUT.labels(name).set_function(
+        lambda: engine.pool.checkedout(),  # type: ignore[attr-defined]
+    )
+    DB_POOL_OVERFLOW.labels(name).set_function(
+        lambda: engine.pool.overflow(),  # type: ignore[attr-defined]
+    )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает замер запросов и лог медленных запросов к engine."""
+    config = APP_CONFIG.db
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        # на контексте выполнения, а не стеком в conn.info: упавший запрос
+        # не вызывает after_cursor_execute, и стек соединения из пула рос бы
+        context._query_start = time.perf_counter()  # type: ignore[attr-defined]
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - context._query_start  # type: ignore[attr-defined]
+        if statement.lstrip().upper().startswith("EXPLAIN"):
+            return
+
+        operation, digest = fingerprint(statement)
+        dao_method = current_dao_method.get()
+        DB_QUERY_DURATION.labels(operation, digest, dao_method).observe(duration)
+
+        if duration * 1000 < config.slow_query_ms:
+            return
+
+        DB_SLOW_QUERIES.labels(digest, dao_method).inc()
+        logger.warning(
+            f"Медленный запрос {duration * 1000:.0f} мс "
+            f"[{dao_method or 'вне DAO'}] {digest}: {statement}",
+        )
+        # план - выборочно, по умолчанию без ANALYZE (см. can_analyze)
+        if executemany or random.random() >= config.explain_sample_rate:
+            return
+        task = asyncio.get_running_loop().create_task(
+            _explain(
+                engine,
+                digest,
+                statement,
+                parameters,
+                analyze=config.explain_analyze and can_analyze(operation, statement),
+            ),
+        )
+        _explain_tasks.add(task)
+        task.add_done_callback(_explain_tasks.discard)
@@ -0,0 +1,77 @@
+"""
+Склейка поисков по id (по образцу DataLoader): все load() за одну итерацию
+event loop - в том числе из разных конкурентных запросов - выполняются
+одним BaseDAO.find_by_ids, повторяющиеся id запрашиваются один раз.
+"""
+
+import asyncio
+from typing import Any, TYPE_CHECKING
+
+from loguru import logger
+
+from app.dao.metrics import DAO_LOADER_BATCHES, DAO_LOADER_SAVED
+from app.dao.session_maker import session_manager
+
+if TYPE_CHECKING:
+    from app.dao.base import BaseDAO
+
+
+class BatchLoader:
+    """
+    Загрузчик записей dao по id. Запрос выполняется в собственной короткой
+    сессии на основной БД (одно соединение из пула на пачку, а не на каждый
+    запрос): только что созданную запись видно сразу, без задержки репликации.
+    Записи пачки общие для всех её вызывающих, поэтому наружу их отдаёт
+    BaseDAO.load_by_id - копией в pydantic-схеме для каждого вызова.
+    """
+
+    def __init__(self, dao: type["BaseDAO"], max_batch_size: int = 1000) -> None:
+        self.dao = dao
+        self.max_batch_size = max_batch_size
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, data_id: int) -> Any | None:
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            # соберём всё, что запросят до следующей итерации event loop
+            loop.call_soon(self._dispatch)
+        future = loop.create_future()
+        self._pending.setdefault(data_id, []).append(future)
+        return await future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        ids = list(pending)
+        for start in range(0, len(ids), self.max_batch_size):
+            batch = {
+                data_id: pending[data_id]
+                for data_id in ids[start : start + self.max_batch_size]
+            }
+            task = asyncio.create_task(self._fetch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: dict[int, list[asyncio.Future]]) -> None:
+        name = self.dao.__name__
+        DAO_LOADER_BATCHES.labels(name).inc()
+        DAO_LOADER_SAVED.labels(name).inc(sum(map(len, batch.values())) - 1)
+        try:
+            # не реплика: пользователь сразу после регистрации или входа
+            # иначе может получить 401 из-за отставания репликации
+            async with session_manager.create_session() as session:
+                records = await self.dao.find_by_ids(session, list(batch))
+        except Exception as e:
+            logger.error(f"Ошибка пакетной загрузки {name}: {e=!r}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        by_id = {record.id: record for record in records}
+        for data_id, futures in batch.items():
+            for future in futures:
+                # вызывающий мог быть отменён, пока шёл запрос
+                if not future.done():
+                    future.set_result(by_id.get(data_id))
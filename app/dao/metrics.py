@@ -0,0 +1,71 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Отдаются на /metrics вместе с метриками prometheus-fastapi-instrumentator
+
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Длительность SQL-запросов по отпечатку запроса и методу DAO",
+    ["operation", "fingerprint", "dao_method"],
+    buckets=QUERY_BUCKETS,
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Запросы дольше DB__SLOW_QUERY_MS",
+    ["fingerprint", "dao_method"],
+)
+DAO_METHOD_DURATION = Histogram(
+    "dao_method_duration_seconds",
+    "Длительность методов DAO, включая все их запросы",
+    ["method"],
+    buckets=QUERY_BUCKETS,
+)
+
+# пул соединений SQLAlchemy, label pool - имя engine
+DB_POOL_SIZE = Gauge("db_pool_size", "Постоянных соединений в пуле", ["pool"])
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Соединений, выданных из пула",
+    ["pool"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Соединений сверх pool_size (отрицательное - ещё не открытые из pool_size)",
+    ["pool"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Время получения соединения из пула, включая pre-ping",
+    ["pool"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Соединение не получено за pool_timeout",
+    ["pool"],
+)
+
+# BatchLoader: поиски по id, склеенные в один запрос
+DAO_LOADER_BATCHES = Counter(
+    "dao_loader_batches_total",
+    "Запросов WHERE id IN (...) от BatchLoader",
+    ["dao"],
+)
+DAO_LOADER_SAVED = Counter(
+    "dao_loader_lookups_saved_total",
+    "Поисков по id, обслуженных чужим запросом вместо своего",
+    ["dao"],
+)
+
+# повторы транзакций DatabaseSessionManager.connection (см. app.dao.retry)
+DB_TX_RETRIES = Counter(
+    "db_transaction_retries_total",
+    "Повторов транзакции после serialization failure или deadlock",
+    ["method", "sqlstate"],
+)
+DB_TX_GIVEUPS = Counter(
+    "db_transaction_giveups_total",
+    "Транзакций, не прошедших за retry_attempts попыток",
+    ["method", "sqlstate"],
+)
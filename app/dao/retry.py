@@ -0,0 +1,51 @@
+import random
+
+# SQLSTATE ошибок, после которых транзакцию можно повторить целиком:
+# postgres откатил её сам, и повтор с начала может пройти
+RETRYABLE_SQLSTATES = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock_detected",
+}
+
+
+def retryable_sqlstate(error: BaseException) -> str | None:
+    """
+    SQLSTATE ошибки, если транзакцию после неё можно повторить, иначе None.
+    Ищется в самой ошибке, в DBAPIError.orig и в цепочке __cause__.
+    """
+    seen = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        for candidate in (current, getattr(current, "orig", None)):
+            sqlstate = getattr(candidate, "sqlstate", None)
+            if sqlstate in RETRYABLE_SQLSTATES:
+                return sqlstate
+        current = current.__cause__
+    return None
+
+
+class RetryPolicy:
+    """
+    Политика повтора транзакции: attempts попыток всего, пауза перед
+    повтором - экспоненциальная с полным джиттером (случайная от 0 до
+    base_delay * 2 ** n, не больше max_delay), чтобы конфликтующие
+    транзакции не повторялись одновременно и не сталкивались снова.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 5,
+        base_delay: float = 0.01,
+        max_delay: float = 1.0,
+    ):
+        self.attempts = max(attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Пауза перед повтором после неудачной попытки attempt (с 1)."""
+        return random.uniform(
+            0,
+            min(self.max_delay, self.base_delay * 2 ** (attempt - 1)),
+        )
@@ -1,13 +1,37 @@
-from collections.abc import AsyncGenerator, Callable
+import asyncio
+import itertools
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager
 from functools import wraps
+from typing import Any
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from loguru import logger
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
-from app.dao.database import async_session_maker
+from app.core.settings import APP_CONFIG, ReplicaBalancing
+from app.dao.database import async_session_maker, replica_session_makers
+from app.dao.metrics import DB_TX_GIVEUPS, DB_TX_RETRIES
+from app.dao.retry import retryable_sqlstate, RetryPolicy
+
+# заголовок запроса, с которым SessionDep читает с основной БД: клиент
+# видит свои только что сделанные записи, не дожидаясь репликации
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+
+# ключ session.info со списком колбэков, выполняемых после коммита
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Выполнить callback после успешного коммита транзакции session
+    (DatabaseSessionManager.transaction и connection, TransactionSessionDep). При откате
+    не выполняется. Для сброса кэшей: сброшенный до коммита кэш конкурентный
+    запрос успевает заполнить старыми данными.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
 
 
 class DatabaseSessionManager:
@@ -15,16 +39,47 @@ class DatabaseSessionManager:
     Класс для управления асинхронными сессиями базы данных, включая поддержку транзакций и зависимости FastAPI.
     """
 
-    def __init__(self, session_maker: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        replica_session_makers: Sequence[async_sessionmaker[AsyncSession]] = (),
+        replica_balancing: ReplicaBalancing = ReplicaBalancing.round_robin,
+        retry_policy: RetryPolicy | None = None,
+    ):
         self.session_maker = session_maker
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.replica_session_makers = list(replica_session_makers)
+        self.replica_balancing = replica_balancing
+        self._round_robin = itertools.cycle(self.replica_session_makers)
+
+    def read_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий для чтения: реплика по round-robin или реплика
+        с наименьшим числом выданных соединений (least_connections).
+        Без реплик - основная БД.
+        """
+        if not self.replica_session_makers:
+            return self.session_maker
+        if self.replica_balancing == ReplicaBalancing.least_connections:
+            return min(
+                self.replica_session_makers,
+                key=lambda maker: maker.kw["bind"].pool.checkedout(),
+            )
+        return next(self._round_robin)
 
     @asynccontextmanager
-    async def create_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def create_session(
+        self,
+        read_only: bool = False,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         Создаёт и предоставляет новую сессию базы данных.
         Гарантирует закрытие сессии по завершении работы.
+        read_only=True - сессия на реплике (если они настроены): только чтение,
+        изменения в ней завершатся ошибкой на стороне postgres.
         """
-        async with self.session_maker() as session:
+        session_maker = self.read_session_maker() if read_only else self.session_maker
+        async with session_maker() as session:
             try:
                 yield session
             except Exception as e:
@@ -44,18 +99,38 @@ class DatabaseSessionManager:
             yield
             await session.commit()
         except HTTPException:
+            session.info.pop(AFTER_COMMIT_KEY, None)
             await session.rollback()
             raise
         except Exception as e:
+            session.info.pop(AFTER_COMMIT_KEY, None)
             await session.rollback()
             logger.error(f"Ошибка транзакции: {e=!r}")
             raise HTTPException(status_code=500, detail="Ошибка транзакции")
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        await self._run_after_commit(session)
+
+    @staticmethod
+    async def _run_after_commit(session: AsyncSession) -> None:
+        for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+            try:
+                await callback()
+            except Exception as e:
+                # транзакция уже закоммичена, ответ клиенту не портим
+                logger.error(f"Ошибка в колбэке после коммита: {e=!r}")
+
+    async def get_session(
+        self,
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, None]:
         """
         Зависимость для FastAPI, возвращающая сессию без управления транзакцией.
+        Читает с реплики, с заголовком X-Read-Primary: 1 - с основной БД.
+        Соединение из пула AsyncSession берёт при первом запросе, поэтому
+        ответ из кэша пул не занимает.
         """
-        async with self.create_session() as session:
+        read_primary = request.headers.get(READ_PRIMARY_HEADER, "") in ("1", "true")
+        async with self.create_session(read_only=not read_primary) as session:
             yield session
 
     async def get_transaction_session(self) -> AsyncGenerator[AsyncSession, None]:
@@ -66,39 +141,79 @@ class DatabaseSessionManager:
             async with self.transaction(session):
                 yield session
 
-    def connection(self, isolation_level: str | None = None, commit: bool = True):
+    def connection(
+        self,
+        isolation_level: str | None = None,
+        commit: bool = True,
+        retry: bool = True,
+    ):
         """
         Декоратор для управления сессией с возможностью настройки уровня изоляции и коммита.
 
         Параметры:
         - `isolation_level`: уровень изоляции для транзакции (например, "SERIALIZABLE").
         - `commit`: если `True`, выполняется коммит после вызова метода.
+        - `retry`: если `True`, при serialization failure (40001) или deadlock
+          (40P01) метод выполняется заново в новой транзакции по retry_policy.
+          Метод должен быть повторяемым: без побочных эффектов вне БД
+          (Kafka, RabbitMQ, Redis) до коммита.
         """
 
         def decorator(method):
             @wraps(method)
             async def wrapper(*args, **kwargs):
-                async with self.session_maker() as session:
-                    try:
-                        if isolation_level:
-                            await session.execute(
-                                text(
-                                    f"SET TRANSACTION ISOLATION LEVEL {isolation_level}",
-                                ),
-                            )
+                policy = self.retry_policy
+                attempt = 1
+                while True:
+                    async with self.session_maker() as session:
+                        try:
+                            if isolation_level:
+                                await session.execute(
+                                    text(
+                                        f"SET TRANSACTION ISOLATION LEVEL {isolation_level}",
+                                    ),
+                                )
 
-                        result = await method(*args, session=session, **kwargs)
+                            result = await method(*args, session=session, **kwargs)
 
-                        if commit:
-                            await session.commit()
+                            if commit:
+                                await session.commit()
+                                await self._run_after_commit(session)
+
+                            return result
+                        except Exception as e:
+                            session.info.pop(AFTER_COMMIT_KEY, None)
+                            await session.rollback()
+                            sqlstate = retryable_sqlstate(e) if retry else None
+                            if sqlstate is None:
+                                logger.error(
+                                    f"Ошибка при выполнении транзакции: {e=!r}",
+                                )
+                                raise
+                            if attempt >= policy.attempts:
+                                DB_TX_GIVEUPS.labels(
+                                    method.__qualname__,
+                                    sqlstate,
+                                ).inc()
+                                logger.error(
+                                    "Транзакция {} не прошла за {} попыток: {!r}",
+                                    method.__qualname__,
+                                    attempt,
+                                    e,
+                                )
+                                raise
+                            DB_TX_RETRIES.labels(method.__qualname__, sqlstate).inc()
+                            logger.debug(
+                                "Повтор транзакции {} ({}), попытка {}",
+                                method.__qualname__,
+                                sqlstate,
+                                attempt + 1,
+                            )
+                        finally:
+                            await session.close()
 
-                        return result
-                    except Exception as e:
-                        await session.rollback()
-                        logger.error(f"Ошибка при выполнении транзакции: {e=!r}")
-                        raise
-                    finally:
-                        await session.close()
+                    await asyncio.sleep(policy.delay(attempt))
+                    attempt += 1
 
             return wrapper
 
@@ -116,7 +231,16 @@ class DatabaseSessionManager:
 
 
 # Инициализация менеджера сессий базы данных
-session_manager = DatabaseSessionManager(async_session_maker)
+session_manager = DatabaseSessionManager(
+    async_session_maker,
+    replica_session_makers,
+    APP_CONFIG.db.replica_balancing,
+    RetryPolicy(
+        APP_CONFIG.db.retry_attempts,
+        APP_CONFIG.db.retry_base_delay,
+        APP_CONFIG.db.retry_max_delay,
+    ),
+)
 
 # Зависимости FastAPI для использования сессий
 
@@ -0,0 +1,23 @@
+import asyncio
+
+from loguru import logger
+
+from app.api.tariff.warmup import warm_up_tariff_cache
+from app.redis.dependencies import redis_cli
+
+
+async def main():
+    await redis_cli.setup()
+    try:
+        await warm_up_tariff_cache(redis_cli)
+    finally:
+        await redis_cli.close()
+
+
+# прогрев кэша тарифов вручную, например после FLUSHALL:
+# python -m app.main_cache_warmup
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Cache warm-up stopped.")
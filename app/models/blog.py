@@ -1,13 +1,17 @@
 import typing
 
-from sqlalchemy import ForeignKey, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Computed, ForeignKey, Index, text, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, Mapped, mapped_column, relationship
 
 from app.dao.database import Base, str_uniq
 
 if typing.TYPE_CHECKING:
     from app.models import Tag, User
 
+# конфигурация полнотекстового поиска: и в search_vector, и в запросах
+SEARCH_CONFIG = "russian"
+
 
 class Blog(Base):
     # Заголовок статьи
@@ -27,8 +31,40 @@ class Blog(Base):
     # Статус статьи
     status: Mapped[str] = mapped_column(default="published", server_default="published")
 
+    # Названия тегов через пробел для search_vector (генерируемая колонка
+    # не может читать другие таблицы), заполняет BlogTagDAO.add_blog_tags
+    tag_names: Mapped[str] = mapped_column(Text, default="", server_default="")
+
+    # Взвешенный вектор для поиска: заголовок (A), теги и описание (B), текст (C).
+    # deferred - не загружается вместе с блогом
+    search_vector: Mapped[str] = deferred(
+        mapped_column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(tag_names, '')), 'B') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(short_description, '')), 'B') || "
+                f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')",
+                persisted=True,
+            ),
+        ),
+    )
+
     # Связь Many-to-Many с тегами
     tags: Mapped[list["Tag"]] = relationship(
         secondary="blog_tags",
         back_populates="blogs",  # Указываем промежуточную таблицу
     )
+
+    # индексы создаются миграцией a7c4e2f91b3d (CONCURRENTLY)
+    __table_args__ = (
+        # список опубликованных блогов автора по id
+        Index(
+            "ix_blogs_published_author_id",
+            "author",
+            "id",
+            postgresql_where=text("status = 'published'"),
+        ),
+        Index("ix_blogs_author_status", "author", "status"),
+        Index("ix_blogs_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.dao.database import Base
@@ -18,5 +18,8 @@ class BlogTag(Base):
         nullable=False,
     )
 
-    # Уникальное ограничение для пары blog_id и tag_id
-    __table_args__ = (UniqueConstraint("blog_id", "tag_id", name="uq_blog_tag"),)
+    # Уникальное ограничение для пары blog_id и tag_id, оно же индекс по blog_id
+    __table_args__ = (
+        UniqueConstraint("blog_id", "tag_id", name="uq_blog_tag"),
+        Index("ix_blog_tags_tag_id", "tag_id"),
+    )
@@ -1,6 +1,6 @@
 import typing
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.dao.database import Base
@@ -18,3 +18,13 @@ class Tag(Base):
         secondary="blog_tags",
         back_populates="tags",  # Указываем промежуточную таблицу
     )
+
+    # триграммы pg_trgm для поиска name ILIKE '%x%'
+    __table_args__ = (
+        Index(
+            "ix_tags_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
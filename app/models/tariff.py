@@ -10,11 +10,12 @@ if TYPE_CHECKING:
 
 
 class Tariff(Base):
-    category_type: Mapped[str] = mapped_column(String(32))
+    category_type: Mapped[str] = mapped_column(String(32), index=True)
     rate: Mapped[float] = mapped_column(Float)
     date_accession_id: Mapped[int] = mapped_column(
         ForeignKey("date_accessions.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     date_accession: Mapped["DateAccession"] = relationship(
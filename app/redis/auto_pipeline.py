@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+
+import redis.asyncio as aioredis
+
+
+class AutoPipeline:
+    """
+    Автоматический пайплайн для одиночных команд.
+
+    Команды, пришедшие в пределах окна (по умолчанию - одна итерация event loop),
+    уходят в Redis одним пайплайном без MULTI/EXEC, а каждый вызывающий получает
+    свой результат (или свою ошибку) через future.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        window: float = 0.0,
+        max_batch: int = 1000,
+    ) -> None:
+        self._redis = redis
+        self._window = window
+        self._max_batch = max_batch
+        self._queue: list[tuple[tuple, dict, asyncio.Future]] = []
+        self._scheduled = False
+        # ссылки на задачи отправки, чтобы их не собрал GC
+        self._tasks: set[asyncio.Task] = set()
+
+    def execute_command(self, *args: Any, **options: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((args, options, future))
+
+        if len(self._queue) >= self._max_batch:
+            self._flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            if self._window:
+                loop.call_later(self._window, self._flush)
+            else:
+                loop.call_soon(self._flush)
+
+        return future
+
+    def _flush(self) -> None:
+        self._scheduled = False
+        if not self._queue:
+            return
+
+        batch, self._queue = self._queue, []
+        task = asyncio.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[tuple[tuple, dict, asyncio.Future]]) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for args, options, _ in batch:
+                    pipe.execute_command(*args, **options)
+                results = await pipe.execute(raise_on_error=False)
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                future.cancel()
+            raise
+        except Exception as ex:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(ex)
+            return
+
+        for (*_, future), result in zip(batch, results):
+            if future.done():  # вызывающий успел отменить ожидание
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -2,6 +2,7 @@ from fastapi import Depends
 
 from app.api.tariff.redis_client import RedisClientTariff
 from app.core.settings import APP_CONFIG
+from app.redis.redis_client import RedisClient
 
 
 class RedisClientTariffManager:
@@ -25,6 +26,17 @@ redis_manager = RedisClientTariffManager(redis_cli)
 RedisClientTariffDep = Depends(redis_manager.get_client)
 
 
+async def get_redis_client() -> RedisClient:
+    """
+    Зависимость для FastAPI: общий клиент Redis без методов тарифов
+    (тот же экземпляр и пул соединений, что у RedisClientTariffDep).
+    """
+    return redis_cli
+
+
+RedisClientDep = Depends(get_redis_client)
+
+
 # если хотим каждый раз получать новый коннект к Redis (а не держать постоянный)! :todo: +убрать из lifespan redis_cli.setup() / redis_cli.close()
 # async def get_redis_client() -> AsyncGenerator[RedisClientTariff, None]:
 #     await redis_cli.setup()
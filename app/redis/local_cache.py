@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class LocalCache:
+    """
+    Локальный (in-process) LRU-кэш с ограничением по размеру и TTL.
+
+    Хранит сырые байты, а не объекты: каждый читатель десериализует свою копию
+    и может менять её, не портя кэш.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, bytes]] = OrderedDict()
+        # растёт при каждой инвалидации: значение, прочитанное из Redis до неё,
+        # не должно попасть в локальный кэш после неё
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: bytes, version: int | None = None) -> None:
+        if version is not None and version != self.version:
+            return
+
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.version += 1
+        self._data.pop(key, None)
+
+    def invalidate_key(self, redis_key: str) -> None:
+        # все поля одного хэша Redis
+        self.version += 1
+        for key in [k for k in self._data if k[0] == redis_key]:  # type: ignore
+            del self._data[key]
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        # ключи локального кэша - пары (ключ Redis, поле хэша)
+        self.version += 1
+        for key in [k for k in self._data if k[0].startswith(prefix)]:  # type: ignore
+            del self._data[key]
+
+    def clear(self) -> None:
+        self.version += 1
+        self._data.clear()
@@ -0,0 +1,76 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Отдаются на /metrics вместе с метриками prometheus-fastapi-instrumentator
+
+REDIS_OPERATIONS = Counter(
+    "redis_operations_total",
+    "Операции RedisClient по пространству ключей и результату (ok/error)",
+    ["namespace", "operation", "result"],
+)
+REDIS_OPERATION_DURATION = Histogram(
+    "redis_operation_duration_seconds",
+    "Длительность операций RedisClient, включая round trip до Redis",
+    ["namespace", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+REDIS_VALUE_SIZE = Histogram(
+    "redis_value_size_bytes",
+    "Размер записываемых и читаемых значений кэша",
+    ["namespace", "operation"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Чтения кэша по уровню (local/redis) и результату (hit/miss)",
+    ["tier", "namespace", "result"],
+)
+
+CACHE_WARMUP_DURATION = Gauge(
+    "cache_warmup_duration_seconds",
+    "Длительность последнего прогрева кэша",
+    ["namespace"],
+)
+CACHE_WARMUP_KEYS = Gauge(
+    "cache_warmup_keys",
+    "Число полей, загруженных последним прогревом кэша",
+    ["namespace"],
+)
+CACHE_WARMUP_LAST_SUCCESS = Gauge(
+    "cache_warmup_last_success_timestamp_seconds",
+    "Время окончания последнего успешного прогрева кэша",
+    ["namespace"],
+)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Проверки rate limit по ручке и результату (allowed/limited)",
+    ["route", "result"],
+)
+
+
+@contextmanager
+def observe_operation(namespace: str, operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_OPERATIONS.labels(namespace, operation, "error").inc()
+        raise
+    else:
+        REDIS_OPERATIONS.labels(namespace, operation, "ok").inc()
+    finally:
+        REDIS_OPERATION_DURATION.labels(namespace, operation).observe(
+            time.perf_counter() - start,
+        )
+
+
+def record_lookup(tier: str, namespace: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(tier, namespace, "hit" if hit else "miss").inc()
+
+
+def record_value_size(namespace: str, operation: str, size: int) -> None:
+    REDIS_VALUE_SIZE.labels(namespace, operation).observe(size)
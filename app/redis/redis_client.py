@@ -1,10 +1,21 @@
+import asyncio
+import uuid
+import zlib
 from enum import Enum, unique
+from typing import Any
 
 import orjson
 import redis.asyncio as aioredis
 from loguru import logger
+from redis.asyncio.client import Pipeline
+from redis.asyncio.lock import Lock
+from redis.exceptions import NoScriptError
 
 from app.core.settings import RedisConfig
+from app.redis.auto_pipeline import AutoPipeline
+from app.redis.local_cache import LocalCache
+from app.redis.metrics import observe_operation, record_lookup, record_value_size
+from app.redis.scripts import GET_OR_LOCK, LuaScript, SCRIPTS, TOKEN_BUCKET
 
 
 class ExpireTime(Enum):
@@ -20,14 +31,52 @@ class ExpireTime(Enum):
 class RedisKeys(str, Enum):
     TARIFF = "tariff-data"
     EXAMPLE = "example-data"
+    COUNT = "count-data"
+
+
+# первый байт сжатого значения: JSON с него начинаться не может, поэтому
+# старые несжатые записи читаются как раньше
+COMPRESSED_MARKER = b"\x01"
+
+# команды для "размера" ключа по его типу
+LENGTH_COMMANDS = {
+    "hash": "HLEN",
+    "list": "LLEN",
+    "set": "SCARD",
+    "zset": "ZCARD",
+    "string": "STRLEN",
+    "stream": "XLEN",
+}
+
+# верхние границы корзин TTL в секундах
+TTL_BUCKETS = (
+    ("<1m", 60),
+    ("<1h", 3600),
+    ("<1d", 86400),
+    ("<1w", 604800),
+)
 
 
 class RedisClient:
     def __init__(self, config: RedisConfig) -> None:
         self._config = config
         self._redis_pool: aioredis.Redis | None = None
+        self._auto_pipeline: AutoPipeline | None = None
         self._next_retry_connect: float | None = None
 
+        # локальный уровень кэша, синхронизируется между воркерами через pub/sub
+        self._local: LocalCache | None = None
+        if config.local_cache_enabled:
+            self._local = LocalCache(
+                max_size=config.local_cache_max_size,
+                ttl=config.local_cache_ttl,
+            )
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_task: asyncio.Task | None = None
+
+        self._redis_hits = 0
+        self._redis_misses = 0
+
     @property
     def connection(self) -> aioredis.Redis:
         if not self._redis_pool:
@@ -36,21 +85,36 @@ class RedisClient:
         return self._redis_pool  # type: ignore
 
     def connect(self) -> None:
-        redis_pool = aioredis.ConnectionPool.from_url(
+        # Blocking-пул: при исчерпании max_connections запрос ждёт освободившееся
+        # соединение (pool_timeout), а не падает с ConnectionError
+        redis_pool = aioredis.BlockingConnectionPool.from_url(
             url=self._config.host,
             encoding="utf8",
-        )
-
-        self._redis_pool = aioredis.Redis(
-            connection_pool=redis_pool,
+            max_connections=self._config.max_connections,
+            timeout=self._config.pool_timeout,
             socket_keepalive=True,
-            single_connection_client=True,
-            socket_timeout=60,
+            socket_timeout=self._config.socket_timeout,
+            socket_connect_timeout=self._config.socket_connect_timeout,
+            health_check_interval=self._config.health_check_interval,
         )
 
+        # from_pool: клиент владеет пулом и закрывает его вместе с собой
+        self._redis_pool = aioredis.Redis.from_pool(redis_pool)
+
+        if self._config.auto_pipeline:
+            self._auto_pipeline = AutoPipeline(
+                self._redis_pool,
+                window=self._config.auto_pipeline_window,
+                max_batch=self._config.auto_pipeline_max_batch,
+            )
+
     async def close(self) -> None:
         logger.info("REDIS: Closing...")
-        await self.connection.close()
+        logger.info("REDIS: cache stats {}", self.cache_stats())
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        await self.connection.aclose()
 
     async def health_check(self) -> bool:
         conn = self.connection
@@ -67,35 +131,274 @@ class RedisClient:
             logger.error(f"REDIS: Connection error {self._config.host}")
             raise aioredis.ConnectionError
 
+        for script in SCRIPTS:
+            await self.connection.script_load(script.source)
+        logger.debug(f"REDIS: loaded {len(SCRIPTS)} lua scripts")
+
+        if self._local is not None and self._invalidation_task is None:
+            self._invalidation_task = asyncio.create_task(
+                self._listen_invalidations(),
+            )
+
     def reconnect(self) -> None:
         logger.info("REDIS: Reconnecting...")
         self.connect()
 
+    @staticmethod
+    def _key_name(key: str) -> str:
+        # RedisKeys - str-enum, но хэшируется по имени, а не по значению
+        return key.value if isinstance(key, Enum) else key
+
+    @classmethod
+    def _namespace(cls, key: str) -> str:
+        # метка для метрик: "tariff-data:1:lock" -> "tariff-data"
+        return cls._key_name(key).split(":", 1)[0]
+
+    @classmethod
+    def _lock_key(cls, key: str, field: str) -> str:
+        return f"{cls._key_name(key)}:{field}:lock"
+
+    def _invalidation_message(
+        self,
+        key: str,
+        field: str | None,
+        whole_key: bool = False,
+    ) -> bytes:
+        # field=None - все ключи по префиксу key, whole_key - только хэш key
+        # (воркер без поддержки whole_key сбросит по префиксу, лишнее - не страшно)
+        message: dict[str, Any] = {
+            "key": self._key_name(key),
+            "field": field,
+            "origin": self._instance_id,
+        }
+        if whole_key:
+            message["whole_key"] = True
+        return orjson.dumps(message)
+
+    def _apply_invalidation(self, data: bytes) -> None:
+        if self._local is None:
+            return
+
+        message = orjson.loads(data)
+        if message["origin"] == self._instance_id:
+            # свой локальный кэш уже сброшен при записи
+            return
+
+        if message.get("whole_key"):
+            self._local.invalidate_key(message["key"])
+        elif message["field"] is None:
+            self._local.invalidate_prefix(message["key"])
+        else:
+            self._local.invalidate((message["key"], message["field"]))
+
+    async def _listen_invalidations(self) -> None:
+        channel = self._config.invalidation_channel
+        while True:
+            try:
+                async with self.connection.pubsub() as pubsub:
+                    await pubsub.subscribe(channel)
+                    # сообщения, пропущенные до (пере)подписки, не восстановить
+                    self._local.clear()  # type: ignore
+                    logger.debug(f"REDIS: subscribed to {channel!r}")
+
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=1.0,
+                        )
+                        if message is not None:
+                            self._apply_invalidation(message["data"])
+            except aioredis.RedisError as ex:
+                logger.error(f"REDIS: invalidation listener failed: {ex}")
+                await asyncio.sleep(1)
+
+    @staticmethod
+    def _hit_ratio(hits: int, misses: int) -> float:
+        total = hits + misses
+        return hits / total if total else 0.0
+
+    def cache_stats(self) -> dict[str, dict[str, float]]:
+        """Попадания/промахи отдельно по локальному уровню и по Redis."""
+        stats = {
+            "redis": {
+                "hits": self._redis_hits,
+                "misses": self._redis_misses,
+                "hit_ratio": self._hit_ratio(self._redis_hits, self._redis_misses),
+            },
+        }
+        if self._local is not None:
+            stats["local"] = {
+                "hits": self._local.hits,
+                "misses": self._local.misses,
+                "hit_ratio": self._hit_ratio(self._local.hits, self._local.misses),
+                "size": len(self._local),
+            }
+        return stats
+
+    def _dumps(self, value: dict) -> bytes:
+        raw = orjson.dumps(value)
+        threshold = self._config.compression_threshold
+        if threshold and len(raw) >= threshold:
+            return COMPRESSED_MARKER + zlib.compress(
+                raw,
+                self._config.compression_level,
+            )
+        return raw
+
+    @staticmethod
+    def _decompress(value: bytes) -> bytes:
+        if value[:1] == COMPRESSED_MARKER:
+            return zlib.decompress(value[1:])
+        return value
+
+    async def execute(self, *args: Any) -> Any:
+        """
+        Одиночная команда. В режиме auto_pipeline конкурентные вызовы
+        склеиваются в один пайплайн, иначе команда уходит сразу.
+        """
+        connection = self.connection
+        if self._auto_pipeline is not None:
+            return await self._auto_pipeline.execute_command(*args)
+        return await connection.execute_command(*args)
+
+    async def run_script(
+        self,
+        script: LuaScript,
+        keys: list[str],
+        args: list[Any],
+    ) -> Any:
+        """EVALSHA предзагруженного скрипта; после SCRIPT FLUSH загружает заново."""
+        try:
+            return await self.execute("EVALSHA", script.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            logger.warning(f"REDIS: script {script.name!r} not loaded, reloading")
+            await self.connection.script_load(script.source)
+            return await self.execute("EVALSHA", script.sha, len(keys), *keys, *args)
+
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        """
+        Пайплайн: команды копятся на клиенте и уходят в Redis одним запросом
+        на execute(). При transaction=True оборачиваются в MULTI/EXEC.
+
+        async with redis.pipeline() as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl)
+            await pipe.execute()
+        """
+        return self.connection.pipeline(transaction=transaction)
+
+    def lock(self, name: str, timeout: float) -> Lock:
+        """
+        Неблокирующий распределённый лок (SET NX + снятие по токену).
+
+        lock = redis.lock("some-job:lock", timeout=300)
+        if await lock.acquire():
+            ...
+        """
+        return self.connection.lock(name, timeout=timeout, blocking=False)
+
     async def set_cache(
         self,
         key: str,
         field: str,
         value: dict,
         expire: int | None = None,
+        release_lock: bool = False,
     ) -> None:
         try:
-            value_bytes = orjson.dumps(value)
-            value_str = value_bytes.decode("utf-8")
+            value_bytes = self._dumps(value)
 
-            await self.connection.hset(key, field, value_str)  # type: ignore
-            logger.info(
-                f"Set field {field!r} in key {key!r} value {value!r}, expire time {expire}",
-            )
+            namespace = self._namespace(key)
+            record_value_size(namespace, "set", len(value_bytes))
+
+            # hset + expire + инвалидация локальных кэшей за один round trip
+            with observe_operation(namespace, "set"):
+                async with self.pipeline() as pipe:
+                    pipe.hset(key, field, value_bytes)  # type: ignore
+                    if expire is not None:
+                        pipe.expire(key, expire)
+                    if release_lock:
+                        # значение загружено - снимаем лок, взятый в get_or_lock
+                        pipe.delete(self._lock_key(key, field))
+                    if self._local is not None:
+                        pipe.publish(
+                            self._config.invalidation_channel,
+                            self._invalidation_message(key, field),
+                        )
+                    await pipe.execute()
 
-            if expire is not None:
-                await self.connection.expire(key, expire)
+            if self._local is not None:
+                self._local.invalidate((self._key_name(key), field))
+
+            # значение не логируем: это весь кэшируемый объект
+            logger.debug(
+                "Set field {!r} in key {!r}, expire time {}",
+                field,
+                key,
+                expire,
+            )
         except aioredis.RedisError as ex:
             logger.error(f"Failed to set field {field!r} in hash {key!r}: {ex}")
 
+    async def set_many_cache(
+        self,
+        key: str,
+        values: dict[str, dict],
+        expire: int | None = None,
+    ) -> int:
+        """Пишет пачку полей хэша одним пайплайном. Возвращает число полей."""
+        try:
+            mapping = {field: self._dumps(value) for field, value in values.items()}
+            namespace = self._namespace(key)
+            for value_bytes in mapping.values():
+                record_value_size(namespace, "set_many", len(value_bytes))
+
+            with observe_operation(namespace, "set_many"):
+                async with self.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, mapping=mapping)  # type: ignore
+                    if expire is not None:
+                        pipe.expire(key, expire)
+                    await pipe.execute()
+
+            logger.debug(
+                "Set {} fields in key {!r}, expire {}",
+                len(mapping),
+                key,
+                expire,
+            )
+            return len(mapping)
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to set {len(values)} fields in hash {key!r}: {ex}")
+            return 0
+
+    def _record_redis_lookup(self, namespace: str, value: bytes | None) -> None:
+        if value:
+            self._redis_hits += 1
+            record_value_size(namespace, "get", len(value))
+        else:
+            self._redis_misses += 1
+        record_lookup("redis", namespace, bool(value))
+
     async def get_cache(self, key: str, field: str) -> dict | None:
+        namespace = self._namespace(key)
+        local_key = (self._key_name(key), field)
+        version = None
+        if self._local is not None:
+            cached = self._local.get(local_key)
+            record_lookup("local", namespace, cached is not None)
+            if cached is not None:
+                return orjson.loads(cached)
+            version = self._local.version
+
         try:
-            value = await self.connection.hget(key, field)  # type: ignore
+            with observe_operation(namespace, "get"):
+                value = await self.execute("HGET", key, field)
+            self._record_redis_lookup(namespace, value)
             if value:
+                # в локальном кэше - уже распакованный JSON
+                value = self._decompress(value)
+                if self._local is not None:
+                    self._local.set(local_key, value, version)
                 return orjson.loads(value)
             return None
         except aioredis.RedisError as ex:
@@ -104,22 +407,308 @@ class RedisClient:
 
     async def del_cache(self, key: str, field: str) -> None:
         try:
-            result = await self.connection.hdel(key, field)  # type: ignore
+            with observe_operation(self._namespace(key), "delete"):
+                async with self.pipeline() as pipe:
+                    pipe.hdel(key, field)  # type: ignore
+                    if self._local is not None:
+                        pipe.publish(
+                            self._config.invalidation_channel,
+                            self._invalidation_message(key, field),
+                        )
+                    result, *_ = await pipe.execute()
+
+            if self._local is not None:
+                self._local.invalidate((self._key_name(key), field))
+
             if result:
-                logger.info(f"Deleted field {field!r} from key {key!r}")
+                logger.debug("Deleted field {!r} from key {!r}", field, key)
             else:
-                logger.info(f"Field {field!r} not found in key {key!r}")
+                logger.debug("Field {!r} not found in key {!r}", field, key)
         except aioredis.RedisError as ex:
             logger.error(f"Failed to delete field {field!r} from key {key!r}: {ex}")
 
+    async def del_all_cache(self, key: str) -> None:
+        """Удаляет хэш key целиком: все его поля."""
+        try:
+            with observe_operation(self._namespace(key), "delete_all"):
+                async with self.pipeline() as pipe:
+                    pipe.unlink(key)
+                    if self._local is not None:
+                        pipe.publish(
+                            self._config.invalidation_channel,
+                            self._invalidation_message(key, None, whole_key=True),
+                        )
+                    await pipe.execute()
+
+            if self._local is not None:
+                self._local.invalidate_key(self._key_name(key))
+
+            logger.debug("Deleted key {!r}", key)
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to delete key {key!r}: {ex}")
+
     async def get_all_cache(self, key: str) -> dict | None:
         try:
-            all_data = await self.connection.hgetall(key)  # type: ignore
+            with observe_operation(self._namespace(key), "get_all"):
+                all_data = await self.execute("HGETALL", key)
             if not all_data:
                 return None
 
             # Декодируем ключи и значения
-            return {k.decode("utf-8"): orjson.loads(v) for k, v in all_data.items()}
+            return {
+                k.decode("utf-8"): orjson.loads(self._decompress(v))
+                for k, v in all_data.items()
+            }
         except aioredis.RedisError as ex:
             logger.error(f"Failed to get all fields from hash {key!r}: {ex}")
             return None
+
+    async def merge_cache(
+        self,
+        key: str,
+        field: str,
+        patch: dict,
+        expire: int | None = None,
+    ) -> bool:
+        """
+        Атомарно дописывает patch в JSON-значение поля (если оно есть в кэше).
+        Возвращает True, если значение было в кэше и обновлено.
+        Слияние на клиенте под WATCH/MULTI: cjson в lua превращает [] в {}
+        и округляет float до 14 знаков, то есть портит значение. Цена -
+        три round trip'а (WATCH, HGET, MULTI/EXEC) вместо одного EVALSHA
+        и повтор, если поле изменили между ними.
+        """
+
+        async def merge(pipe: Pipeline) -> bool:
+            # ключ под WATCH: если его изменят до EXEC, transaction() повторит
+            raw = await pipe.hget(key, field)  # type: ignore
+            if not raw:
+                return False
+
+            value = orjson.loads(self._decompress(raw))
+            value.update(patch)
+
+            pipe.multi()
+            pipe.hset(key, field, self._dumps(value))  # type: ignore
+            if expire:
+                pipe.expire(key, expire)
+            if self._local is not None:
+                pipe.publish(
+                    self._config.invalidation_channel,
+                    self._invalidation_message(key, field),
+                )
+            return True
+
+        try:
+            with observe_operation(self._namespace(key), "merge"):
+                updated = await self.connection.transaction(
+                    merge,
+                    key,
+                    value_from_callable=True,
+                )
+            if self._local is not None:
+                self._local.invalidate((self._key_name(key), field))
+
+            logger.debug(
+                "Merged field {!r} in key {!r}, updated: {}",
+                field,
+                key,
+                updated,
+            )
+            return bool(updated)
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to merge field {field!r} in hash {key!r}: {ex}")
+            return False
+
+    async def get_or_lock(
+        self,
+        key: str,
+        field: str,
+        lock_ttl: int = 5000,
+    ) -> tuple[dict | None, bool]:
+        """
+        Значение поля или, при промахе, попытка взять лок на его загрузку
+        (TTL в мс). Возвращает (значение, лок взят этим вызовом).
+        Лок снимается через set_cache(..., release_lock=True) или release_lock.
+        """
+        namespace = self._namespace(key)
+        local_key = (self._key_name(key), field)
+        version = None
+        if self._local is not None:
+            cached = self._local.get(local_key)
+            record_lookup("local", namespace, cached is not None)
+            if cached is not None:
+                return orjson.loads(cached), False
+            version = self._local.version
+
+        try:
+            with observe_operation(namespace, "get_or_lock"):
+                value, locked = await self.run_script(
+                    GET_OR_LOCK,
+                    keys=[key, self._lock_key(key, field)],
+                    args=[field, lock_ttl],
+                )
+            self._record_redis_lookup(namespace, value)
+            if value:
+                value = self._decompress(value)
+                if self._local is not None:
+                    self._local.set(local_key, value, version)
+                return orjson.loads(value), False
+            return None, bool(locked)
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to get or lock field {field!r} in {key!r}: {ex}")
+            # без Redis пусть каждый загружает сам
+            return None, True
+
+    async def release_lock(self, key: str, field: str) -> None:
+        try:
+            with observe_operation(self._namespace(key), "release_lock"):
+                await self.execute("DEL", self._lock_key(key, field))
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to release lock for {field!r} in {key!r}: {ex}")
+
+    async def invalidate_prefix(self, prefix: str, scan_count: int = 1000) -> int:
+        """
+        Удаляет все ключи, начинающиеся с prefix. SCAN идёт с клиента, по
+        scan_count ключей за шаг: между шагами Redis обслуживает другие
+        команды (SCAN внутри lua-скрипта блокировал бы его, как KEYS).
+        UNLINK найденных ключей уходит пайплайном вместе со следующим SCAN.
+        Не атомарно: ключ, записанный во время обхода, может остаться.
+        """
+        prefix = self._key_name(prefix)
+        # экранируем спецсимволы glob-шаблона SCAN MATCH
+        pattern = "".join(f"\\{c}" if c in "*?[]\\" else c for c in prefix) + "*"
+        deleted = 0
+        try:
+            with observe_operation(self._namespace(prefix), "invalidate_prefix"):
+                async with self.pipeline(transaction=False) as pipe:
+                    cursor, keys = await self.connection.scan(
+                        0,
+                        match=pattern,
+                        count=scan_count,
+                    )
+                    while True:
+                        if keys:
+                            pipe.unlink(*keys)
+                        if not cursor:
+                            break
+                        pipe.scan(cursor, match=pattern, count=scan_count)
+                        *unlinked, (cursor, keys) = await pipe.execute()
+                        deleted += sum(unlinked)
+
+                    if self._local is not None:
+                        pipe.publish(
+                            self._config.invalidation_channel,
+                            self._invalidation_message(prefix, None),
+                        )
+                    results = await pipe.execute()
+                    if keys:
+                        deleted += results[0]
+
+            if self._local is not None:
+                self._local.invalidate_prefix(prefix)
+
+            logger.debug("Invalidated {} keys by prefix {!r}", deleted, prefix)
+            return deleted
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to invalidate keys by prefix {prefix!r}: {ex}")
+            return deleted
+
+    async def rate_limit(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+        cost: int = 1,
+    ) -> tuple[bool, int, int]:
+        """
+        Списывает cost токенов из ведра key (token bucket).
+        Возвращает (пропустить ли запрос, остаток токенов, retry after в мс).
+        При недоступности Redis запрос пропускается.
+        """
+        try:
+            with observe_operation(self._namespace(key), "rate_limit"):
+                allowed, remaining, retry_after = await self.run_script(
+                    TOKEN_BUCKET,
+                    keys=[key],
+                    args=[rate, burst, cost],
+                )
+            return bool(allowed), remaining, retry_after
+        except aioredis.RedisError as ex:
+            logger.error(f"Failed to check rate limit {key!r}: {ex}")
+            return True, burst, 0
+
+    @staticmethod
+    def _ttl_bucket(ttl: int) -> str:
+        if ttl < 0:
+            return "no_expire"
+        for name, upper in TTL_BUCKETS:
+            if ttl < upper:
+                return name
+        return ">=1w"
+
+    async def inspect(self, sample_size: int = 1000, top: int = 20) -> dict[str, Any]:
+        """
+        Снимок состояния кэша: размер, память, распределение TTL и самые тяжёлые
+        ключи. Ключи берутся выборкой через SCAN, а не KEYS - Redis не блокируется.
+        """
+        conn = self.connection
+        memory = await conn.info("memory")
+        keys_total = await conn.dbsize()
+
+        keys: list[bytes] = []
+        async for key in conn.scan_iter(count=500):
+            keys.append(key)
+            if len(keys) >= sample_size:
+                break
+
+        async with self.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.type(key)
+                pipe.ttl(key)
+                pipe.memory_usage(key)
+            raw = await pipe.execute()
+        types = [t.decode("utf-8") for t in raw[0::3]]
+        ttls, sizes = raw[1::3], raw[2::3]
+
+        async with self.pipeline(transaction=False) as pipe:
+            for key, key_type in zip(keys, types):
+                pipe.execute_command(LENGTH_COMMANDS.get(key_type, "EXISTS"), key)
+            lengths = await pipe.execute()
+
+        ttl_distribution: dict[str, int] = {}
+        namespaces: dict[str, dict[str, int]] = {}
+        entries = []
+        for key, key_type, ttl, size, length in zip(keys, types, ttls, sizes, lengths):
+            name = key.decode("utf-8")
+            bucket = self._ttl_bucket(ttl)
+            ttl_distribution[bucket] = ttl_distribution.get(bucket, 0) + 1
+
+            namespace = namespaces.setdefault(
+                self._namespace(name),
+                {"keys": 0, "memory_bytes": 0},
+            )
+            namespace["keys"] += 1
+            namespace["memory_bytes"] += size or 0
+
+            entries.append(
+                {
+                    "key": name,
+                    "type": key_type,
+                    "ttl": ttl,
+                    "length": length,
+                    "memory_bytes": size or 0,
+                },
+            )
+
+        return {
+            "keys_total": keys_total,
+            "used_memory_bytes": memory["used_memory"],
+            "used_memory_peak_bytes": memory["used_memory_peak"],
+            "maxmemory_bytes": memory.get("maxmemory", 0),
+            "sampled_keys": len(keys),
+            "ttl_distribution": ttl_distribution,
+            "namespaces": namespaces,
+            "top_keys": sorted(entries, key=lambda e: -e["memory_bytes"])[:top],
+            "tiers": self.cache_stats(),
+        }
@@ -0,0 +1,75 @@
+"""
+Lua-скрипты для атомарных операций с кэшем на стороне Redis.
+
+Загружаются в RedisClient.setup (SCRIPT LOAD) и вызываются через EVALSHA:
+каждая операция - один round trip без гонок между писателями. Слияние JSON
+(RedisClient.merge_cache) не здесь: cjson портит пустые массивы и float.
+Удаление по префиксу (RedisClient.invalidate_prefix) тоже: SCAN по всему
+keyspace внутри скрипта блокирует Redis до конца обхода.
+"""
+
+import hashlib
+
+
+class LuaScript:
+    def __init__(self, name: str, source: str) -> None:
+        self.name = name
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+# Чтение поля или захват лока на его загрузку (защита от cache stampede).
+# KEYS[1] - хэш, KEYS[2] - ключ лока, ARGV: поле, TTL лока в мс.
+# Возвращает {значение, 0} при попадании, {nil, 1} - лок наш, {nil, 0} - лок занят.
+GET_OR_LOCK = LuaScript(
+    "get_or_lock",
+    """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if raw then
+    return {raw, 0}
+end
+
+if redis.call('SET', KEYS[2], '1', 'NX', 'PX', ARGV[2]) then
+    return {false, 1}
+end
+return {false, 0}
+""",
+)
+
+# Token bucket для rate limiting, время берётся с сервера Redis (TIME),
+# поэтому часы воркеров не важны.
+# KEYS[1] - ведро, ARGV: скорость пополнения (токенов в сек), ёмкость, цена запроса.
+# Возвращает {1 - пропустить / 0 - отказать, остаток токенов, через сколько мс
+# наберётся нужное число токенов}.
+TOKEN_BUCKET = LuaScript(
+    "token_bucket",
+    """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = math.ceil((cost - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+-- полное ведро ничем не отличается от отсутствующего
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {allowed, math.floor(tokens), retry_after}
+""",
+)
+
+SCRIPTS = (GET_OR_LOCK, TOKEN_BUCKET)
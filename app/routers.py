@@ -4,6 +4,7 @@ from fastapi import APIRouter
 
 from app.api.auth.router import router as auth_router
 from app.api.blog.router import router as blog_router
+from app.api.cache.router import router as cache_router
 from app.api.default.router import router as default_router
 from app.api.file.router import router as file_router
 from app.api.tariff.router import router as tariff_router
@@ -17,6 +18,7 @@ routers = (
     blog_router,
     tariff_router,
     file_router,
+    cache_router,
 )
 
 for resource_router in routers:
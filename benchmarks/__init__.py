@@ -0,0 +1,22 @@
+"""
+Бенчмарки и ручные проверки. В образ не попадают (Dockerfile копирует только
+app), большинству нужны поднятые сервисы из docker-compose.
+
+Запуск из корня репозитория:
+    python -m benchmarks.<имя>
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from loguru import logger
+
+
+def run(main: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """
+    Запускает main без логов приложения: DAO, Redis-клиент и сессии логируют
+    каждый вызов, что искажает замеры и засоряет вывод.
+    """
+    logger.remove()
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+"""
+Бенчмарк полнотекстового поиска блогов (BlogDAO.search) на большом объёме.
+
+    python -m benchmarks.blog_search seed [1000000]  # сгенерировать посты
+    python -m benchmarks.blog_search run             # замеры
+    python -m benchmarks.blog_search cleanup         # удалить посты
+
+Посты генерируются в postgres (generate_series) пачками по BATCH_SIZE
+с заголовком "bench-search-<n>" и остаются в БД до cleanup. Теги для поиска
+пишутся сразу в tag_names, связи blog_tags не создаются.
+Замеряется время BlogDAO.search: первая страница и страница PAGES по курсору,
+для сравнения - один запрос content ILIKE без индекса.
+
+Нужен поднятый postgres с миграциями, см. docker-compose.
+"""
+
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select, text
+
+from app.api.blog.dao import BlogDAO
+from app.dao.database import engine
+from app.dao.session_maker import session_manager
+from app.models import Blog
+from benchmarks import run
+
+PREFIX = "bench-search-"
+BATCH_SIZE = 100_000
+PAGE_SIZE = 10
+PAGES = 10
+ROUNDS = 20
+
+WORDS = (
+    "тариф страхование стоимость договор клиент полис выплата риск ставка "
+    "категория груз доставка склад маршрут отчёт аналитика прогноз модель "
+    "сервис платформа интеграция очередь кэш индекс запрос база данные "
+    "python postgres redis kafka rabbitmq fastapi docker kubernetes "
+    "migration index search ranking vector cluster replica latency "
+    "throughput benchmark profile pipeline release deploy monitoring"
+).split()
+
+QUERIES = (
+    "тариф",
+    "kafka",
+    "страхование груз",
+    '"индекс запрос"',
+    "postgres -redis",
+    "latency or throughput",
+)
+
+SEED_SQL = text(
+    """
+    INSERT INTO blogs (title, author, content, short_description, status, tag_names)
+    SELECT
+        :prefix || g,
+        :author,
+        (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+         FROM generate_series(1, 80) WHERE g > 0),
+        (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+         FROM generate_series(1, 12) WHERE g > 0),
+        'published',
+        (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+         FROM generate_series(1, 2) WHERE g > 0)
+    FROM generate_series(:start, :stop) AS g, (SELECT CAST(:words AS text[]) AS w) AS v
+    """,
+)
+
+
+async def seed(total: int) -> None:
+    async with session_manager.create_session() as session:
+        author = await session.scalar(select(func.min(Blog.author)))
+        if author is None:
+            author = await session.scalar(text("SELECT min(id) FROM users"))
+        if author is None:
+            raise SystemExit("Нужен хотя бы один пользователь - автор постов")
+        existing = await session.scalar(
+            select(func.count()).where(Blog.title.startswith(PREFIX)),
+        )
+
+    start = (existing or 0) + 1
+    for batch_start in range(start, total + 1, BATCH_SIZE):
+        batch_stop = min(batch_start + BATCH_SIZE - 1, total)
+        begin = time.perf_counter()
+        async with session_manager.create_session() as session:
+            await session.execute(
+                SEED_SQL,
+                {
+                    "prefix": PREFIX,
+                    "author": author,
+                    "start": batch_start,
+                    "stop": batch_stop,
+                    "words": list(WORDS),
+                },
+            )
+            await session.commit()
+        print(f"{batch_stop:>9} постов, {time.perf_counter() - begin:.1f} с")
+
+    async with session_manager.create_session() as session:
+        connection = await session.connection()
+        await connection.exec_driver_sql("ANALYZE blogs")
+        await session.commit()
+
+
+async def measure(query_text: str, pages: int) -> float:
+    """Медиана времени получения страницы pages (1 - первая), мс."""
+    async with session_manager.create_session() as session:
+        cursor = None
+        for _ in range(pages - 1):
+            _, cursor = await BlogDAO.search(session, query_text, cursor, PAGE_SIZE)
+
+        timings = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            await BlogDAO.search(session, query_text, cursor, PAGE_SIZE)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def compare() -> None:
+    async with session_manager.create_session() as session:
+        total = await session.scalar(
+            select(func.count()).where(Blog.title.startswith(PREFIX)),
+        )
+        print(f"Постов: {total}; медиана из {ROUNDS} запросов, мс")
+        print(f"{'запрос':<26} {'стр. 1':>10} {f'стр. {PAGES}':>10}")
+        for query_text in QUERIES:
+            first = await measure(query_text, 1)
+            deep = await measure(query_text, PAGES)
+            print(f"{query_text:<26} {first:>10.2f} {deep:>10.2f}")
+
+        start = time.perf_counter()
+        await session.execute(
+            select(Blog.id).where(Blog.content.ilike("%kafka%")).limit(PAGE_SIZE),
+        )
+        ilike = (time.perf_counter() - start) * 1000
+        print(f"{'content ILIKE (без индекса)':<26} {ilike:>10.2f}")
+
+
+async def cleanup() -> None:
+    async with session_manager.create_session() as session:
+        result = await session.execute(
+            text("DELETE FROM blogs WHERE title LIKE :prefix"),
+            {"prefix": f"{PREFIX}%"},
+        )
+        await session.commit()
+        print(f"Удалено постов: {result.rowcount}")  # type: ignore[attr-defined]
+
+
+async def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command == "seed":
+        await seed(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+    elif command == "cleanup":
+        await cleanup()
+    else:
+        await compare()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
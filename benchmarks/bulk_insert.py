@@ -0,0 +1,65 @@
+"""
+Бенчмарк массовой вставки тарифов: BaseDAO.add_many (ORM, unit of work)
+против BaseDAO.bulk_insert (Core insert, с RETURNING id и без).
+Каждый прогон в своей транзакции, которая откатывается - данные не остаются.
+
+Запуск (нужен поднятый postgres с миграциями, см. docker-compose):
+    python -m benchmarks.bulk_insert
+"""
+
+import time
+
+from app.api.tariff.dao import TariffDAO
+from app.api.tariff.schemas import CreateTariffSchema
+from app.dao.database import engine
+from app.dao.session_maker import session_manager
+from app.models import DateAccession
+from benchmarks import run
+
+SIZES = (100, 1000, 10000, 50000)
+
+
+async def bench(size: int, method: str) -> float:
+    async with session_manager.create_session() as session:
+        date_accession = DateAccession()
+        session.add(date_accession)
+        await session.flush()
+        tariffs = [
+            CreateTariffSchema(
+                category_type=f"category-{i}",
+                rate=0.01,
+                date_accession_id=date_accession.id,
+            )
+            for i in range(size)
+        ]
+
+        start = time.perf_counter()
+        if method == "add_many":
+            await TariffDAO.add_many(session, tariffs)
+        elif method == "bulk_insert":
+            await TariffDAO.bulk_insert(session, tariffs)
+        else:
+            await TariffDAO.bulk_insert(session, tariffs, returning=["id"])
+        elapsed = time.perf_counter() - start
+
+        await session.rollback()
+    return elapsed
+
+
+async def main() -> None:
+    print("Вставка тарифов, сек")
+    print(f"{'rows':>8} {'add_many':>10} {'bulk':>10} {'bulk+id':>10} {'x':>6}")
+    for size in SIZES:
+        orm = await bench(size, "add_many")
+        bulk = await bench(size, "bulk_insert")
+        bulk_ids = await bench(size, "bulk_insert_returning")
+        print(
+            f"{size:>8} {orm:>10.3f} {bulk:>10.3f} {bulk_ids:>10.3f} "
+            f"{orm / bulk_ids:>6.1f}",
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
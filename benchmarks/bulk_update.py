@@ -0,0 +1,82 @@
+"""
+Бенчмарк массового обновления тарифов: UPDATE на каждую запись (как раньше
+делал BaseDAO.bulk_update) против BaseDAO.bulk_update с UPDATE ... FROM VALUES.
+Каждый прогон в своей транзакции, которая откатывается - данные не остаются.
+
+Запуск (нужен поднятый postgres с миграциями, см. docker-compose):
+    python -m benchmarks.bulk_update
+"""
+
+import time
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.tariff.dao import TariffDAO
+from app.dao.database import engine
+from app.dao.session_maker import session_manager
+from app.models import DateAccession, Tariff
+from benchmarks import run
+
+SIZES = (100, 10_000, 100_000)
+
+
+async def prepare(session: AsyncSession, size: int) -> list[dict]:
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    rows = await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": f"category-{i}",
+                "rate": 0.01,
+                "date_accession_id": date_accession.id,
+            }
+            for i in range(size)
+        ],
+        returning=["id"],
+    )
+    return [{"id": row.id, "rate": 0.02} for row in rows]  # type: ignore[union-attr]
+
+
+async def update_one_by_one(session: AsyncSession, records: list[dict]) -> int:
+    updated = 0
+    for record in records:
+        stmt = update(Tariff).filter_by(id=record["id"]).values(rate=record["rate"])
+        result = await session.execute(stmt)
+        updated += result.rowcount
+    return updated
+
+
+async def bench(size: int, set_based: bool) -> float:
+    async with session_manager.create_session() as session:
+        records = await prepare(session, size)
+
+        start = time.perf_counter()
+        if set_based:
+            updated = await TariffDAO.bulk_update(session, records)
+        else:
+            updated = await update_one_by_one(session, records)
+        elapsed = time.perf_counter() - start
+        assert updated == size, (updated, size)
+
+        await session.rollback()
+    return elapsed
+
+
+async def main() -> None:
+    print("Обновление тарифов, сек")
+    print(f"{'rows':>8} {'per row':>10} {'values':>10} {'x':>6}")
+    for size in SIZES:
+        per_row = await bench(size, set_based=False)
+        set_based = await bench(size, set_based=True)
+        print(
+            f"{size:>8} {per_row:>10.3f} {set_based:>10.3f} {per_row / set_based:>6.1f}",
+        )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,84 @@
+"""
+Проверка работы через PgBouncer в режиме pool_mode=transaction: CLIENTS
+задач выполняют ROUNDS транзакций с разными запросами, так что серверные
+соединения PgBouncer постоянно переходят от одного клиента к другому.
+Запросы выполняются дважды: с DB__PGBOUNCER-режимом (asyncpg_connect_args)
+и с обычными настройками asyncpg. В режиме pgbouncer ошибок подготовленных
+выражений быть не должно, иначе код выхода 1. Обычные настройки для
+сравнения: в transaction-режиме они дают ошибки prepared statement
+"... already exists" / "... does not exist".
+
+Запуск (нужны postgres и pgbouncer, см. docker-compose):
+    python -m benchmarks.check_pgbouncer [localhost:16432]
+"""
+
+import asyncio
+import sys
+from collections import Counter
+
+from sqlalchemy import make_url, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.settings import APP_CONFIG
+from app.dao.database import create_engine
+from benchmarks import run
+
+CLIENTS = 20
+ROUNDS = 50
+
+QUERIES = (
+    text("SELECT CAST(:value AS int) + 1"),
+    text("SELECT CAST(:value AS text) || 'x'"),
+    text("SELECT count(*) FROM generate_series(1, CAST(:value AS int))"),
+    text("SELECT now(), CAST(:value AS int)"),
+)
+
+
+async def run_clients(engine: AsyncEngine) -> Counter:
+    errors: Counter = Counter()
+
+    async def client(number: int) -> None:
+        for i in range(ROUNDS):
+            try:
+                async with engine.begin() as connection:
+                    for query in QUERIES:
+                        await connection.execute(query, {"value": number + i})
+            except DBAPIError as e:
+                errors[type(e.orig).__name__] += 1
+
+    await asyncio.gather(*(client(number) for number in range(CLIENTS)))
+    return errors
+
+
+async def main() -> None:
+    host, _, port = (sys.argv[1] if len(sys.argv) > 1 else "localhost:16432").partition(
+        ":",
+    )
+    url = make_url(str(APP_CONFIG.db.sqlalchemy_db_uri)).set(
+        host=host,
+        port=int(port or 6432),
+    )
+
+    failed = False
+    for name, pgbouncer in (("DB__PGBOUNCER=true", True), ("обычный asyncpg", False)):
+        engine = create_engine(
+            url.render_as_string(hide_password=False),
+            f"check-{int(pgbouncer)}",
+            pgbouncer=pgbouncer,
+        )
+        errors = await run_clients(engine)
+        await engine.dispose()
+
+        total = CLIENTS * ROUNDS
+        details = ", ".join(f"{error}: {count}" for error, count in errors.items())
+        print(f"{name:<20} ошибок {sum(errors.values())} из {total} {details}")
+        if pgbouncer and errors:
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,47 @@
+"""
+Проверка маршрутизации чтения по репликам: открывает несколько сессий
+для чтения (как SessionDep) и одну для записи (как TransactionSessionDep)
+и печатает, на какой сервер попала каждая.
+
+Для проверки достаточно двух локальных postgres с одинаковой схемой
+(реплицировать их друг в друга не обязательно), например:
+    docker run -d -p 15433:5432 -e POSTGRES_USER=newuser \\
+        -e POSTGRES_PASSWORD=dbpass -e POSTGRES_DB=new_smit_db postgres
+    DB__REPLICA_HOSTS='["localhost:15433"]' python -m benchmarks.check_replicas
+    DB__REPLICA_HOSTS='["localhost:15433"]' \\
+        DB__REPLICA_BALANCING=least_connections python -m benchmarks.check_replicas
+"""
+
+from sqlalchemy import text
+
+from app.dao.database import engine, replica_engines
+from app.dao.session_maker import session_manager
+from benchmarks import run
+
+READS = 6
+
+SERVER_QUERY = text(
+    "SELECT inet_server_addr()::text, inet_server_port(), pg_is_in_recovery()",
+)
+
+
+async def server(read_only: bool) -> str:
+    async with session_manager.create_session(read_only=read_only) as session:
+        addr, port, in_recovery = (await session.execute(SERVER_QUERY)).one()
+        role = "standby" if in_recovery else "primary"
+        return f"{addr}:{port} ({role})"
+
+
+async def main() -> None:
+    print(f"Реплик: {len(replica_engines)}, {session_manager.replica_balancing}")
+    print(f"{'запись':<8} {await server(read_only=False)}")
+    for i in range(READS):
+        print(f"{'чтение':<8} {await server(read_only=True)}")
+
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
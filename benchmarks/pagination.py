@@ -0,0 +1,79 @@
+"""
+Бенчмарк пагинации тарифов: OFFSET/LIMIT (BaseDAO.paginate) против keyset
+(BaseDAO.paginate_keyset) на первой и глубокой странице.
+Тарифы для замера вставляются в транзакции, которая откатывается.
+
+Запуск (нужен поднятый postgres с миграциями, см. docker-compose):
+    python -m benchmarks.pagination
+"""
+
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from app.api.tariff.dao import TariffDAO
+from app.dao.cursor import encode_cursor
+from app.dao.database import engine
+from app.dao.session_maker import session_manager
+from app.models import DateAccession
+from benchmarks import run
+
+PAGE_SIZE = 10
+PAGES = (1, 100, 1000, 10_000)
+ROUNDS = 20
+
+
+async def measure(query: Callable[[], Awaitable]) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await query()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    async with session_manager.create_session() as session:
+        date_accession = DateAccession()
+        session.add(date_accession)
+        await session.flush()
+        rows = await TariffDAO.bulk_insert(
+            session,
+            [
+                {
+                    "category_type": f"category-{i}",
+                    "rate": 0.01,
+                    "date_accession_id": date_accession.id,
+                }
+                for i in range(max(PAGES) * PAGE_SIZE)
+            ],
+            returning=["id"],
+        )
+        ids = [row.id for row in rows]  # type: ignore[union-attr]
+
+        print(f"Медиана из {ROUNDS} запросов, мс; страница по {PAGE_SIZE} записей")
+        print(f"{'page':>8} {'offset':>10} {'keyset':>10}")
+        for page in PAGES:
+            cursor = None
+            if page > 1:
+                cursor = encode_cursor("id", False, [ids[(page - 1) * PAGE_SIZE - 1]])
+
+            offset = await measure(
+                lambda: TariffDAO.paginate(session, page=page, page_size=PAGE_SIZE),
+            )
+            keyset = await measure(
+                lambda: TariffDAO.paginate_keyset(
+                    session,
+                    cursor=cursor,
+                    page_size=PAGE_SIZE,
+                ),
+            )
+            print(f"{page:>8} {offset:>10.2f} {keyset:>10.2f}")
+
+        await session.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,101 @@
+"""
+Бенчмарк числа соединений с postgres: PROCESSES пулов SQLAlchemy (как у
+отдельных процессов api и консьюмеров, pool_size + max_overflow каждый)
+выполняют короткие транзакции по TASKS задач на пул. Сравниваются:
+    - напрямую к postgres;
+    - через PgBouncer (pool_mode=transaction, DB__PGBOUNCER-режим).
+Число серверных соединений берётся из pg_stat_activity (отдельное прямое
+соединение, опрос раз в 50 мс, учитывается и оно), плюс транзакций в секунду.
+Пулы создаются в одном процессе: на число соединений это не влияет.
+
+Запуск (нужны postgres и pgbouncer, см. docker-compose; DB__HOST и DB__PORT -
+прямое подключение к postgres, аргумент - адрес pgbouncer):
+    python -m benchmarks.pgbouncer [localhost:16432]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import make_url, text
+
+from app.core.settings import APP_CONFIG
+from app.dao.database import create_engine, engine
+from benchmarks import run
+
+PROCESSES = 8
+TASKS = 20  # одновременных транзакций на пул
+DURATION = 10
+QUERY_MS = 2
+
+ACTIVITY = text(
+    "SELECT count(*) FROM pg_stat_activity "
+    "WHERE datname = current_database() AND backend_type = 'client backend'",
+)
+
+
+async def measure(url: str, pgbouncer: bool) -> tuple[int, float]:
+    engines = [
+        create_engine(url, f"bench-{int(pgbouncer)}-{i}", pgbouncer=pgbouncer)
+        for i in range(PROCESSES)
+    ]
+    done = 0
+    peak = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def task(process: int) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            async with engines[process].begin() as connection:
+                await connection.execute(
+                    text("SELECT pg_sleep(:delay)"),
+                    {"delay": QUERY_MS / 1000},
+                )
+            done += 1
+
+    async def watch() -> None:
+        nonlocal peak
+        async with engine.connect() as connection:
+            while True:
+                peak = max(peak, await connection.scalar(ACTIVITY) or 0)
+                await connection.rollback()
+                await asyncio.sleep(0.05)
+
+    watcher = asyncio.create_task(watch())
+    await asyncio.gather(
+        *(task(process) for process in range(PROCESSES) for _ in range(TASKS)),
+    )
+    watcher.cancel()
+    for bench_engine in engines:
+        await bench_engine.dispose()
+    return peak, done / DURATION
+
+
+async def main() -> None:
+    host, _, port = (sys.argv[1] if len(sys.argv) > 1 else "localhost:16432").partition(
+        ":",
+    )
+    direct = str(APP_CONFIG.db.sqlalchemy_db_uri)
+    bouncer = (
+        make_url(direct)
+        .set(host=host, port=int(port or 6432))
+        .render_as_string(hide_password=False)
+    )
+
+    print(
+        f"{PROCESSES} пулов по {APP_CONFIG.db.pool_size}+{APP_CONFIG.db.max_overflow}, "
+        f"{TASKS} задач на пул, {DURATION} с",
+    )
+    print(f"{'подключение':<12} {'соединений с postgres':>22} {'tx/s':>10}")
+    for name, url, pgbouncer in (
+        ("напрямую", direct, False),
+        ("pgbouncer", bouncer, True),
+    ):
+        peak, tps = await measure(url, pgbouncer)
+        print(f"{name:<12} {peak:>22} {tps:>10.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,99 @@
+"""
+Бенчмарк CPU на строку в списке тарифов: ORM-объекты + model_validate
+(как было в get_all_tariffs) против проекции колонок (fields=) и find_all_as.
+Считается процессорное время (time.process_time), а не время ответа:
+ожидание postgres в него не входит, остаётся работа на стороне приложения.
+Тарифы для замера вставляются в транзакции, которая откатывается.
+
+Запуск (нужен поднятый postgres с миграциями, см. docker-compose):
+    python -m benchmarks.projection
+"""
+
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from app.api.tariff.dao import TariffDAO
+from app.api.tariff.schemas import TariffRespSchema
+from app.dao.database import engine
+from app.dao.session_maker import session_manager
+from app.models import DateAccession
+from benchmarks import run
+
+ROWS = 10_000
+PAGE_SIZE = 100
+ROUNDS = 10
+
+
+async def measure(read: Callable[[], Awaitable[list]]) -> float:
+    """Медиана процессорного времени на строку, мкс."""
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.process_time()
+        rows = await read()
+        timings.append((time.process_time() - start) / len(rows))
+    return statistics.median(timings) * 1_000_000
+
+
+async def main() -> None:
+    async with session_manager.create_session() as session:
+        date_accession = DateAccession()
+        session.add(date_accession)
+        await session.flush()
+        await TariffDAO.bulk_insert(
+            session,
+            [
+                {
+                    "category_type": f"category-{i}",
+                    "rate": 0.01,
+                    "date_accession_id": date_accession.id,
+                }
+                for i in range(ROWS)
+            ],
+        )
+
+        async def orm_all() -> list:
+            # identity map копит объекты между раундами, как в долгой сессии
+            session.expunge_all()
+            records = await TariffDAO.find_all(session, None)
+            return [TariffRespSchema.model_validate(r) for r in records]
+
+        async def projection_all() -> list:
+            records = await TariffDAO.find_all(session, None, fields=TariffRespSchema)
+            return [TariffRespSchema.model_validate(r) for r in records]
+
+        async def orm_page() -> list:
+            session.expunge_all()
+            records = await TariffDAO.paginate(session, page_size=PAGE_SIZE)
+            return [TariffRespSchema.model_validate(r) for r in records]
+
+        async def projection_page() -> list:
+            records = await TariffDAO.paginate(
+                session,
+                page_size=PAGE_SIZE,
+                fields=TariffRespSchema,
+            )
+            return [TariffRespSchema.model_validate(r) for r in records]
+
+        cases = (
+            (f"все ({ROWS}+), ORM", orm_all),
+            (f"все ({ROWS}+), fields=", projection_all),
+            (
+                f"все ({ROWS}+), find_all_as",
+                lambda: TariffDAO.find_all_as(session, TariffRespSchema),
+            ),
+            (f"страница {PAGE_SIZE}, ORM", orm_page),
+            (f"страница {PAGE_SIZE}, fields=", projection_page),
+        )
+
+        print(f"Медиана CPU из {ROUNDS} раундов, мкс на строку")
+        for name, read in cases:
+            print(f"{name:<32} {await measure(read):>8.1f}")
+
+        await session.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
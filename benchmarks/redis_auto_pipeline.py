@@ -0,0 +1,53 @@
+"""
+Бенчмарк авто-пайплайна: ops/sec одиночных HGET при 100-1000 конкурентных
+вызывающих с выключенным и включённым RedisConfig.auto_pipeline.
+
+Запуск (нужен поднятый redis, см. docker-compose):
+    python -m benchmarks.redis_auto_pipeline
+"""
+
+import asyncio
+import time
+
+from app.core.settings import RedisConfig
+from app.redis.redis_client import RedisClient, RedisKeys
+from benchmarks import run
+
+REDIS_URL = "redis://localhost"
+CALLERS = (100, 250, 500, 1000)
+ROUNDS = 50
+
+
+async def bench(callers: int, auto_pipeline: bool) -> float:
+    config = RedisConfig(
+        host=REDIS_URL,
+        auto_pipeline=auto_pipeline,
+        local_cache_enabled=False,  # меряем именно походы в Redis
+    )
+    client = RedisClient(config)
+    await client.setup()
+    await client.set_cache(RedisKeys.EXAMPLE, "bench", {"value": 1})
+
+    async def caller() -> None:
+        for _ in range(ROUNDS):
+            await client.get_cache(RedisKeys.EXAMPLE, "bench")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+
+    await client.close()
+    return callers * ROUNDS / elapsed
+
+
+async def main() -> None:
+    print(f"HGET ops/sec, {ROUNDS} запросов на вызывающего")
+    print(f"{'callers':>8} {'off':>10} {'auto':>10} {'x':>6}")
+    for callers in CALLERS:
+        off = await bench(callers, auto_pipeline=False)
+        auto = await bench(callers, auto_pipeline=True)
+        print(f"{callers:>8} {off:>10.0f} {auto:>10.0f} {auto / off:>6.2f}")
+
+
+if __name__ == "__main__":
+    run(main)
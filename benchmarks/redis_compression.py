@@ -0,0 +1,83 @@
+"""
+Бенчмарк сжатия значений кэша: сколько байт экономит zlib на JSON со статьёй
+блога (Markdown в content) и сколько это стоит CPU на запись и чтение.
+
+Redis не нужен, меряется только сериализация:
+    python -m benchmarks.redis_compression
+"""
+
+import random
+import time
+import zlib
+
+import orjson
+
+SIZES = (256, 1024, 4096, 16384, 65536)
+LEVELS = (1, 6, 9)
+ROUNDS = 2000
+
+WORDS = (
+    "кэш redis запрос тариф статья пользователь данные сервер ответ время "
+    "значение ключ поле память сеть python async база индекс запись чтение"
+).split()
+MARKUP = ("\n\n## ", "**", "`", "\n- ", "[ссылка](https://example.com/{n}) ")
+
+
+def make_content(size: int) -> str:
+    # псевдо-Markdown из случайных слов: повторяемость как у живого текста,
+    # а не как у одного абзаца, скопированного много раз
+    rnd = random.Random(size)
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        if rnd.random() < 0.1:
+            part = rnd.choice(MARKUP).format(n=rnd.randint(1, 10_000))
+        else:
+            part = rnd.choice(WORDS) + " "
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def make_value(size: int) -> dict:
+    content = make_content(size)
+    return {
+        "id": 1,
+        "title": "Заголовок статьи",
+        "author": 1,
+        "status": "published",
+        "tags": ["python", "redis"],
+        "content": content,
+    }
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+def main() -> None:
+    print(f"zlib, среднее по {ROUNDS} повторам; время в мкс на значение")
+    print(
+        f"{'json, B':>8} {'level':>5} {'zlib, B':>8} {'saved':>6} "
+        f"{'dumps':>7} {'+comp':>7} {'loads':>7} {'+decomp':>8}",
+    )
+    for size in SIZES:
+        raw = orjson.dumps(make_value(size))
+        dumps = timeit(orjson.dumps, make_value(size))
+        loads = timeit(orjson.loads, raw)
+        for level in LEVELS:
+            compressed = zlib.compress(raw, level)
+            saved = 1 - len(compressed) / len(raw)
+            comp = timeit(zlib.compress, raw, level)
+            decomp = timeit(zlib.decompress, compressed)
+            print(
+                f"{len(raw):>8} {level:>5} {len(compressed):>8} {saved:>6.0%} "
+                f"{dumps:>7.1f} {comp:>7.1f} {loads:>7.1f} {decomp:>8.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
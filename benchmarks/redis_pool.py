@@ -0,0 +1,81 @@
+"""
+Бенчмарк пула соединений Redis под конкурентной нагрузкой.
+
+Сравнивает один сокет (max_connections=1, как было с single_connection_client)
+с полноценным пулом, а также set+expire двумя запросами против пайплайна.
+
+Запуск (нужен поднятый redis, см. docker-compose):
+    python -m benchmarks.redis_pool
+"""
+
+import asyncio
+import time
+
+from app.core.settings import RedisConfig
+from app.redis.redis_client import ExpireTime, RedisClient, RedisKeys
+from benchmarks import run
+
+REDIS_URL = "redis://localhost"
+TOTAL_REQUESTS = 20_000
+CONCURRENCY = (1, 10, 100, 500)
+POOL_SIZES = (1, 10, 50)
+
+
+async def bench_reads(pool_size: int, concurrency: int) -> float:
+    client = RedisClient(RedisConfig(host=REDIS_URL, max_connections=pool_size))
+    await client.setup()
+    await client.set_cache(RedisKeys.EXAMPLE, "bench", {"value": 1})
+
+    per_worker = TOTAL_REQUESTS // concurrency
+
+    async def worker() -> None:
+        for _ in range(per_worker):
+            await client.get_cache(RedisKeys.EXAMPLE, "bench")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    await client.close()
+    return per_worker * concurrency / elapsed
+
+
+async def bench_set_expire(requests: int = 5_000) -> tuple[float, float]:
+    client = RedisClient(RedisConfig(host=REDIS_URL))
+    await client.setup()
+    conn = client.connection
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await conn.hset(RedisKeys.EXAMPLE, str(i), "{}")  # type: ignore
+        await conn.expire(RedisKeys.EXAMPLE, ExpireTime.DAY.value)
+    sequential = requests / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        async with client.pipeline() as pipe:
+            pipe.hset(RedisKeys.EXAMPLE, str(i), "{}")  # type: ignore
+            pipe.expire(RedisKeys.EXAMPLE, ExpireTime.DAY.value)
+            await pipe.execute()
+    pipelined = requests / (time.perf_counter() - start)
+
+    await conn.delete(RedisKeys.EXAMPLE)
+    await client.close()
+    return sequential, pipelined
+
+
+async def main() -> None:
+    print(f"HGET, всего {TOTAL_REQUESTS} запросов, ops/sec")
+    print("pool \\ concurrency", *(f"{c:>10}" for c in CONCURRENCY))
+    for pool_size in POOL_SIZES:
+        results = [await bench_reads(pool_size, c) for c in CONCURRENCY]
+        print(f"{pool_size:>18}", *(f"{r:>10.0f}" for r in results))
+
+    sequential, pipelined = await bench_set_expire()
+    print(
+        f"\nset+expire, ops/sec: 2 запроса {sequential:.0f}, пайплайн {pipelined:.0f}",
+    )
+
+
+if __name__ == "__main__":
+    run(main)
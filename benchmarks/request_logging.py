@@ -0,0 +1,116 @@
+"""
+Бенчмарк пропускной способности запросов при разных настройках логирования:
+обработка файла тарифов (TariffFileProcessor.process_file) через ASGI
+без сети и БД. Сравниваются:
+    - логи выключены;
+    - как было: f-строка со всем списком тарифов, info, синхронный sink;
+    - как сейчас: ленивое форматирование, уровень INFO, enqueue;
+    - как сейчас, но с уровнем DEBUG.
+Логи пишутся во временный файл.
+
+Запуск:
+    python -m benchmarks.request_logging
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import date
+
+import httpx
+from fastapi import FastAPI, Request
+from loguru import logger
+
+from app.api.tariff.dao import TariffFileProcessor
+from app.api.tariff.schemas import TariffSchema
+from benchmarks import run
+
+DATES = 10
+TARIFFS_PER_DATE = 50
+REQUESTS = 2000
+CONCURRENCY = 50
+
+PAYLOAD = json.dumps(
+    {
+        f"2024-01-{day + 1:02d}": [
+            {"category_type": f"category-{i}", "rate": 0.01}
+            for i in range(TARIFFS_PER_DATE)
+        ]
+        for day in range(DATES)
+    },
+).encode("utf-8")
+
+
+def process_file_eager(contents: bytes) -> dict[date, list[TariffSchema]]:
+    # логирование TariffFileProcessor до перевода на ленивые debug-логи
+    tariffs = {}
+    for date_str, tariff_list in json.loads(contents).items():
+        created_at = date.fromisoformat(date_str)
+        tariff_objects = [TariffSchema(**tariff) for tariff in tariff_list]
+        tariffs[created_at] = tariff_objects
+        logger.info(f"Processed rates for date {created_at}: {tariff_objects}")
+    return tariffs
+
+
+app = FastAPI()
+
+
+@app.post("/eager")
+async def eager(request: Request) -> dict:
+    return {"dates": len(process_file_eager(await request.body()))}
+
+
+@app.post("/lazy")
+async def lazy(request: Request) -> dict:
+    return {"dates": len(TariffFileProcessor.process_file(await request.body()))}
+
+
+async def measure(path: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+    ) as client:
+
+        async def call() -> None:
+            async with semaphore:
+                response = await client.post(path, content=PAYLOAD)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+
+    await logger.complete()
+    return REQUESTS / elapsed
+
+
+async def main() -> None:
+    fd, log_path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    cases = (
+        ("логи выключены", "/lazy", None, False),
+        ("f-строки, sync, DEBUG (было)", "/eager", "DEBUG", False),
+        ("ленивые, enqueue, INFO (стало)", "/lazy", "INFO", True),
+        ("ленивые, enqueue, DEBUG", "/lazy", "DEBUG", True),
+    )
+
+    print(f"{REQUESTS} запросов по {DATES * TARIFFS_PER_DATE} тарифов")
+    print(f"{'режим':<34} {'req/s':>10}")
+    try:
+        for name, path, level, enqueue in cases:
+            logger.remove()
+            if level is not None:
+                logger.add(log_path, level=level, enqueue=enqueue)
+            rps = await measure(path)
+            print(f"{name:<34} {rps:>10.0f}")
+    finally:
+        logger.remove()
+        os.remove(log_path)
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,114 @@
+"""
+Бенчмарк повтора транзакций при конкурентной записи: WORKERS задач
+переводят суммы между ACCOUNTS счетами в транзакциях SERIALIZABLE через
+DatabaseSessionManager.connection. Счетов мало, поэтому транзакции часто
+конфликтуют (40001) и блокируют друг друга (40P01). Сравниваются:
+    - без повторов (retry=False): ошибка сразу уходит клиенту;
+    - с повторами по retry_policy (как сейчас).
+Считаются успешные транзакции в секунду, ошибки и повторы.
+Таблица bench_tx_accounts создаётся на время замера.
+
+Запуск (нужен поднятый postgres, см. docker-compose):
+    python -m benchmarks.tx_retry
+"""
+
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dao.database import engine
+from app.dao.metrics import DB_TX_RETRIES
+from app.dao.session_maker import session_manager
+from benchmarks import run
+
+ACCOUNTS = 10
+WORKERS = 20
+TRANSFERS = 50  # на задачу
+
+TABLE = "bench_tx_accounts"
+
+
+async def transfer(session: AsyncSession) -> None:
+    source, target = random.sample(range(1, ACCOUNTS + 1), 2)
+    balance = await session.scalar(
+        text(f"SELECT balance FROM {TABLE} WHERE id = :id"),
+        {"id": source},
+    )
+    amount = random.randint(1, 10)
+    if balance is None or balance < amount:
+        return
+    await session.execute(
+        text(f"UPDATE {TABLE} SET balance = balance - :amount WHERE id = :id"),
+        {"amount": amount, "id": source},
+    )
+    await session.execute(
+        text(f"UPDATE {TABLE} SET balance = balance + :amount WHERE id = :id"),
+        {"amount": amount, "id": target},
+    )
+
+
+def retries() -> float:
+    return sum(
+        sample.value
+        for metric in DB_TX_RETRIES.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+    )
+
+
+async def measure(retry: bool) -> tuple[float, int, float]:
+    transfer_tx = session_manager.connection(
+        isolation_level="SERIALIZABLE",
+        retry=retry,
+    )(transfer)
+    failed = 0
+
+    async def worker() -> None:
+        nonlocal failed
+        for _ in range(TRANSFERS):
+            try:
+                await transfer_tx()
+            except DBAPIError:
+                failed += 1
+
+    retries_before = retries()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(WORKERS)))
+    elapsed = time.perf_counter() - start
+    succeeded = WORKERS * TRANSFERS - failed
+    return succeeded / elapsed, failed, retries() - retries_before
+
+
+async def main() -> None:
+    random.seed(0)
+
+    async with engine.begin() as connection:
+        await connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} (id int PRIMARY KEY, balance int)",
+        )
+        await connection.exec_driver_sql(
+            f"INSERT INTO {TABLE} SELECT g, 1000000 FROM generate_series(1, {ACCOUNTS}) "
+            f"AS g ON CONFLICT (id) DO UPDATE SET balance = EXCLUDED.balance",
+        )
+
+    print(
+        f"{WORKERS} задач x {TRANSFERS} переводов, {ACCOUNTS} счетов, "
+        f"попыток: {session_manager.retry_policy.attempts}",
+    )
+    print(f"{'режим':<16} {'tx/s':>10} {'ошибок':>8} {'повторов':>9}")
+    try:
+        for name, retry in (("без повторов", False), ("с повторами", True)):
+            rps, failed, retried = await measure(retry)
+            print(f"{name:<16} {rps:>10.0f} {failed:>8} {retried:>9.0f}")
+    finally:
+        async with engine.begin() as connection:
+            await connection.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    run(main)
@@ -0,0 +1,121 @@
+"""add hot path indexes
+
+Revision ID: a7c4e2f91b3d
+Revises: 0374f41b195e
+Create Date: 2026-10-19 16:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2f91b3d'
+down_revision: Union[str, None] = '0374f41b195e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    'ix_blogs_published_author_id',
+    'ix_blogs_author_status',
+    'ix_tags_name_trgm',
+    'ix_blog_tags_tag_id',
+    'ix_tariffs_date_accession_id',
+    'ix_tariffs_category_type',
+)
+
+
+def drop_invalid_indexes(names: Sequence[str]) -> None:
+    # прерванный CREATE INDEX CONCURRENTLY оставляет индекс INVALID:
+    # IF NOT EXISTS его пропустил бы, а postgres им не пользуется
+    invalid = op.get_bind().execute(
+        sa.text(
+            'SELECT c.relname FROM pg_index i '
+            'JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE NOT i.indisvalid AND c.relname = ANY(:names) '
+            'AND pg_table_is_visible(c.oid)'
+        ),
+        {'names': list(names)},
+    ).scalars().all()
+    for name in invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def upgrade() -> None:
+    # триграммы для Tag.name ILIKE '%x%' (см. BlogDAO.published_query)
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CREATE INDEX CONCURRENTLY не блокирует запись в таблицу, но не может
+    # выполняться внутри транзакции миграции
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(INDEXES)
+
+        # список опубликованных блогов автора по id (страницы и курсор)
+        op.create_index(
+            'ix_blogs_published_author_id',
+            'blogs',
+            ['author', 'id'],
+            postgresql_where=sa.text("status = 'published'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # блоги автора в любом статусе и FK на users
+        op.create_index(
+            'ix_blogs_author_status',
+            'blogs',
+            ['author', 'status'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tags_name_trgm',
+            'tags',
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # (blog_id, tag_id) уже покрыт uq_blog_tag, tag_id - нет
+        op.create_index(
+            'ix_blog_tags_tag_id',
+            'blog_tags',
+            ['tag_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tariffs_date_accession_id',
+            'tariffs',
+            ['date_accession_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tariffs_category_type',
+            'tariffs',
+            ['category_type'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, index in (
+            ('tariffs', 'ix_tariffs_category_type'),
+            ('tariffs', 'ix_tariffs_date_accession_id'),
+            ('blog_tags', 'ix_blog_tags_tag_id'),
+            ('tags', 'ix_tags_name_trgm'),
+            ('blogs', 'ix_blogs_author_status'),
+            ('blogs', 'ix_blogs_published_author_id'),
+        ):
+            op.drop_index(
+                index,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    # pg_trgm не удаляем: расширением могут пользоваться не только эти индексы
@@ -0,0 +1,92 @@
+"""add blog search vector
+
+Revision ID: c91d5e3a7f20
+Revises: a7c4e2f91b3d
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91d5e3a7f20'
+down_revision: Union[str, None] = 'a7c4e2f91b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# как в app.models.blog (SEARCH_CONFIG и Blog.search_vector)
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(tag_names, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(short_description, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(content, '')), 'C')"
+)
+
+
+def drop_invalid_indexes(names: Sequence[str]) -> None:
+    # прерванный CREATE INDEX CONCURRENTLY оставляет индекс INVALID:
+    # IF NOT EXISTS его пропустил бы, а postgres им не пользуется
+    invalid = op.get_bind().execute(
+        sa.text(
+            'SELECT c.relname FROM pg_index i '
+            'JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE NOT i.indisvalid AND c.relname = ANY(:names) '
+            'AND pg_table_is_visible(c.oid)'
+        ),
+        {'names': list(names)},
+    ).scalars().all()
+    for name in invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def upgrade() -> None:
+    # колонки коммитятся до autocommit_block ниже: если построение индекса
+    # прервётся, повторный запуск миграции должен пройти через них заново,
+    # поэтому ADD COLUMN IF NOT EXISTS, а заполнение tag_names повторяемо
+    op.execute(
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS tag_names TEXT "
+        "DEFAULT '' NOT NULL"
+    )
+    op.execute(
+        """
+        UPDATE blogs SET tag_names = names.tag_names
+        FROM (
+            SELECT blog_tags.blog_id, string_agg(tags.name, ' ') AS tag_names
+            FROM blog_tags JOIN tags ON tags.id = blog_tags.tag_id
+            GROUP BY blog_tags.blog_id
+        ) AS names
+        WHERE blogs.id = names.blog_id
+        """
+    )
+    # STORED-колонка заполняется сразу: таблица переписывается под
+    # эксклюзивной блокировкой, на большой таблице - в окно обслуживания
+    op.execute(
+        "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector TSVECTOR "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(['ix_blogs_search_vector'])
+        op.create_index(
+            'ix_blogs_search_vector',
+            'blogs',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_blogs_search_vector',
+            table_name='blogs',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('blogs', 'search_vector')
+    op.drop_column('blogs', 'tag_names')
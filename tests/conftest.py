@@ -0,0 +1,65 @@
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as aioredis
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.settings import APP_CONFIG
+from app.redis.redis_client import RedisClient
+
+# ключи Redis, которые создают тесты, содержат эту метку и удаляются после теста
+TEST_KEY_MARK = "pytest"
+
+
+@pytest_asyncio.fixture
+async def session() -> AsyncIterator[AsyncSession]:
+    """
+    Сессия на основной БД (DB__* из окружения, нужны миграции, см.
+    docker-compose) внутри транзакции, которая откатывается после теста:
+    коммиты DAO становятся savepoint'ами. Без postgres тест пропускается.
+    """
+    engine = create_async_engine(
+        str(APP_CONFIG.db.sqlalchemy_db_uri),
+        poolclass=NullPool,
+    )
+    try:
+        connection = await engine.connect()
+    except (OSError, SQLAlchemyError) as e:
+        await engine.dispose()
+        pytest.skip(f"postgres недоступен: {e!r}")
+
+    transaction = await connection.begin()
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        yield session
+    await transaction.rollback()
+    await connection.close()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def redis() -> AsyncIterator[RedisClient]:
+    """
+    Клиент Redis (REDIS__HOST, см. docker-compose). Ключи с TEST_KEY_MARK
+    удаляются после теста. Без Redis тест пропускается.
+    """
+    if not APP_CONFIG.redis.host:
+        pytest.skip("REDIS__HOST не задан")
+    client = RedisClient(APP_CONFIG.redis)
+    try:
+        await client.setup()
+    except (OSError, aioredis.RedisError) as e:
+        await client.close()
+        pytest.skip(f"redis недоступен: {e!r}")
+
+    yield client
+    keys = [key async for key in client.connection.scan_iter(f"*{TEST_KEY_MARK}*")]
+    if keys:
+        await client.connection.unlink(*keys)
+    await client.close()
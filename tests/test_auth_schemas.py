@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.auth.schemas import SUserInfo, SUserRead
+
+
+def legacy_user() -> SimpleNamespace:
+    # запись, сохранённая до появления проверок формата в UserBase
+    return SimpleNamespace(
+        id=1,
+        email="old@example.com",
+        phone_number="89001234567",
+        first_name="Al",
+        last_name="Li",
+        role=SimpleNamespace(id=1, name="user"),
+    )
+
+
+def test_current_user_schema_accepts_legacy_rows():
+    user = SUserRead.model_validate(legacy_user())
+    assert user.id == 1
+    assert user.role.id == 1
+
+
+def test_registration_validators_reject_legacy_rows():
+    with pytest.raises(ValidationError):
+        SUserInfo.model_validate(legacy_user())
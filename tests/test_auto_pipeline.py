@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+import redis.asyncio as aioredis
+
+from app.redis.auto_pipeline import AutoPipeline
+
+
+class RecordingRedis:
+    """Пайплайн без сети: запоминает пачки команд, ECHO возвращает аргумент."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.batches: list[list[tuple]] = []
+        self.error = error
+
+    def pipeline(self, transaction: bool = True) -> "RecordingPipeline":
+        assert not transaction
+        return RecordingPipeline(self)
+
+
+class RecordingPipeline:
+    def __init__(self, redis: RecordingRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple] = []
+
+    async def __aenter__(self) -> "RecordingPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    def execute_command(self, *args) -> None:
+        self._commands.append(args)
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        self._redis.batches.append(self._commands)
+        if self._redis.error is not None:
+            raise self._redis.error
+        return [
+            args[1] if args[0] == "ECHO" else aioredis.ResponseError(args[0])
+            for args in self._commands
+        ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_go_out_in_one_pipeline():
+    redis = RecordingRedis()
+    pipeline = AutoPipeline(redis)  # type: ignore[arg-type]
+
+    results = await asyncio.gather(
+        *(pipeline.execute_command("ECHO", i) for i in range(10)),
+    )
+
+    assert results == list(range(10))
+    assert redis.batches == [[("ECHO", i) for i in range(10)]]
+
+
+@pytest.mark.asyncio
+async def test_max_batch_flushes_immediately():
+    redis = RecordingRedis()
+    pipeline = AutoPipeline(redis, max_batch=4)  # type: ignore[arg-type]
+
+    results = await asyncio.gather(
+        *(pipeline.execute_command("ECHO", i) for i in range(10)),
+    )
+
+    assert results == list(range(10))
+    assert [len(batch) for batch in redis.batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_command_error_goes_only_to_its_caller():
+    pipeline = AutoPipeline(RecordingRedis())  # type: ignore[arg-type]
+
+    results = await asyncio.gather(
+        pipeline.execute_command("ECHO", 1),
+        pipeline.execute_command("BAD"),
+        pipeline.execute_command("ECHO", 2),
+        return_exceptions=True,
+    )
+
+    assert results[0] == 1
+    assert isinstance(results[1], aioredis.ResponseError)
+    assert results[2] == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_failure_goes_to_every_caller():
+    error = aioredis.ConnectionError("down")
+    pipeline = AutoPipeline(RecordingRedis(error))  # type: ignore[arg-type]
+
+    results = await asyncio.gather(
+        *(pipeline.execute_command("ECHO", i) for i in range(3)),
+        return_exceptions=True,
+    )
+
+    assert results == [error] * 3
@@ -0,0 +1,118 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth.dao import UsersDAO
+from app.api.blog.dao import BlogDAO
+from app.dao.cursor import encode_cursor
+
+# слова, которых нет в обычных данных: в поиск попадают только блоги теста
+WORD = "quokkapytest"
+OTHER = "wombatpytest"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        encode_cursor("rank", True, [0.5]),
+        encode_cursor("rank", True, ["0.5", 1]),
+        encode_cursor("id", True, [0.5, 1]),
+    ],
+)
+async def test_search_rejects_foreign_cursor(cursor: str):
+    # курсор проверяется до запроса в БД
+    with pytest.raises(HTTPException) as exc_info:
+        await BlogDAO.search(None, WORD, cursor)  # type: ignore[arg-type]
+    assert exc_info.value.status_code == 400
+
+
+@pytest_asyncio.fixture
+async def blogs(session: AsyncSession) -> dict[str, int]:
+    users = await UsersDAO.bulk_insert(
+        session,
+        [
+            {
+                "phone_number": "+79990000001",
+                "first_name": "Search",
+                "last_name": "Test",
+                "email": "pytest-search@example.com",
+                "password": "-",
+            },
+        ],
+        returning=["id"],
+    )
+    author = users[0].id  # type: ignore[index]
+    posts = {
+        "title": {"title": f"pytest {WORD}"},
+        "tag": {"tag_names": WORD},
+        "content": {"content": f"текст {WORD}"},
+        "excluded": {"content": f"{WORD} {OTHER}"},
+        "draft": {"title": f"pytest draft {WORD}", "status": "draft"},
+    }
+    rows = await BlogDAO.bulk_insert(
+        session,
+        [
+            {
+                "title": f"pytest-search-{name}",
+                "author": author,
+                "content": "-",
+                "short_description": "-",
+                **post,
+            }
+            for name, post in posts.items()
+        ],
+        returning=["id"],
+    )
+    return {name: row.id for name, row in zip(posts, rows)}  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_published_blogs_by_field_weight(
+    session: AsyncSession,
+    blogs: dict[str, int],
+):
+    found, next_cursor = await BlogDAO.search(session, WORD, page_size=10)
+
+    ids = [blog.id for blog, _ in found]
+    ranks = [rank for _, rank in found]
+    # заголовок (A) выше тегов (B), теги выше текста (C); черновики не ищутся
+    assert ids[:2] == [blogs["title"], blogs["tag"]]
+    assert set(ids) == {
+        blogs["title"],
+        blogs["tag"],
+        blogs["content"],
+        blogs["excluded"],
+    }
+    assert ranks == sorted(ranks, reverse=True)
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_search_supports_websearch_syntax(
+    session: AsyncSession,
+    blogs: dict[str, int],
+):
+    found, _ = await BlogDAO.search(session, f"{WORD} -{OTHER}")
+
+    assert blogs["excluded"] not in {blog.id for blog, _ in found}
+    assert len(found) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_walks_every_result_once(
+    session: AsyncSession,
+    blogs: dict[str, int],
+):
+    expected, _ = await BlogDAO.search(session, WORD, page_size=10)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page, cursor = await BlogDAO.search(session, WORD, cursor, page_size=1)
+        seen.extend(blog.id for blog, _ in page)
+        if cursor is None:
+            break
+
+    assert seen == [blog.id for blog, _ in expected]
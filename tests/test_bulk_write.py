@@ -0,0 +1,216 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth.dao import UsersDAO
+from app.api.blog.dao import TagDAO
+from app.api.tariff.dao import TariffDAO
+from app.models import Blog, DateAccession, Tag, Tariff, User
+
+
+def test_bulk_insert_statement_applies_python_column_defaults():
+    # bulk_insert выполняет insert(table): значения Column(default=...) для
+    # непереданных колонок Core вычисляет перед выполнением (prefetch)
+    compiled = insert(Blog.__table__).compile(
+        dialect=postgresql.dialect(),
+        column_keys=["title", "author", "content", "short_description"],
+    )
+    prefetched = {column.name for column in compiled.insert_prefetch}
+    assert prefetched == {"status", "tag_names"}
+
+
+def user(i: int, first_name: str = "Bulk", **extra) -> dict:
+    return {
+        "email": f"pytest-{i}@example.com",
+        "phone_number": f"+7999{i:07d}",
+        "first_name": first_name,
+        "last_name": "Insert",
+        "password": "-",
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_returns_rows_in_values_order(session: AsyncSession):
+    # разные наборы колонок идут разными executemany, пачками по chunk_size
+    values = [user(i, role_id=1) if i % 2 else user(i) for i in range(5)]
+
+    rows = await UsersDAO.bulk_insert(
+        session,
+        values,
+        returning=["id", "email", "role_id"],
+        chunk_size=2,
+    )
+
+    assert [row.email for row in rows] == [  # type: ignore[union-attr]
+        value["email"] for value in values
+    ]
+    assert {row.role_id for row in rows} == {1}  # type: ignore[union-attr]
+    assert len({row.id for row in rows}) == 5  # type: ignore[union-attr]
+    assert session.identity_map.keys() == set()
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_without_returning_counts_rows(session: AsyncSession):
+    assert await UsersDAO.bulk_insert(session, [user(i) for i in range(3)]) == 3
+    assert await UsersDAO.bulk_insert(session, []) == 0
+
+
+def compile_pg(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_without_fields_to_update_does_nothing_on_conflict():
+    # no-op DO UPDATE писал бы новую версию строки и брал бы на неё блокировку
+    stmt = TagDAO._on_conflict(pg_insert(Tag.__table__), ("name",), ["name"], None)
+    assert "ON CONFLICT (name) DO NOTHING" in compile_pg(stmt)
+
+
+def test_upsert_updates_passed_columns_except_key():
+    stmt = UsersDAO._on_conflict(
+        pg_insert(User.__table__),
+        ("email", "first_name", "last_name"),
+        ["email"],
+        None,
+    )
+    sql = compile_pg(stmt)
+    assert "ON CONFLICT (email) DO UPDATE" in sql
+    assert "first_name = excluded.first_name" in sql
+    assert "updated_at = now()" in sql
+    assert "email = excluded" not in sql
+
+
+@pytest.mark.asyncio
+async def test_add_tags_returns_ids_of_new_and_existing_tags(session: AsyncSession):
+    first = await TagDAO.add_tags(session, ["pytest-a", "pytest-b"])
+    second = await TagDAO.add_tags(session, ["PYTEST-B", "pytest-c", "pytest-a"])
+
+    assert len(set(first)) == 2
+    assert second[0] == first[1]
+    assert second[2] == first[0]
+    assert second[1] not in first
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_matches_returning_rows_to_values(session: AsyncSession):
+    await UsersDAO.bulk_insert(session, [user(1, "Old")])
+    rows = await UsersDAO.upsert_many(
+        session,
+        unique_fields=["email"],
+        values=[user(1, "First"), user(2, "Second"), user(1, "Last")],
+        update_fields=["first_name"],
+        returning=["id", "first_name"],
+    )
+
+    assert isinstance(rows, list)
+    assert [row.email for row in rows] == [  # type: ignore[union-attr]
+        "pytest-1@example.com",
+        "pytest-2@example.com",
+        "pytest-1@example.com",
+    ]
+    # из повторов по ключу применяется последний, обоим достаётся одна строка
+    assert rows[0] is rows[2]
+    assert rows[0].first_name == "Last"  # type: ignore[union-attr]
+
+
+class RecordingSession:
+    """Сессия без БД: запоминает SQL запросов, каждый обновляет одну строку."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    async def execute(self, statement):
+        self.statements.append(
+            str(
+                statement.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                ),
+            ),
+        )
+        return type("Result", (), {"rowcount": 1})()
+
+    async def flush(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_sends_repeated_ids_in_later_generations():
+    session = RecordingSession()
+
+    updated = await TariffDAO.bulk_update(
+        session,  # type: ignore[arg-type]
+        [
+            {"id": 1, "rate": 1.0},
+            {"id": 2, "rate": 2.0},
+            {"id": 1, "rate": 3.0},
+            {"id": 3, "category_type": "x"},
+            {"rate": 5.0},  # без id
+            {"id": 4},  # нечего обновлять
+        ],
+    )
+
+    assert updated == 3
+    values = [sql.split("FROM ")[1].split(" AS")[0] for sql in session.statements]
+    assert values == [
+        "(VALUES (3, 'x'))",
+        "(VALUES (1, 1.0), (2, 2.0))",
+        "(VALUES (1, 3.0))",
+    ]
+    assert "SET category_type=data.category_type" in session.statements[0]
+    assert "SET rate=data.rate" in session.statements[1]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_splits_groups_into_chunks():
+    session = RecordingSession()
+
+    await TariffDAO.bulk_update(
+        session,  # type: ignore[arg-type]
+        [{"id": i, "rate": float(i)} for i in range(5)],
+        chunk_size=2,
+    )
+
+    assert len(session.statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_applies_last_write_per_id(session: AsyncSession):
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    rows = await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": "pytest",
+                "rate": 0.0,
+                "date_accession_id": date_accession.id,
+            }
+            for _ in range(3)
+        ],
+        returning=["id"],
+    )
+    ids = [row.id for row in rows]  # type: ignore[union-attr]
+
+    updated = await TariffDAO.bulk_update(
+        session,
+        [
+            {"id": ids[0], "rate": 1.0},
+            {"id": ids[1], "rate": 2.0},
+            {"id": ids[0], "rate": 3.0},
+            {"id": ids[2], "category_type": "pytest-x"},
+        ],
+    )
+
+    assert updated == 4
+    result = await session.execute(
+        select(Tariff.id, Tariff.rate, Tariff.category_type).where(Tariff.id.in_(ids)),
+    )
+    assert {row.id: (row.rate, row.category_type) for row in result} == {
+        ids[0]: (3.0, "pytest"),
+        ids[1]: (2.0, "pytest"),
+        ids[2]: (0.0, "pytest-x"),
+    }
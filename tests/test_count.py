@@ -0,0 +1,21 @@
+import pytest
+
+from app.dao.count import invalidate_counts
+from app.redis.redis_client import RedisClient, RedisKeys
+from tests.conftest import TEST_KEY_MARK
+
+TABLE = f"{TEST_KEY_MARK}_blogs"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_counts_deletes_only_its_table(redis: RedisClient):
+    # у другой таблицы то же начало имени: сброс по префиксу задел бы и её
+    own = f"{RedisKeys.COUNT.value}:{TABLE}"
+    other = f"{RedisKeys.COUNT.value}:{TABLE}_archive"
+    for key in (own, other):
+        await redis.set_cache(key, "filters", {"count": 1, "expires_at": 0})
+
+    await invalidate_counts(redis, TABLE)
+
+    assert await redis.get_cache(own, "filters") is None
+    assert await redis.get_cache(other, "filters") == {"count": 1, "expires_at": 0}
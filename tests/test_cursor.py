@@ -0,0 +1,123 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.tariff.dao import TariffDAO
+from app.dao.cursor import coerce_cursor_value, decode_cursor, encode_cursor
+from app.models import DateAccession, Tariff
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor("created_at", True, [created_at, 42])
+
+    values = decode_cursor(cursor, "created_at", True)
+
+    # курсор уходит в URL: без паддинга и символов, требующих экранирования
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert coerce_cursor_value(values[0], datetime) == created_at
+    assert coerce_cursor_value(values[1], int) == 42
+
+
+@pytest.mark.parametrize(
+    ("order_by", "descending"),
+    [("rate", False), ("id", True)],
+)
+def test_cursor_of_another_sort_is_rejected(order_by: str, descending: bool):
+    cursor = encode_cursor("id", False, [1])
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, order_by, descending)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not-base64!", "bnVsbA", encode_cursor("id", False, 1)],  # type: ignore
+)
+def test_malformed_cursor_is_rejected(cursor: str):
+    with pytest.raises(HTTPException):
+        decode_cursor(cursor, "id", False)
+
+
+@pytest.mark.parametrize(
+    ("value", "python_type", "expected"),
+    [
+        (1, int, 1),
+        (1, float, 1.0),
+        (0.5, float, 0.5),
+        ("1.10", Decimal, Decimal("1.10")),
+        ("text", str, "text"),
+    ],
+)
+def test_coerce_cursor_value(value, python_type: type, expected):
+    assert coerce_cursor_value(value, python_type) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "python_type"),
+    [
+        ("1", int),
+        (True, int),
+        (None, str),
+        (1, datetime),
+        ("yesterday", datetime),
+        ("abc", Decimal),
+        ([1], Decimal),
+    ],
+)
+def test_coerce_cursor_value_rejects_forged_values(value, python_type: type):
+    with pytest.raises(HTTPException) as exc_info:
+        coerce_cursor_value(value, python_type)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("descending", [False, True])
+async def test_keyset_pages_cover_every_row_once(
+    session: AsyncSession,
+    descending: bool,
+):
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    # повторяющиеся значения order_by: порядок внутри них задаёт id
+    rows = await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": "pytest",
+                "rate": float(i % 3),
+                "date_accession_id": date_accession.id,
+            }
+            for i in range(11)
+        ],
+        returning=["id", "rate"],
+    )
+    expected = sorted(
+        ((row.rate, row.id) for row in rows),  # type: ignore[union-attr]
+        reverse=descending,
+    )
+
+    query = select(Tariff).filter_by(date_accession_id=date_accession.id)
+
+    seen: list[tuple[float, int]] = []
+    cursor = None
+    while True:
+        page, cursor = await TariffDAO.keyset_page(
+            session,
+            query,
+            cursor=cursor,
+            page_size=4,
+            order_by="rate",
+            descending=descending,
+        )
+        seen.extend((tariff.rate, tariff.id) for tariff in page)
+        if cursor is None:
+            break
+
+    assert seen == expected
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.settings import APP_CONFIG
+from app.dao.database import asyncpg_connect_args, create_engine
+
+
+def test_direct_connection_keeps_asyncpg_defaults():
+    assert asyncpg_connect_args(pgbouncer=False) == {}
+    assert asyncpg_connect_args(pgbouncer=False, statement_cache_size=50) == {
+        "prepared_statement_cache_size": 50,
+    }
+
+
+def test_pgbouncer_mode_disables_statement_caches():
+    args = asyncpg_connect_args(pgbouncer=True)
+
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    # PgBouncer >= 1.21 с max_prepared_statements: кэш SQLAlchemy можно включить
+    assert asyncpg_connect_args(True, 100)["prepared_statement_cache_size"] == 100
+
+
+def test_pgbouncer_mode_names_statements_uniquely():
+    name_func = asyncpg_connect_args(pgbouncer=True)["prepared_statement_name_func"]
+    other_func = asyncpg_connect_args(pgbouncer=True)["prepared_statement_name_func"]
+
+    names = {name_func() for _ in range(100)} | {other_func() for _ in range(100)}
+    assert len(names) == 200
+    assert all(name.startswith("__asyncpg_") for name in names)
+
+
+@pytest.mark.asyncio
+async def test_pgbouncer_mode_engine_runs_prepared_statements():
+    engine = create_engine(
+        str(APP_CONFIG.db.sqlalchemy_db_uri),
+        "pytest-pgbouncer",
+        pgbouncer=True,
+    )
+    try:
+        connection = await engine.connect()
+    except (OSError, SQLAlchemyError) as e:
+        await engine.dispose()
+        pytest.skip(f"postgres недоступен: {e!r}")
+
+    try:
+        # повтор выражения: без кэша оно готовится заново под новым именем
+        for value in (1, 2):
+            result = await connection.scalar(
+                text("SELECT CAST(:value AS int) + 1"),
+                {"value": value},
+            )
+            assert result == value + 1
+    finally:
+        await connection.close()
+        await engine.dispose()
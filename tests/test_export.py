@@ -0,0 +1,105 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+
+import orjson
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.tariff.dao import TariffDAO
+from app.dao import export
+from app.dao.export import ExportFormat
+from app.models import DateAccession
+
+ROWS = [{"id": i, "name": f"строка, {i}"} for i in range(5)]
+
+
+async def rows(items: list[dict]) -> AsyncIterator[dict]:
+    for item in items:
+        yield item
+
+
+async def encode(items: list[dict], export_format: ExportFormat) -> list[bytes]:
+    return [chunk async for chunk in export._encode(rows(items), export_format)]
+
+
+@pytest.mark.asyncio
+async def test_json_export_is_a_json_array():
+    chunks = await encode(ROWS, ExportFormat.json)
+
+    assert orjson.loads(b"".join(chunks)) == ROWS
+    assert await encode([], ExportFormat.json) == [b"[]"]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_is_one_object_per_line():
+    chunks = await encode(ROWS, ExportFormat.ndjson)
+
+    lines = b"".join(chunks).splitlines()
+    assert [orjson.loads(line) for line in lines] == ROWS
+
+
+@pytest.mark.asyncio
+async def test_csv_export_has_header_and_quoting():
+    chunks = await encode(ROWS, ExportFormat.csv)
+
+    reader = csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8")))
+    assert [{"id": int(r["id"]), "name": r["name"]} for r in reader] == ROWS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+async def test_first_row_is_sent_before_the_rest(export_format: ExportFormat):
+    chunks = await encode(ROWS, export_format)
+
+    # первая строка уходит отдельно, остальные копятся в буфере
+    assert len(chunks) == 2
+    assert b"0" in chunks[0] and b"1" not in chunks[0]
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_flushed_by_size(monkeypatch):
+    monkeypatch.setattr(export, "BUFFER_SIZE", 64)
+
+    chunks = await encode(ROWS * 10, ExportFormat.ndjson)
+
+    assert len(chunks) > 2
+    assert all(len(chunk) < 64 * 2 for chunk in chunks)
+
+
+class ByDateAccession(BaseModel):
+    date_accession_id: int
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_filtered_records_in_id_order(session: AsyncSession):
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    inserted = await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": f"pytest-{i}",
+                "rate": 0.1,
+                "date_accession_id": date_accession.id,
+            }
+            for i in range(7)
+        ],
+        returning=["id"],
+    )
+
+    streamed = [
+        tariff
+        async for tariff in TariffDAO.stream(
+            session,
+            filters=ByDateAccession(date_accession_id=date_accession.id),
+            chunk_size=3,
+        )
+    ]
+
+    assert [t.id for t in streamed] == sorted(
+        row.id for row in inserted  # type: ignore[union-attr]
+    )
+    assert {t.date_accession_id for t in streamed} == {date_accession.id}
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.exc import OperationalError
+
+from app.dao import instrumentation
+from app.dao.instrumentation import fingerprint, instrument_engine
+from app.models import Blog, Tariff
+
+
+def compile_asyncpg(statement) -> str:
+    # как при выполнении: IN (...) раскрывается, у параметров - приведение типа
+    return str(
+        statement.compile(
+            dialect=asyncpg_dialect(),
+            compile_kwargs={"render_postcompile": True},
+        ),
+    )
+
+
+def test_in_list_size_does_not_change_fingerprint():
+    sizes = (1, 2, 10, 1000)
+    statements = [
+        compile_asyncpg(select(Tariff).where(Tariff.id.in_(list(range(size)))))
+        for size in sizes
+    ]
+    assert "::INTEGER" in statements[1]
+    assert len({fingerprint(statement) for statement in statements}) == 1
+
+
+def test_multi_row_insert_row_count_does_not_change_fingerprint():
+    statements = [
+        compile_asyncpg(
+            insert(Tariff).values(
+                [
+                    {"category_type": f"c-{i}", "rate": 0.1, "date_accession_id": i}
+                    for i in range(rows)
+                ],
+            ),
+        )
+        for rows in (1, 2, 50)
+    ]
+    assert "::FLOAT" in statements[1]
+    assert len({fingerprint(statement) for statement in statements}) == 1
+
+
+def test_different_queries_have_different_fingerprints():
+    by_id = compile_asyncpg(select(Blog).where(Blog.id == 1))
+    by_author = compile_asyncpg(select(Blog).where(Blog.author == 1))
+    assert fingerprint(by_id) != fingerprint(by_author)
+
+
+def test_insertmanyvalues_sentinel_counter_is_normalized():
+    # так insertmanyvalues рисует пачку с сохранением порядка строк
+    def batch(rows: int) -> str:
+        values = ", ".join(f"(${i + 1}::VARCHAR, {i})" for i in range(rows))
+        return (
+            f"INSERT INTO tags (name) SELECT p0::VARCHAR FROM (VALUES {values}) "
+            "AS imp_sen(p0, sen_counter) ORDER BY sen_counter"
+        )
+
+    assert fingerprint(batch(1)) == fingerprint(batch(3))
+
+
+def test_seen_fingerprints_are_bounded(monkeypatch):
+    monkeypatch.setattr(instrumentation, "SEEN_FINGERPRINTS_LIMIT", 10)
+    monkeypatch.setattr(instrumentation, "_seen_fingerprints", OrderedDict())
+    for i in range(100):
+        fingerprint(f"SELECT * FROM table_{i}")
+    assert len(instrumentation._seen_fingerprints) == 10
+
+
+def test_failed_statement_does_not_break_query_timing():
+    # instrument_engine использует только sync_engine
+    engine = SimpleNamespace(sync_engine=create_engine("sqlite://"))
+    instrument_engine(engine)  # type: ignore[arg-type]
+    with engine.sync_engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.exec_driver_sql("SELECT * FROM missing_table")
+        assert connection.exec_driver_sql("SELECT 42").scalar() == 42
+        assert "query_start" not in connection.info
+
+
+def test_explain_analyze_skips_locking_and_modifying_statements():
+    assert instrumentation.can_analyze("SELECT", "SELECT * FROM tariffs WHERE id = $1")
+    for statement in (
+        "SELECT * FROM tariffs WHERE id = $1 FOR UPDATE",
+        "SELECT * FROM tariffs FOR NO KEY UPDATE SKIP LOCKED",
+        "SELECT * FROM tariffs FOR SHARE",
+        "SELECT * FROM tariffs for key share",
+    ):
+        assert not instrumentation.can_analyze("SELECT", statement)
+    assert not instrumentation.can_analyze("WITH", "WITH x AS (DELETE ...) SELECT 1")
+    assert not instrumentation.can_analyze("UPDATE", "UPDATE tariffs SET rate = $1")
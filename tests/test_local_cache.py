@@ -0,0 +1,45 @@
+import orjson
+
+from app.core.settings import RedisConfig
+from app.redis.redis_client import RedisClient
+
+
+def test_whole_key_invalidation_keeps_keys_with_same_prefix():
+    client = RedisClient(RedisConfig(local_cache_enabled=True))
+    local = client._local
+    assert local is not None
+    local.set(("count-data:blogs", "a"), b"1")
+    local.set(("count-data:blogs", "b"), b"2")
+    local.set(("count-data:blogs_archive", "a"), b"3")
+
+    # сообщение другого воркера после del_all_cache
+    client._apply_invalidation(
+        orjson.dumps(
+            {
+                "key": "count-data:blogs",
+                "field": None,
+                "origin": "other",
+                "whole_key": True,
+            },
+        ),
+    )
+
+    assert local.get(("count-data:blogs", "a")) is None
+    assert local.get(("count-data:blogs", "b")) is None
+    assert local.get(("count-data:blogs_archive", "a")) == b"3"
+
+
+def test_prefix_invalidation_message_drops_all_matching_keys():
+    client = RedisClient(RedisConfig(local_cache_enabled=True))
+    local = client._local
+    assert local is not None
+    local.set(("tariff-data", "1"), b"1")
+    local.set(("tariff-data-v2", "1"), b"2")
+    local.set(("count-data:blogs", "a"), b"3")
+
+    client._apply_invalidation(
+        orjson.dumps({"key": "tariff-data", "field": None, "origin": "other"}),
+    )
+
+    assert len(local) == 1
+    assert local.get(("count-data:blogs", "a")) == b"3"
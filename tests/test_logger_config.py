@@ -0,0 +1,69 @@
+from collections.abc import Iterator
+
+import pytest
+from loguru import logger
+
+from app.core.logger_config import SampledLogger
+
+
+@pytest.fixture
+def messages() -> Iterator[list[str]]:
+    records: list[str] = []
+    handler_id = logger.add(
+        lambda message: records.append(message.record["message"]),
+        level="DEBUG",
+        format="{message}",
+    )
+    yield records
+    logger.remove(handler_id)
+
+
+def test_sampled_logger_writes_every_nth_call_per_site(messages: list[str]):
+    sampled = SampledLogger(every=3)
+
+    for i in range(7):
+        sampled.info("first site {}", i)
+    for i in range(2):
+        sampled.info("second site {}", i)
+
+    assert messages == [
+        "first site 0",
+        "first site 3",
+        "first site 6",
+        "second site 0",
+    ]
+
+
+def test_sampled_out_calls_are_not_formatted(messages: list[str]):
+    formatted = 0
+
+    class Expensive:
+        def __str__(self) -> str:
+            nonlocal formatted
+            formatted += 1
+            return "expensive"
+
+    sampled = SampledLogger(every=10)
+    for _ in range(10):
+        sampled.debug("value {}", Expensive())
+
+    assert messages == ["value expensive"]
+    assert formatted == 1
+
+
+def test_sampled_logger_reports_the_caller():
+    functions: list[str] = []
+    handler_id = logger.add(
+        lambda message: functions.append(message.record["function"]),
+        level="DEBUG",
+    )
+    try:
+        SampledLogger(every=1).info("caller")
+    finally:
+        logger.remove(handler_id)
+
+    assert functions == ["test_sampled_logger_reports_the_caller"]
+
+
+def test_sampled_logger_with_non_positive_every_logs_everything():
+    assert SampledLogger(every=0).every == 1
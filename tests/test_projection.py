@@ -0,0 +1,76 @@
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.api.auth.dao import UsersDAO
+from app.api.tariff.dao import TariffDAO
+from app.api.tariff.schemas import TariffRespSchema
+from app.models import DateAccession, Tariff, User
+
+
+def selected_columns(fields) -> list[str]:
+    return [column["name"] for column in TariffDAO._select(fields).column_descriptions]
+
+
+def test_select_by_field_names_and_schema():
+    assert selected_columns(["id", "rate"]) == ["id", "rate"]
+    assert selected_columns(TariffRespSchema) == list(TariffRespSchema.model_fields)
+
+
+def test_select_rejects_unknown_columns():
+    class WithRelationship(BaseModel):
+        id: int
+        date_accession: dict
+
+    with pytest.raises(ValueError, match="date_accession"):
+        TariffDAO._select(WithRelationship)
+
+
+def test_select_rejects_fields_together_with_options():
+    with pytest.raises(ValueError):
+        TariffDAO._select(["id"], options=[raiseload(Tariff.date_accession)])
+
+
+def test_select_options_override_model_loading():
+    # User.role загружается JOIN'ом (lazy="joined"), raiseload его отключает
+    sql = str(
+        UsersDAO._select(options=[raiseload(User.role)]).compile(
+            dialect=postgresql.dialect(),
+        ),
+    )
+    assert "JOIN" not in sql
+    assert "JOIN" in str(UsersDAO._select().compile(dialect=postgresql.dialect()))
+
+
+class ByDateAccession(BaseModel):
+    date_accession_id: int
+
+
+@pytest.mark.asyncio
+async def test_find_all_with_fields_returns_rows_outside_identity_map(
+    session: AsyncSession,
+):
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": "pytest",
+                "rate": 0.5,
+                "date_accession_id": date_accession.id,
+            },
+        ],
+    )
+    filters = ByDateAccession(date_accession_id=date_accession.id)
+    known = set(session.identity_map.keys())
+
+    rows = await TariffDAO.find_all(session, filters, fields=["id", "rate"])
+    schemas = await TariffDAO.find_all_as(session, TariffRespSchema, filters)
+
+    assert [tuple(row._fields) for row in rows] == [("id", "rate")]  # type: ignore
+    assert [(s.category_type, s.rate) for s in schemas] == [("pytest", 0.5)]
+    assert set(session.identity_map.keys()) == known
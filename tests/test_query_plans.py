@@ -0,0 +1,174 @@
+"""
+Регрессия планов горячих запросов DAO: на заполненной БД каждый запрос должен
+использовать свой индекс. Одного отсутствия Seq Scan мало: полный проход по
+чужому индексу (например, по первичному ключу) с Filter тоже обходит всю
+таблицу. Seq Scan отключается (enable_seqscan = off): без подходящего индекса
+postgres всё равно выберет его, так что проверка не зависит от объёма данных.
+"""
+
+from collections.abc import Callable, Iterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth.dao import UsersDAO
+from app.api.blog.dao import BlogDAO, BlogTagDAO, TagDAO
+from app.api.tariff.dao import TariffDAO
+from app.dao.count import explain
+from app.models import Blog, DateAccession, Tag, Tariff, User
+
+CHECKED_TABLES = ("blogs", "tags", "blog_tags", "tariffs", "users")
+
+USERS = 100
+BLOGS = 5000
+TAGS = 200
+TARIFFS = 10_000
+PAGE = 10
+
+# запрос в том виде, в каком его строит DAO, и индекс, который должен быть в плане
+HOT_QUERIES: dict[str, tuple[Callable[[dict[str, int]], Select], str]] = {
+    # опубликованных большинство: проход по первичному ключу с Filter
+    # останавливается после PAGE строк благодаря LIMIT
+    "blogs-published": (
+        lambda ids: BlogDAO.published_query().order_by(Blog.id).limit(PAGE),
+        "blogs_pkey",
+    ),
+    "blogs-by-author": (
+        lambda ids: BlogDAO.published_query(author_id=ids["author_id"])
+        .order_by(Blog.id)
+        .limit(PAGE),
+        "ix_blogs_published_author_id",
+    ),
+    "blogs-by-author-cursor": (
+        lambda ids: BlogDAO.published_query(author_id=ids["author_id"])
+        .where(Blog.id > ids["blog_id"])
+        .order_by(Blog.id)
+        .limit(PAGE),
+        "ix_blogs_published_author_id",
+    ),
+    "blogs-by-tag": (
+        lambda ids: BlogDAO.published_query(tag="check-1")
+        .order_by(Blog.id)
+        .limit(PAGE),
+        "ix_tags_name_trgm",
+    ),
+    "tags-name-ilike": (
+        lambda ids: select(Tag).where(Tag.name.ilike("%check-1%")),
+        "ix_tags_name_trgm",
+    ),
+    "tariffs-by-date-accession": (
+        lambda ids: select(Tariff).filter_by(
+            date_accession_id=ids["date_accession_id"],
+        ),
+        "ix_tariffs_date_accession_id",
+    ),
+    "tariffs-by-category-type": (
+        lambda ids: select(Tariff).filter_by(category_type="category-1"),
+        "ix_tariffs_category_type",
+    ),
+    # имя уникального ограничения по умолчанию из начальной миграции
+    "users-by-email": (
+        lambda ids: select(User).filter_by(email="plan-check-1@example.com"),
+        "users_email_key",
+    ),
+}
+
+
+@pytest_asyncio.fixture
+async def seeded(session: AsyncSession) -> dict[str, int]:
+    users = await UsersDAO.bulk_insert(
+        session,
+        [
+            {
+                "phone_number": f"+7000{i:07d}",
+                "first_name": "Plan",
+                "last_name": "Check",
+                "email": f"plan-check-{i}@example.com",
+                "password": "-",
+            }
+            for i in range(USERS)
+        ],
+        returning=["id"],
+    )
+    user_ids = [row.id for row in users]  # type: ignore[union-attr]
+    blogs = await BlogDAO.bulk_insert(
+        session,
+        [
+            {
+                "title": f"plan-check-{i}",
+                "author": user_ids[i % USERS],
+                "content": "-",
+                "short_description": "-",
+                "status": "draft" if i % 10 == 0 else "published",
+            }
+            for i in range(BLOGS)
+        ],
+        returning=["id"],
+    )
+    blog_ids = [row.id for row in blogs]  # type: ignore[union-attr]
+    tag_ids = await TagDAO.add_tags(session, [f"plan-check-{i}" for i in range(TAGS)])
+    await BlogTagDAO.bulk_insert(
+        session,
+        [
+            {"blog_id": blog_id, "tag_id": tag_ids[(i + k) % TAGS]}
+            for i, blog_id in enumerate(blog_ids)
+            for k in range(2)
+        ],
+    )
+
+    date_accession = DateAccession()
+    session.add(date_accession)
+    await session.flush()
+    await TariffDAO.bulk_insert(
+        session,
+        [
+            {
+                "category_type": f"category-{i % 500}",
+                "rate": 0.01,
+                "date_accession_id": date_accession.id,
+            }
+            for i in range(TARIFFS)
+        ],
+    )
+
+    connection = await session.connection()
+    for table in CHECKED_TABLES:
+        # статистика учитывает строки, вставленные этой же транзакцией
+        await connection.exec_driver_sql(f"ANALYZE {table}")
+    await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    return {
+        "author_id": user_ids[0],
+        "blog_id": blog_ids[BLOGS // 2],
+        "date_accession_id": date_accession.id,
+    }
+
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        if plan.get("Relation Name") in CHECKED_TABLES:
+            yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+def index_names(plan: dict) -> Iterator[str]:
+    # Index Scan, Index Only Scan и Bitmap Index Scan
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from index_names(child)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", HOT_QUERIES)
+async def test_hot_query_uses_expected_index(
+    session: AsyncSession,
+    seeded: dict[str, int],
+    name: str,
+):
+    build, expected = HOT_QUERIES[name]
+    plan = await explain(session, build(seeded))
+    assert not sorted(set(seq_scans(plan)))
+    assert expected in set(index_names(plan))
@@ -0,0 +1,168 @@
+import asyncio
+
+import orjson
+import pytest
+import redis.asyncio as aioredis
+
+from app.core.settings import RedisConfig
+from app.redis.redis_client import COMPRESSED_MARKER, RedisClient
+from tests.conftest import TEST_KEY_MARK
+
+KEY = f"{TEST_KEY_MARK}-cache"
+
+
+def test_connection_pool_is_sized_from_config():
+    client = RedisClient(
+        RedisConfig(
+            host="redis://localhost",
+            max_connections=7,
+            pool_timeout=1.5,
+            socket_timeout=2.0,
+        ),
+    )
+
+    # соединения создаются лениво, Redis для проверки не нужен
+    connection = client.connection
+    pool = connection.connection_pool
+    assert isinstance(pool, aioredis.BlockingConnectionPool)
+    assert not connection.single_connection_client
+    assert pool.max_connections == 7
+    assert pool.timeout == 1.5
+    assert pool.connection_kwargs["socket_timeout"] == 2.0
+
+
+@pytest.mark.parametrize(
+    ("size", "compressed"),
+    [(100, False), (2000, True)],
+)
+def test_dumps_compresses_values_from_threshold(size: int, compressed: bool):
+    client = RedisClient(RedisConfig(compression_threshold=1024))
+    value = {"content": "x" * size}
+
+    dumped = client._dumps(value)
+
+    assert dumped.startswith(COMPRESSED_MARKER) is compressed
+    assert orjson.loads(client._decompress(dumped)) == value
+
+
+def test_dumps_without_threshold_does_not_compress():
+    client = RedisClient(RedisConfig(compression_threshold=0))
+    value = {"content": "x" * 10_000}
+
+    assert client._dumps(value) == orjson.dumps(value)
+
+
+def test_decompress_reads_legacy_uncompressed_values():
+    raw = orjson.dumps({"id": 1})
+
+    assert RedisClient._decompress(raw) == raw
+
+
+@pytest.mark.asyncio
+async def test_large_value_is_stored_compressed(redis: RedisClient):
+    value = {"content": "статья " * 1000}
+    await redis.set_cache(KEY, "1", value)
+
+    stored = await redis.connection.hget(KEY, "1")  # type: ignore[misc]
+    assert stored.startswith(COMPRESSED_MARKER)
+    assert len(stored) < len(orjson.dumps(value))
+    assert await redis.get_cache(KEY, "1") == value
+
+
+@pytest.mark.asyncio
+async def test_set_cache_sets_value_and_expire(redis: RedisClient):
+    await redis.set_cache(KEY, "1", {"id": 1}, expire=60)
+
+    assert await redis.get_cache(KEY, "1") == {"id": 1}
+    assert 0 < await redis.connection.ttl(KEY) <= 60
+
+
+@pytest.mark.asyncio
+async def test_merge_cache_keeps_empty_lists_and_float_precision(redis: RedisClient):
+    # то, что cjson в lua-скрипте портил: [] -> {}, float до 14 знаков
+    rate = 0.12345678901234568
+    await redis.set_cache(KEY, "1", {"items": [], "rate": rate})
+
+    assert await redis.merge_cache(KEY, "1", {"tags": [], "nested": {"list": []}})
+
+    assert await redis.get_cache(KEY, "1") == {
+        "items": [],
+        "rate": rate,
+        "tags": [],
+        "nested": {"list": []},
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_merges_do_not_lose_updates(redis: RedisClient):
+    await redis.set_cache(KEY, "1", {"id": 1})
+
+    results = await asyncio.gather(
+        *(redis.merge_cache(KEY, "1", {f"field_{i}": i}) for i in range(20)),
+    )
+
+    assert all(results)
+    value = await redis.get_cache(KEY, "1")
+    assert value == {"id": 1, **{f"field_{i}": i for i in range(20)}}
+
+
+@pytest.mark.asyncio
+async def test_merge_cache_retries_after_concurrent_write(
+    redis: RedisClient,
+    monkeypatch,
+):
+    await redis.set_cache(KEY, "1", {"id": 1})
+    transaction = redis.connection.transaction
+    attempts = 0
+
+    async def racing_transaction(func, *watches, **kwargs):
+        async def merge(pipe):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                # другой воркер пишет поле между WATCH и EXEC
+                await redis.connection.hset(
+                    KEY,
+                    "1",
+                    orjson.dumps({"id": 1, "other": 2}),
+                )
+            return await func(pipe)
+
+        return await transaction(merge, *watches, **kwargs)
+
+    monkeypatch.setattr(redis.connection, "transaction", racing_transaction)
+
+    assert await redis.merge_cache(KEY, "1", {"patch": 3})
+
+    assert attempts == 2
+    assert await redis.get_cache(KEY, "1") == {"id": 1, "other": 2, "patch": 3}
+
+
+@pytest.mark.asyncio
+async def test_merge_cache_does_not_create_missing_value(redis: RedisClient):
+    assert not await redis.merge_cache(KEY, "missing", {"a": 1})
+    assert await redis.get_cache(KEY, "missing") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_prefix_deletes_matching_keys_in_batches(redis: RedisClient):
+    prefix = f"{TEST_KEY_MARK}-prefix[1]*"  # спецсимволы glob экранируются
+    async with redis.pipeline(transaction=False) as pipe:
+        for i in range(250):
+            pipe.hset(f"{prefix}:{i}", "1", "{}")
+        pipe.hset(f"{TEST_KEY_MARK}-prefix1:0", "1", "{}")
+        pipe.hset(f"{TEST_KEY_MARK}-other", "1", "{}")
+        await pipe.execute()
+
+    assert await redis.invalidate_prefix(prefix, scan_count=20) == 250
+
+    remaining = [key async for key in redis.connection.scan_iter(f"{TEST_KEY_MARK}*")]
+    assert sorted(remaining) == [
+        f"{TEST_KEY_MARK}-other".encode(),
+        f"{TEST_KEY_MARK}-prefix1:0".encode(),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_prefix_without_matches(redis: RedisClient):
+    assert await redis.invalidate_prefix(f"{TEST_KEY_MARK}-nothing") == 0
@@ -0,0 +1,112 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
+
+from app.dao.retry import retryable_sqlstate, RetryPolicy
+from app.dao.session_maker import after_commit, DatabaseSessionManager
+
+
+class PgError(Exception):
+    # как у ошибок asyncpg: код ошибки postgres в атрибуте sqlstate
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def db_error(sqlstate: str) -> DBAPIError:
+    return DBAPIError("UPDATE ...", {}, PgError(sqlstate))
+
+
+def test_retryable_sqlstate_from_error_orig_and_cause():
+    wrapped = RuntimeError("handler")
+    wrapped.__cause__ = db_error("40P01")
+
+    assert retryable_sqlstate(PgError("40001")) == "40001"
+    assert retryable_sqlstate(db_error("40001")) == "40001"
+    assert retryable_sqlstate(wrapped) == "40P01"
+
+
+def test_other_errors_are_not_retryable():
+    looped = RuntimeError("loop")
+    looped.__cause__ = looped
+
+    assert retryable_sqlstate(db_error("23505")) is None  # unique_violation
+    assert retryable_sqlstate(ValueError()) is None
+    assert retryable_sqlstate(looped) is None
+
+
+def test_retry_delay_is_jittered_exponential_backoff():
+    policy = RetryPolicy(attempts=0, base_delay=0.1, max_delay=0.5)
+
+    assert policy.attempts == 1
+    for attempt, limit in ((1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (10, 0.5)):
+        delays = [policy.delay(attempt) for _ in range(100)]
+        assert all(0 <= delay <= limit for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def manager(attempts: int) -> DatabaseSessionManager:
+    # метод в тестах не выполняет запросов: сессия не подключается к БД
+    engine = create_async_engine("postgresql+asyncpg://u@primary/d")
+    return DatabaseSessionManager(
+        async_sessionmaker(engine),
+        retry_policy=RetryPolicy(attempts=attempts, base_delay=0),
+    )
+
+
+def flaky_method(errors: list[Exception], calls: list[AsyncSession], committed: list):
+    async def method(session: AsyncSession) -> str:
+        calls.append(session)
+        after_commit(session, lambda: append(committed, len(calls)))
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return method
+
+
+async def append(items: list, item) -> None:
+    items.append(item)
+
+
+@pytest.mark.asyncio
+async def test_connection_retries_in_a_new_session():
+    calls: list[AsyncSession] = []
+    committed: list[int] = []
+    method = flaky_method([db_error("40001"), db_error("40P01")], calls, committed)
+
+    assert await manager(attempts=3).connection()(method)() == "ok"
+
+    assert len(calls) == 3
+    assert len(set(map(id, calls))) == 3
+    # колбэки после коммита - только от успешной попытки
+    assert committed == [3]
+
+
+@pytest.mark.asyncio
+async def test_connection_gives_up_after_attempts():
+    calls: list[AsyncSession] = []
+    committed: list[int] = []
+    errors: list[Exception] = [db_error("40001") for _ in range(5)]
+    method = flaky_method(errors, calls, committed)
+
+    with pytest.raises(DBAPIError):
+        await manager(attempts=2).connection()(method)()
+
+    assert len(calls) == 2
+    assert committed == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("error", "retry"),
+    [(db_error("23505"), True), (db_error("40001"), False)],
+)
+async def test_connection_does_not_retry(error: Exception, retry: bool):
+    calls: list[AsyncSession] = []
+    method = flaky_method([error], calls, [])
+
+    with pytest.raises(DBAPIError):
+        await manager(attempts=3).connection(retry=retry)(method)()
+
+    assert len(calls) == 1
@@ -0,0 +1,99 @@
+import pytest
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.settings import DbConfig, ReplicaBalancing
+from app.dao.session_maker import DatabaseSessionManager
+
+
+def session_makers(count: int) -> list[async_sessionmaker]:
+    # движки без подключения: read_session_maker смотрит только на пул
+    return [
+        async_sessionmaker(create_async_engine(f"postgresql+asyncpg://u@replica-{i}/d"))
+        for i in range(count)
+    ]
+
+
+def test_round_robin_cycles_through_replicas():
+    primary, *replicas = session_makers(3)
+    manager = DatabaseSessionManager(primary, replicas)
+    assert [manager.read_session_maker() for _ in range(4)] == [
+        replicas[0],
+        replicas[1],
+        replicas[0],
+        replicas[1],
+    ]
+
+
+def test_least_connections_picks_least_loaded_replica(monkeypatch):
+    primary, *replicas = session_makers(3)
+    manager = DatabaseSessionManager(
+        primary,
+        replicas,
+        replica_balancing=ReplicaBalancing.least_connections,
+    )
+    for checked_out, maker in zip((3, 1), replicas):
+        pool = maker.kw["bind"].pool
+        monkeypatch.setattr(pool, "checkedout", lambda n=checked_out: n)
+    assert manager.read_session_maker() is replicas[1]
+
+
+def test_without_replicas_reads_from_primary():
+    (primary,) = session_makers(1)
+    assert DatabaseSessionManager(primary).read_session_maker() is primary
+
+
+def test_unknown_replica_balancing_is_rejected():
+    with pytest.raises(ValidationError):
+        DbConfig(replica_balancing="least_connection")
+
+
+@pytest.mark.asyncio
+async def test_request_session_takes_no_connection_until_first_query():
+    # ответ из кэша не занимает соединение пула: AsyncSession берёт его лениво
+    engine = create_async_engine("postgresql+asyncpg://u@primary/d")
+    manager = DatabaseSessionManager(async_sessionmaker(engine))
+    request = Request({"type": "http", "headers": []})
+
+    dependency = manager.get_session(request)
+    session = await dependency.__anext__()
+    assert not session.in_transaction()
+    assert engine.pool.checkedout() == 0  # type: ignore[attr-defined]
+    await dependency.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("headers", "reads_replica"),
+    [
+        ([], True),
+        ([(b"x-read-primary", b"1")], False),
+        ([(b"x-read-primary", b"true")], False),
+        ([(b"x-read-primary", b"0")], True),
+    ],
+)
+async def test_request_session_reads_replica_unless_primary_is_asked(
+    headers: list[tuple[bytes, bytes]],
+    reads_replica: bool,
+):
+    primary, replica = session_makers(2)
+    manager = DatabaseSessionManager(primary, [replica])
+    request = Request({"type": "http", "headers": headers})
+
+    dependency = manager.get_session(request)
+    session = await dependency.__anext__()
+    expected = replica if reads_replica else primary
+    assert session.bind is expected.kw["bind"]
+    await dependency.aclose()
+
+
+@pytest.mark.asyncio
+async def test_transaction_session_writes_to_primary():
+    primary, replica = session_makers(2)
+    manager = DatabaseSessionManager(primary, [replica])
+
+    dependency = manager.get_transaction_session()
+    session = await dependency.__anext__()
+    assert session.bind is primary.kw["bind"]
+    await dependency.aclose()